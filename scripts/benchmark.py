@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Benchmark
+=========
+Misst run_transform, compress_all und generate_manifest (dieselben Aufrufe
+wie pipeline.py, ohne Build-Cache) auf synthetischen Rohdaten
+(synthetic.py, nach raw/*.json geschrieben) in Vielfachen des aktuellen
+Datenstands, mit
+--suite fetch zusätzlich den Abruf gegen mock_bvl_server.py (Latenz,
+Seitengröße und 429/5xx einstellbar).
+
+Jeder Faktor läuft in einem eigenen Prozess und Arbeitsverzeichnis, der
+maximale RSS gilt daher nur für diesen Faktor. Die Ergebnisse werden als
+JSON in BENCH_DIR gespeichert (Name mit Commit), mit --compare lassen sich
+zwei Läufe vergleichen.
+
+Die Rohdaten werden tabellenweise gestreamt; Faktor 100 (~44 Mio.
+Datensätze) braucht vor allem Plattenplatz (etwa 6 GB Rohdaten plus
+transformierte und komprimierte Dateien).
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import BENCH_DIR, COMPRESS_WORKERS
+from buildcache import BuildCache
+from compress import compress_all
+from fetch_bvl import HTTP, LIMITER, fetch_all_endpoints, set_base_url
+from manifest import generate_manifest
+from metrics import METRICS, peak_rss_bytes
+from mock_bvl_server import serve
+from synthetic import write_dataset
+from transform import run_transform
+
+
+def _git_commit() -> tuple:
+    """(Kurz-Hash, ungespeicherte Änderungen) des Arbeitsverzeichnisses"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def _dir_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.glob("*") if path.is_file())
+
+
+def run_scale(scale: float, work_dir: str, seed: int = 0, workers: int = COMPRESS_WORKERS,
+              trace_memory: bool = False, verbose: bool = False) -> dict:
+    """
+    Ein Durchlauf aller Stufen für einen Faktor.
+    
+    Returns:
+        {"records", "generate_s", "stages": {stufe: {"seconds", "rows", "bytes",
+         "rows_per_s", "mb_per_s", "peak_rss_bytes", ...}}}
+    """
+    work_path = Path(work_dir)
+    shutil.rmtree(work_path, ignore_errors=True)
+    work_path.mkdir(parents=True)
+    METRICS.reset(trace_memory)
+    
+    # Rohdaten wie nach fetch_bvl.py (nicht Teil der Messung)
+    start = time.perf_counter()
+    records = sum(write_dataset(work_dir, scale, seed).values())
+    generate_s = time.perf_counter() - start
+    
+    # Ohne Build-Cache: jede Stufe arbeitet alle Tabellen ab
+    cache = BuildCache(enabled=False)
+    output = sys.stdout if verbose else open(os.devnull, "w", encoding="utf-8")
+    try:
+        with redirect_stdout(output):
+            with METRICS.stage("transform") as entry:
+                run_transform(cache, data_dir=work_dir)
+            entry["records"] = sum(table["rows"] for table in METRICS.tables.values())
+            entry["bytes"] = _dir_bytes(work_path / "raw")
+            
+            with METRICS.stage("compress") as entry:
+                compress_all(work_dir, work_dir, cache, workers=workers)
+            entry["records"] = records
+            entry["bytes"] = _dir_bytes(work_path / "transformed")
+            
+            with METRICS.stage("manifest") as entry:
+                manifest = generate_manifest(work_dir, cache)
+            entry["records"] = manifest["total_records"]
+            entry["bytes"] = _dir_bytes(work_path / "compressed")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        METRICS.stop()
+    
+    stages = {}
+    for entry in METRICS.stages:
+        seconds = entry["seconds"]
+        stage = {
+            "seconds": round(seconds, 4),
+            "rows": entry["records"],
+            "bytes": entry["bytes"],
+            "rows_per_s": round(entry["records"] / seconds) if seconds > 0 else None,
+            "mb_per_s": round(entry["bytes"] / (1024 * 1024) / seconds, 2) if entry["bytes"] and seconds > 0 else None,
+            "peak_rss_bytes": entry["peak_rss_bytes"],
+        }
+        if "peak_traced_bytes" in entry:
+            stage["peak_traced_bytes"] = entry["peak_traced_bytes"]
+        stages[entry["stage"]] = stage
+    
+    return {"records": records, "generate_s": round(generate_s, 4), "stages": stages}
+
+
+def _best_of(runs: list) -> dict:
+    """Schnellster Durchlauf pro Stufe (Speicher: Maximum über alle Durchläufe)"""
+    best = dict(runs[0], stages={})
+    for stage in runs[0]["stages"]:
+        entries = [run["stages"][stage] for run in runs]
+        fastest = dict(min(entries, key=lambda e: e["seconds"]))
+        fastest["peak_rss_bytes"] = max(e["peak_rss_bytes"] for e in entries)
+        fastest["runs_s"] = [e["seconds"] for e in entries]
+        best["stages"][stage] = fastest
+    return best
+
+
+def _in_process(func, *args):
+    """Führt func in einem frischen Prozess aus (eigener RSS, eigene Statistik)"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(func, *args).result()
+
+
+def _print_run(run: dict):
+    for stage, entry in run["stages"].items():
+        print(f"  {stage:10} {entry['seconds']:8.2f}s {entry['rows_per_s'] or 0:>12,} Datensätze/s")
+
+
+def start_mock_server(options: dict) -> tuple:
+    """
+    Startet mock_bvl_server.py in einem eigenen Prozess.
+    
+    Returns:
+        (Prozess, Basis-URL)
+    """
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(options, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=600)
+
+
+def run_fetch_once(url: str, concurrency: int, verbose: bool = False) -> dict:
+    """
+    Ein Abruf aller Endpunkte vom Mock-Server (ohne Speichern).
+    
+    Returns:
+        {"stages": {"fetch": {"seconds", "rows", "bytes", "requests", "retries", ...}}}
+    """
+    set_base_url(url)
+    output = sys.stdout if verbose else open(os.devnull, "w", encoding="utf-8")
+    try:
+        with redirect_stdout(output):
+            start = time.perf_counter()
+            data = fetch_all_endpoints(concurrency=concurrency)
+            seconds = time.perf_counter() - start
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    records = sum(len(items) for items in data.values())
+    stats = [s.as_dict() for s in HTTP.stats.values()]
+    bytes_decoded = sum(s["bytes_decoded"] for s in stats)
+    return {"stages": {"fetch": {
+        "seconds": round(seconds, 4),
+        "rows": records,
+        "bytes": bytes_decoded,
+        "rows_per_s": round(records / seconds) if seconds > 0 else None,
+        "mb_per_s": round(bytes_decoded / (1024 * 1024) / seconds, 2) if seconds > 0 else None,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "requests": sum(s["requests"] for s in stats),
+        "retries": sum(s["retries"] for s in stats),
+        "rate_limited": sum(s["rate_limited"] for s in stats),
+        "errors": sum(s["errors"] for s in stats),
+        "rate_limiter": LIMITER.state(),
+    }}}
+
+
+def run_benchmark(scales: list, repeat: int = 1, seed: int = 0, workers: int = COMPRESS_WORKERS,
+                  trace_memory: bool = False, verbose: bool = False, keep: bool = False,
+                  bench_dir: str = BENCH_DIR, suites: list = ("build",), concurrencies: list = (1,),
+                  mock_options: dict = None) -> dict:
+    """
+    Führt alle Faktoren aus (jeder Durchlauf in einem frischen Prozess).
+    
+    Args:
+        suites: "build" (transform, compress, manifest) und/oder
+                "fetch" (fetch_bvl.py gegen mock_bvl_server.py)
+        concurrencies: --concurrency-Werte für die Suite "fetch"
+        mock_options: Fehler- und Latenz-Einstellungen für MockBvlApi
+    
+    Returns:
+        Ergebnis-Dictionary (wie in der JSON-Datei gespeichert)
+    """
+    commit, dirty = _git_commit()
+    mock_options = mock_options or {}
+    result = {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "seed": seed,
+        "workers": workers,
+        "trace_memory": trace_memory,
+        "suites": list(suites),
+        "scales": {},
+    }
+    if "fetch" in suites:
+        result["mock"] = mock_options
+    
+    for scale in scales:
+        scale_result = {"records": None, "stages": {}}
+        
+        if "build" in suites:
+            work_dir = str(Path(bench_dir) / f"work-{scale:g}x")
+            runs = []
+            for attempt in range(repeat):
+                print(f"\n🏁 Faktor {scale:g}× (Durchlauf {attempt + 1}/{repeat})...")
+                runs.append(_in_process(run_scale, scale, work_dir, seed, workers, trace_memory, verbose))
+                _print_run(runs[-1])
+            if not keep:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            build = _best_of(runs)
+            scale_result.update(records=build["records"], generate_s=build["generate_s"])
+            scale_result["stages"].update(build["stages"])
+        
+        if "fetch" in suites:
+            print(f"\n🧪 Starte Mock-BVL-API (Faktor {scale:g}×)...")
+            process, url = start_mock_server(dict(mock_options, scale=scale, seed=seed))
+            try:
+                for concurrency in concurrencies:
+                    runs = []
+                    for attempt in range(repeat):
+                        print(f"\n🌐 Abruf Faktor {scale:g}×, --concurrency {concurrency} "
+                              f"(Durchlauf {attempt + 1}/{repeat})...")
+                        runs.append(_in_process(run_fetch_once, url, concurrency, verbose))
+                        _print_run(runs[-1])
+                    scale_result["stages"][f"fetch-c{concurrency}"] = _best_of(runs)["stages"]["fetch"]
+                    scale_result["records"] = scale_result["records"] or runs[0]["stages"]["fetch"]["rows"]
+            finally:
+                process.terminate()
+                process.join()
+        
+        result["scales"][f"{scale:g}"] = scale_result
+    
+    return result
+
+
+def save_result(result: dict, bench_dir: str = BENCH_DIR) -> Path:
+    """Speichert das Ergebnis als <zeit>-<commit>.json"""
+    out_dir = Path(bench_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromisoformat(result["generated"]).strftime("%Y%m%d-%H%M%S")
+    name = f"{stamp}-{result['commit'] or 'unknown'}{'-dirty' if result['dirty'] else ''}.json"
+    path = out_dir / name
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_report(result: dict):
+    """Tabelle pro Faktor und Stufe"""
+    print(f"\n📊 Benchmark (Commit {result['commit']}, Python {result['python']}, {result['cpu_count']} CPU)")
+    print(f"  {'Faktor':>6} {'Stufe':10} {'Zeit':>9} {'Datensätze/s':>14} {'MB/s':>8} {'Peak MB':>9}")
+    print("  " + "-" * 62)
+    for scale, run in result["scales"].items():
+        for stage, entry in run["stages"].items():
+            peak = entry.get("peak_traced_bytes", entry["peak_rss_bytes"]) / (1024 * 1024)
+            mb_rate = f"{entry['mb_per_s']:8.1f}" if entry["mb_per_s"] is not None else f"{'-':>8}"
+            requests = (f"  {entry['requests']:,} Requests, {entry['retries']} Retries, "
+                        f"{entry['rate_limited']} × 429") if "requests" in entry else ""
+            print(f"  {scale + '×':>6} {stage:10} {entry['seconds']:8.2f}s {entry['rows_per_s'] or 0:14,} "
+                  f"{mb_rate} {peak:9.1f}{requests}")
+
+
+def print_comparison(old: dict, new: dict):
+    """Laufzeit-Verhältnis pro Faktor und Stufe (< 1.00 = schneller)"""
+    print(f"\n⚖️ Vergleich {old['commit']} → {new['commit']}")
+    print(f"  {'Faktor':>6} {'Stufe':10} {'alt':>9} {'neu':>9} {'Faktor':>8}")
+    print("  " + "-" * 46)
+    for scale, run in new["scales"].items():
+        if scale not in old["scales"]:
+            continue
+        for stage, entry in run["stages"].items():
+            before = old["scales"][scale]["stages"].get(stage)
+            if not before:
+                continue
+            ratio = entry["seconds"] / before["seconds"] if before["seconds"] > 0 else float("inf")
+            marker = "🟢" if ratio < 0.95 else "🔴" if ratio > 1.05 else "  "
+            print(f"  {scale + '×':>6} {stage:10} {before['seconds']:8.2f}s {entry['seconds']:8.2f}s "
+                  f"{ratio:7.2f}× {marker}")
+
+
+def _load_result(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    """Hauptfunktion"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Benchmark der Stufen transform, compress und manifest")
+    parser.add_argument("--scales", default="1",
+                        help="Faktoren auf den aktuellen Datenstand, kommagetrennt (Standard: 1, z.B. 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=1, help="Durchläufe pro Faktor (schnellster zählt)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed der synthetischen Daten")
+    parser.add_argument("--workers", type=int, default=COMPRESS_WORKERS,
+                        help=f"Parallele Komprimierungs-Prozesse (Standard: {COMPRESS_WORKERS})")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Speicher-Spitze pro Stufe mit tracemalloc messen (verfälscht die Laufzeit)")
+    parser.add_argument("--output", default=BENCH_DIR, help=f"Ergebnis-Verzeichnis (Standard: {BENCH_DIR})")
+    parser.add_argument("--keep", action="store_true", help="Arbeitsverzeichnisse nicht löschen")
+    parser.add_argument("--verbose", action="store_true", help="Ausgaben der Stufen anzeigen")
+    parser.add_argument("--suite", default="build",
+                        help="Kommagetrennt: build (transform bis manifest), fetch (Abruf gegen Mock-API)")
+    # fetch (mock_bvl_server.py)
+    parser.add_argument("--concurrency", default="1",
+                        help="--concurrency-Werte des Abrufs, kommagetrennt (Standard: 1, z.B. 1,4,8)")
+    parser.add_argument("--latency", type=float, default=0, help="Mock-API: Antwortzeit pro Request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Mock-API: Abweichung der Antwortzeit in ms")
+    parser.add_argument("--max-limit", type=int, help="Mock-API: maximale Seitengröße")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Mock-API: Anteil der Requests mit 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Mock-API: Anteil der Requests mit 503")
+    parser.add_argument("--retry-after", type=float, help="Mock-API: Retry-After-Header (Sekunden)")
+    parser.add_argument("--max-concurrent", type=int, help="Mock-API: mehr gleichzeitige Requests bekommen 429")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="Mit früherem Ergebnis vergleichen; mit zwei Dateien nur vergleichen")
+    args = parser.parse_args()
+    
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare erwartet eine oder zwei Dateien")
+    if args.compare and len(args.compare) == 2:
+        print_comparison(_load_result(args.compare[0]), _load_result(args.compare[1]))
+        return 0
+    
+    try:
+        scales = [float(scale) for scale in args.scales.split(",") if scale.strip()]
+    except ValueError:
+        parser.error(f"Ungültige Faktoren: {args.scales}")
+    if not scales or any(scale <= 0 for scale in scales) or args.repeat < 1:
+        parser.error("Faktoren und --repeat müssen größer als 0 sein")
+    suites = [suite.strip() for suite in args.suite.split(",") if suite.strip()]
+    if not suites or any(suite not in ("build", "fetch") for suite in suites):
+        parser.error(f"Unbekannte Suite: {args.suite} (build, fetch)")
+    try:
+        concurrencies = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    except ValueError:
+        parser.error(f"Ungültige --concurrency: {args.concurrency}")
+    if not concurrencies or min(concurrencies) < 1:
+        parser.error("--concurrency muss mindestens 1 sein")
+    mock_options = {
+        "latency_ms": args.latency, "jitter_ms": args.jitter, "max_limit": args.max_limit,
+        "rate_429": args.rate_429, "rate_5xx": args.rate_5xx, "retry_after": args.retry_after,
+        "max_concurrent": args.max_concurrent,
+    }
+    
+    result = run_benchmark(scales, args.repeat, args.seed, args.workers or os.cpu_count() or 1,
+                           args.trace_memory, args.verbose, args.keep, args.output,
+                           suites, concurrencies, mock_options)
+    print_report(result)
+    path = save_result(result, args.output)
+    print(f"\n💾 Ergebnis gespeichert: {path}")
+    
+    if args.compare:
+        print_comparison(_load_result(args.compare[0]), result)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Build-Cache
+===========
+Inhaltsadressierter Cache für transform.py, compress.py und manifest.py.
+
+Pro Stufe und Tabelle wird der Hash der Eingabe gespeichert, zusammen mit
+den Metadaten (Größen, Checksummen, Anzahl) und - falls die Stufe eine
+Datei erzeugt - einer Kopie der Ausgabe unter objects/<sha256>. Ist die
+Eingabe beim nächsten Lauf byte-gleich, wird die Ausgabe aus dem Cache
+übernommen statt neu berechnet.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter
+from pathlib import Path
+
+from config import CACHE_DIR, CACHE_VERSION
+
+COPY_CHUNK = 1024 * 1024
+
+
+def hash_bytes(*parts) -> str:
+    """SHA256 über mehrere Teile (bytes oder str)"""
+    sha256 = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        sha256.update(len(part).to_bytes(8, "big"))
+        sha256.update(part)
+    return sha256.hexdigest()
+
+
+def hash_chunks(chunks) -> str:
+    """SHA256 über aufeinanderfolgende Stücke (z.B. eine Datei ohne sie ganz zu lesen)"""
+    sha256 = hashlib.sha256()
+    for chunk in chunks:
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _copy_with_hash(src: Path, dst: Path) -> str:
+    """Kopiert eine Datei und berechnet dabei ihren SHA256"""
+    sha256 = hashlib.sha256()
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        for chunk in iter(lambda: fin.read(COPY_CHUNK), b""):
+            sha256.update(chunk)
+            fout.write(chunk)
+    return sha256.hexdigest()
+
+
+class BuildCache:
+    """
+    Cache-Einträge pro (Stufe, Tabelle) mit Eingabe-Schlüssel.
+    
+    Es wird nur der jeweils letzte Eintrag pro Tabelle gehalten, der Cache
+    wächst also nicht mit der Anzahl der Läufe.
+    """
+    
+    def __init__(self, cache_dir: str = CACHE_DIR, enabled: bool = True):
+        self.enabled = enabled
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.entries = {}
+        # Treffer und Fehlschläge pro Stufe
+        self.hits = Counter()
+        self.misses = Counter()
+        
+        if enabled:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == CACHE_VERSION:
+                    self.entries = index.get("entries", {})
+            except (OSError, ValueError):
+                pass
+    
+    def get(self, stage: str, name: str, key: str) -> dict:
+        """Liefert die Metadaten des Eintrags, falls der Eingabe-Schlüssel passt"""
+        if not self.enabled:
+            return None
+        entry = self.entries.get(f"{stage}/{name}")
+        if entry is None or entry["key"] != key:
+            self.misses[stage] += 1
+            return None
+        if entry.get("object") and not self._object_path(entry["object"]).exists():
+            self.misses[stage] += 1
+            return None
+        self.hits[stage] += 1
+        return entry["meta"]
+    
+    def put(self, stage: str, name: str, key: str, meta: dict, output_path: Path = None) -> str:
+        """
+        Speichert einen Eintrag, optional mit Kopie der Ausgabedatei.
+        
+        Returns:
+            SHA256 der Ausgabedatei (None ohne Datei)
+        """
+        if not self.enabled:
+            return None
+        digest = None
+        if output_path is not None:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.objects_dir / f".tmp-{os.getpid()}"
+            digest = _copy_with_hash(Path(output_path), tmp_path)
+            os.replace(tmp_path, self._object_path(digest))
+        self.entries[f"{stage}/{name}"] = {"key": key, "object": digest, "meta": meta}
+        return digest
+    
+    def restore(self, stage: str, name: str, output_path: Path):
+        """Kopiert die gespeicherte Ausgabe eines Eintrags nach output_path"""
+        entry = self.entries[f"{stage}/{name}"]
+        shutil.copyfile(self._object_path(entry["object"]), output_path)
+    
+    def read(self, stage: str, name: str) -> bytes:
+        """Liest die gespeicherte Ausgabe eines Eintrags"""
+        entry = self.entries[f"{stage}/{name}"]
+        return self._object_path(entry["object"]).read_bytes()
+    
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest
+    
+    def save(self):
+        """Schreibt den Index und entfernt nicht mehr referenzierte Objekte"""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, indent=1, sort_keys=True)
+        
+        referenced = {entry["object"] for entry in self.entries.values() if entry.get("object")}
+        if self.objects_dir.exists():
+            for path in self.objects_dir.iterdir():
+                if path.name not in referenced:
+                    path.unlink()
+    
+    def print_stats(self, stage: str):
+        hits, misses = self.hits[stage], self.misses[stage]
+        if self.enabled and (hits or misses):
+            print(f"  ♻️ Cache ({stage}): {hits} Treffer, {misses} neu berechnet")
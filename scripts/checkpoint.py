@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Abruf-Checkpoints
+=================
+fetch_bvl.py speichert jede geladene Seite eines Endpunkts unter
+<data>/checkpoints/<endpunkt>/. Nach einem Abbruch setzt --resume beim
+ersten fehlenden Offset fort, statt alle Endpunkte neu zu laden.
+
+Checkpoints gelten nur für denselben Datenstand (/stand/); sonst werden sie
+verworfen. Die Seiten sind nach Offset benannt und dürfen unterschiedlich
+groß sein (pagesize.py). Nach einem vollständigen Abruf werden sie gelöscht.
+
+Endpunkte, die nicht vollständig geladen wurden, stehen in
+raw/fetch_status.json. transform.py und manifest.py übernehmen für sie die
+zuletzt veröffentlichte Version, statt eine abgeschnittene Tabelle zu
+veröffentlichen.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+from config import CHECKPOINT_DIR, DATA_DIR, FETCH_STATUS_FILE
+
+META_FILE = "meta.json"
+
+
+def _write_json(path: Path, data):
+    """Schreibt JSON atomar (ein Abbruch hinterlässt keine halbe Seite)"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class PageCheckpoint:
+    """Gespeicherte Seiten eines Endpunkts"""
+    
+    def __init__(self, directory: Path, path: str, stand: dict):
+        self.dir = directory
+        self.meta = {"path": path, "stand": stand, "complete": False, "count": 0}
+    
+    def _page_path(self, offset: int) -> Path:
+        return self.dir / f"{offset:09d}.json"
+    
+    def load(self) -> tuple:
+        """
+        Liest die zusammenhängend gespeicherten Seiten ab Offset 0.
+        
+        Returns:
+            (Seiten, nächster Offset, vollständig)
+        """
+        meta = _read_json(self.dir / META_FILE)
+        if not meta or any(meta.get(key) != self.meta[key] for key in ("path", "stand")):
+            self.clear()
+            return [], 0, False
+        
+        pages = []
+        offset = 0
+        while True:
+            items = _read_json(self._page_path(offset))
+            if not isinstance(items, list) or not items:
+                break
+            pages.append(items)
+            offset += len(items)
+        
+        complete = bool(meta.get("complete")) and offset == meta.get("count")
+        self.meta["count"] = offset
+        return pages, offset, complete
+    
+    def save_page(self, offset: int, items: list):
+        if not self.dir.exists():
+            self.dir.mkdir(parents=True)
+            _write_json(self.dir / META_FILE, self.meta)
+        _write_json(self._page_path(offset), items)
+        self.meta["count"] = offset + len(items)
+    
+    def mark_complete(self, count: int):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.meta.update(complete=True, count=count)
+        _write_json(self.dir / META_FILE, self.meta)
+    
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class CheckpointStore:
+    """
+    Checkpoints aller Endpunkte eines Abrufs.
+    
+    Args:
+        stand: Aktueller Datenstand der BVL (None = unbekannt, dann werden
+               vorhandene Checkpoints nicht fortgesetzt)
+        resume: Vorhandene Checkpoints fortsetzen; sonst neu beginnen
+    """
+    
+    def __init__(self, output_dir: str = DATA_DIR, stand: dict = None, resume: bool = False):
+        self.root = Path(output_dir) / CHECKPOINT_DIR
+        self.stand = stand
+        if not resume:
+            self.clear()
+        elif stand is None and self.root.exists():
+            print("⚠️ Datenstand unbekannt - Checkpoints werden verworfen")
+            self.clear()
+    
+    def endpoint(self, name: str, path: str) -> PageCheckpoint:
+        return PageCheckpoint(self.root / name, path, self.stand)
+    
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def save_fetch_status(output_dir: str, incomplete: list):
+    """Schreibt raw/fetch_status.json (unvollständig geladene Endpunkte)"""
+    raw_dir = Path(output_dir) / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    _write_json(raw_dir / FETCH_STATUS_FILE, {"incomplete": sorted(incomplete)})
+
+
+def load_incomplete(data_dir: str = DATA_DIR) -> set:
+    """Unvollständig geladene Endpunkte des letzten Abrufs (leer ohne Status-Datei)"""
+    status = _read_json(Path(data_dir) / "raw" / FETCH_STATUS_FILE)
+    return set(status.get("incomplete", [])) if isinstance(status, dict) else set()
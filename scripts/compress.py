@@ -5,42 +5,548 @@ BVL Daten Kompressor
 Komprimiert transformierte JSON-Daten mit GZIP für effiziente Übertragung.
 """
 
+import bz2
 import gzip
+import hashlib
 import json
+import lzma
 import os
+import re
+import shutil
+import struct
 import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from config import DATA_DIR
+from config import (
+    COMPRESS_CODECS,
+    COMPRESS_WORKERS,
+    DATA_DIR,
+    PARALLEL_GZIP_BLOCK_SIZE,
+    PARALLEL_GZIP_MIN_BYTES,
+    PARALLEL_GZIP_THREADS,
+    PRIMARY_KEYS,
+    PROFILE_DIR,
+    SQLITE_FILENAME,
+)
+from buildcache import BuildCache, hash_bytes, hash_chunks
+from jsonstream import iter_chunks, iter_json_array
+from metrics import METRICS
+from profiling import profile_stage
 
 
-def compress_file(input_path: Path, output_path: Path) -> tuple:
+GZIP_LEVEL = 9
+READ_CHUNK = 1024 * 1024
+
+# Metadaten der komprimierten Dateien für manifest.py (in compressed/)
+BUILD_META_FILE = "build_meta.json"
+# Unkomprimierte Shards (compress.py --shards) vor dem Komprimieren
+SHARD_STAGING_DIR = ".shards"
+
+
+def open_gzip(path: Path, fileobj=None) -> gzip.GzipFile:
+    """
+    Öffnet eine GZIP-Datei zum Schreiben.
+    
+    mtime=0 macht die Ausgabe reproduzierbar: gleicher Inhalt ergibt die
+    gleiche Checksumme, Clients laden unveränderte Tabellen nicht neu.
+    """
+    return gzip.GzipFile(str(path), "wb", compresslevel=GZIP_LEVEL, fileobj=fileobj, mtime=0)
+
+
+# Zusätzliche Codecs (compress.py --codecs): Name → (Dateiendung, Schreiben, Lesen)
+EXTRA_CODECS = {
+    "xz": (".xz", lambda fileobj: lzma.open(fileobj, "wb", preset=9), lzma.open),
+    "bz2": (".bz2", lambda fileobj: bz2.open(fileobj, "wb", compresslevel=9), bz2.open),
+}
+
+
+class HashingWriter:
+    """Datei-Wrapper, der SHA256 und Größe der geschriebenen Bytes mitführt"""
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+    
+    def write(self, data) -> int:
+        self._sha256.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+    
+    def flush(self):
+        self.raw.flush()
+    
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+
+_STRINGS = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_STRUCTURE_TOKENS = re.compile(rb'[\[{]|[\]}]|,+')
+_COUNT_KEY = re.compile(rb'(?<!\\)"count"\s*:\s*(\d+)(?=\D)')
+_NON_STRUCTURAL = bytes(b for b in range(256) if b not in b"[]{},")
+_WHITESPACE = b" \t\r\n"
+
+
+def _last_unescaped_quote(data: bytes) -> int:
+    pos = len(data)
+    while True:
+        pos = data.rfind(b'"', 0, pos)
+        backslashes = 0
+        while pos - backslashes > 0 and data[pos - backslashes - 1] == 92:
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return pos
+
+
+class JsonRecordCounter:
+    """
+    Zählt Datensätze, während eine JSON-Datei in Chunks durchläuft - mit
+    dem gleichen Ergebnis wie count_records_in_gz in manifest.py: Anzahl
+    Elemente eines Arrays, "count" eines Objekts (Spalten-/Index-Format)
+    oder 1.
+    
+    String-Inhalte werden über die Parität der Anführungszeichen entfernt
+    (bytes.split, ohne Escape-Sequenzen) bzw. per Regex; gezählt werden
+    die Kommas auf oberster Ebene. Das ist etwa so schnell wie json.loads,
+    braucht aber keinen Speicher für die geparsten Daten.
+    """
+    
+    HEAD_LIMIT = 64 * 1024
+    
+    def __init__(self):
+        self._carry = b""
+        self._in_string = False
+        self._depth = 0
+        self._top = None
+        self._commas = 0
+        self._non_empty = False
+        self._count = None
+        self._head = b""
+    
+    def _outside_strings(self, data: bytes) -> bytes:
+        """Ersetzt String-Inhalte durch 's'; merkt sich einen offenen String"""
+        if self._in_string:
+            data = b'"' + data
+            self._in_string = False
+        
+        if b"\\" not in data:
+            parts = data.split(b'"')
+            self._in_string = len(parts) % 2 == 0
+            return b"s".join(parts[0::2])
+        
+        # Backslash am Ende maskiert evtl. ein Anführungszeichen im nächsten Chunk
+        trimmed = data.rstrip(b"\\")
+        if len(trimmed) != len(data):
+            self._carry = data[len(trimmed):]
+            data = trimmed
+        
+        stripped = _STRINGS.sub(b"s", data)
+        if b'"' in stripped:
+            cut = _last_unescaped_quote(data)
+            self._carry = data[cut + 1:] + self._carry
+            self._in_string = True
+            stripped = _STRINGS.sub(b"s", data[:cut])
+        return stripped
+    
+    def _find_count(self):
+        """Sucht "count" auf oberster Ebene im Kopf der Datei"""
+        for m in _COUNT_KEY.finditer(self._head):
+            prefix = _STRINGS.sub(b"", self._head[:m.start()]).translate(None, _NON_STRUCTURAL)
+            if prefix.count(b"{") + prefix.count(b"[") - prefix.count(b"}") - prefix.count(b"]") == 1:
+                self._count = int(m.group(1))
+                return
+    
+    def feed(self, chunk: bytes):
+        data = self._carry + chunk
+        self._carry = b""
+        stripped = self._outside_strings(data)
+        
+        if self._top is None:
+            text = stripped.lstrip(_WHITESPACE)
+            if not text:
+                return
+            self._top = text[0]
+        
+        if self._top == 123 and self._count is None and len(self._head) < self.HEAD_LIMIT:
+            self._head += chunk
+            self._find_count()
+        
+        if self._top == 91 and not self._non_empty:
+            body = stripped.translate(None, _WHITESPACE)
+            if self._depth == 0:
+                body = body[1:]
+            if body and body[0] != 93:
+                self._non_empty = True
+        
+        depth = self._depth
+        commas = 0
+        for token in _STRUCTURE_TOKENS.findall(stripped.translate(None, _NON_STRUCTURAL)):
+            first = token[0]
+            if first == 44:  # ,
+                if depth == 1:
+                    commas += len(token)
+            elif first == 91 or first == 123:  # [ {
+                depth += 1
+            else:
+                depth -= 1
+        self._depth = depth
+        self._commas += commas
+    
+    @property
+    def count(self) -> int:
+        if self._top == 91:
+            if self._commas:
+                return self._commas + 1
+            return 1 if self._non_empty else 0
+        if self._top == 123:
+            return self._count if self._count is not None else 1
+        return 0
+
+
+def _read_chunks(input_path: Path, counter: JsonRecordCounter = None, size: int = READ_CHUNK):
+    """Liest eine Datei in Chunks und füttert dabei den Zähler"""
+    with open(input_path, "rb") as src:
+        for chunk in iter(lambda: src.read(size), b""):
+            if counter is not None:
+                counter.feed(chunk)
+            yield chunk
+
+
+def _file_meta(original_size: int, writer: HashingWriter, counter: JsonRecordCounter) -> dict:
+    return {
+        "original_size": original_size,
+        "compressed_size": writer.size,
+        "sha256": writer.sha256,
+        "count": counter.count if counter is not None else None,
+    }
+
+
+def _counter_for(input_path: Path) -> JsonRecordCounter:
+    return JsonRecordCounter() if input_path.suffix == ".json" else None
+
+DICT_SIZE = 32 * 1024  # Deflate-Fenster
+
+
+def _gzip_header(output_path: Path) -> bytes:
+    """GZIP-Header wie gzip.GzipFile (Dateiname, mtime=0, XFL=2 für Stufe 9)"""
+    name = Path(output_path).name
+    if name.endswith(".gz"):
+        name = name[:-3]
+    fname = name.encode("latin-1", "replace") + b"\0"
+    return b"\x1f\x8b\x08\x08" + struct.pack("<I", 0) + b"\x02\xff" + fname
+
+
+def _deflate_block(block: bytes, dictionary: bytes, last: bool) -> bytes:
+    """
+    Komprimiert einen Block als rohen Deflate-Datenstrom.
+    
+    Die letzten 32 KB des Vorgängerblocks dienen als Wörterbuch, damit
+    Rückverweise über die Blockgrenze hinweg möglich bleiben. Nicht-letzte
+    Blöcke enden mit Z_SYNC_FLUSH (byte-ausgerichtet, ohne BFINAL), so dass
+    die Blöcke hintereinander einen gültigen Datenstrom ergeben.
+    """
+    if dictionary:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS, 9, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS, 9)
+    data = compressor.compress(block)
+    return data + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def compress_file_blocks(input_path: Path, output_path: Path,
+                         block_size: int = PARALLEL_GZIP_BLOCK_SIZE, threads: int = PARALLEL_GZIP_THREADS) -> dict:
+    """
+    Komprimiert eine große Datei block-parallel (wie pigz).
+    
+    Die Blöcke werden auf mehreren Threads komprimiert (zlib gibt dabei den
+    GIL frei) und in Reihenfolge zu einer einzigen GZIP-Datei zusammengesetzt,
+    die jeder Standard-Leser entpacken kann. CRC32, Länge, SHA256 und
+    Datensatz-Anzahl laufen dabei im Haupt-Thread mit.
+    
+    Returns:
+        Metadaten (original_size, compressed_size, sha256, count)
+    """
+    threads = threads or os.cpu_count() or 1
+    crc = 0
+    original_size = 0
+    counter = _counter_for(input_path)
+    
+    with open(output_path, "wb") as raw, ThreadPoolExecutor(max_workers=threads) as pool:
+        dst = HashingWriter(raw)
+        dst.write(_gzip_header(output_path))
+        
+        blocks = _read_chunks(input_path, counter, block_size)
+        pending = deque()
+        dictionary = b""
+        block = next(blocks, b"")
+        while block:
+            next_block = next(blocks, b"")
+            crc = zlib.crc32(block, crc)
+            original_size += len(block)
+            pending.append(pool.submit(_deflate_block, block, dictionary, not next_block))
+            dictionary = block[-DICT_SIZE:]
+            block = next_block
+            
+            # Nur wenige Blöcke gleichzeitig im Speicher halten
+            while len(pending) > threads * 2:
+                dst.write(pending.popleft().result())
+        
+        if not pending:
+            # Leere Datei: leerer, abgeschlossener Datenstrom
+            pending.append(pool.submit(_deflate_block, b"", b"", True))
+        while pending:
+            dst.write(pending.popleft().result())
+        
+        dst.write(struct.pack("<II", crc & 0xFFFFFFFF, original_size & 0xFFFFFFFF))
+    
+    return _file_meta(original_size, dst, counter)
+
+
+def _gzip_method(input_path: Path) -> str:
+    """Beschreibt das Verfahren für eine Datei (Teil des Cache-Schlüssels)"""
+    if input_path.stat().st_size >= PARALLEL_GZIP_MIN_BYTES:
+        return f"gzip-{GZIP_LEVEL}-blocks-{PARALLEL_GZIP_BLOCK_SIZE}"
+    return f"gzip-{GZIP_LEVEL}"
+
+
+def compress_file(input_path: Path, output_path: Path) -> dict:
     """
     Komprimiert eine JSON-Datei mit GZIP.
     
+    Dateien ab PARALLEL_GZIP_MIN_BYTES werden block-parallel komprimiert.
+    SHA256 und Größe der Ausgabe sowie die Datensatz-Anzahl werden im
+    selben Durchgang ermittelt.
+    
+    Returns:
+        Metadaten (original_size, compressed_size, sha256, count)
+    """
+    if input_path.stat().st_size >= PARALLEL_GZIP_MIN_BYTES:
+        return compress_file_blocks(input_path, output_path)
+    
+    counter = _counter_for(input_path)
+    original_size = 0
+    with open(output_path, "wb") as raw:
+        dst = HashingWriter(raw)
+        with open_gzip(output_path, dst) as gz:
+            for chunk in _read_chunks(input_path, counter):
+                original_size += len(chunk)
+                gz.write(chunk)
+    
+    return _file_meta(original_size, dst, counter)
+
+
+class JsonArrayWriter:
+    """
+    Schreibt ein JSON-Array seitenweise, optional direkt GZIP-komprimiert.
+    
+    Die Ausgabe ist byte-gleich zu json.dump(items, f, ensure_ascii=False),
+    es liegt aber immer nur die aktuelle Seite im Speicher.
+    """
+    
+    def __init__(self, path: Path, compress: bool = True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)  # evtl. per Hardlink veröffentlicht
+        self._raw = HashingWriter(open(self.path, "wb"))
+        self._file = open_gzip(self.path, self._raw) if compress else self._raw
+        self.count = 0
+        self.original_size = 0
+    
+    def write(self, items: list):
+        """Hängt Datensätze an das Array an"""
+        if not items:
+            return
+        chunk = ", ".join(json.dumps(item, ensure_ascii=False) for item in items).encode("utf-8")
+        prefix = b", " if self.count else b"["
+        self._file.write(prefix)
+        self._file.write(chunk)
+        self.count += len(items)
+        self.original_size += len(prefix) + len(chunk)
+    
+    def close(self) -> tuple:
+        """
+        Schließt das Array.
+        
+        Returns:
+            (original_size, file_size)
+        """
+        suffix = b"]" if self.count else b"[]"
+        self._file.write(suffix)
+        self.original_size += len(suffix)
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.raw.close()
+        return self.original_size, self._raw.size
+    
+    @property
+    def sha256(self) -> str:
+        """SHA256 der geschriebenen Datei (nach close())"""
+        return self._raw.sha256
+
+
+def compress_file_codec(input_path: Path, output_path: Path, codec: str) -> dict:
+    """
+    Komprimiert eine Datei mit einem zusätzlichen Codec (xz, bz2).
+    
     Returns:
-        (original_size, compressed_size)
+        Metadaten (original_size, compressed_size, sha256, count)
     """
-    with open(input_path, "rb") as f:
-        data = f.read()
+    _, open_writer, _ = EXTRA_CODECS[codec]
+    counter = _counter_for(input_path)
+    original_size = 0
+    with open(output_path, "wb") as raw:
+        dst = HashingWriter(raw)
+        with open_writer(dst) as encoder:
+            for chunk in _read_chunks(input_path, counter):
+                original_size += len(chunk)
+                encoder.write(chunk)
     
-    original_size = len(data)
+    return _file_meta(original_size, dst, counter)
+
+
+def _decompress_seconds(path: Path, codec: str) -> float:
+    """CPU-Zeit zum vollständigen Entpacken einer Datei"""
+    open_reader = gzip.open if codec == "gz" else EXTRA_CODECS[codec][2]
+    start = time.process_time()
+    with open_reader(path, "rb") as f:
+        while f.read(1024 * 1024):
+            pass
+    return time.process_time() - start
+
+
+def _compress_job(input_path: Path, output_path: Path, codec: str = "gz", measure: bool = False) -> dict:
+    """
+    Komprimiert eine Datei im Worker-Prozess.
     
-    with gzip.open(output_path, "wb", compresslevel=9) as f:
-        f.write(data)
+    Gemessen wird die CPU-Zeit des Prozesses. Ihre Summe über alle Jobs ist
+    nur eine Schätzung der seriellen Laufzeit: parallele Worker konkurrieren
+    um Caches und Speicherbandbreite und brauchen dadurch etwas mehr.
     
-    compressed_size = output_path.stat().st_size
+    Für Tabellen mit natürlichem Schlüssel (config.PRIMARY_KEYS) werden
+    zusätzlich die Zeilen-Hashes aus der unkomprimierten Eingabe berechnet
+    (nicht mitgemessen), damit manifest.py die Deltas ohne Entpacken bauen
+    kann.
     
-    return original_size, compressed_size
+    Returns:
+        Metadaten der Datei plus "seconds" und "decompress_s" (oder None),
+        ggf. "rowhashes": {"key", "rows"} (siehe delta.hash_table)
+    """
+    start = time.process_time()
+    if codec == "gz":
+        meta = compress_file(input_path, output_path)
+    else:
+        meta = compress_file_codec(input_path, output_path, codec)
+    meta["seconds"] = time.process_time() - start
+    meta["decompress_s"] = _decompress_seconds(output_path, codec) if measure else None
+    key = PRIMARY_KEYS.get(input_path.stem) if codec == "gz" else None
+    if key:
+        from delta import hash_table
+        meta["rowhashes"] = {"key": key, "rows": hash_table(iter_json_array(input_path), key)}
+    return meta
+
+
+def save_build_meta(compressed_dir: Path, entries: dict):
+    """
+    Ergänzt compressed/build_meta.json um die Metadaten komprimierter Dateien.
+    
+    Zu jeder Datei wird ihre mtime (st_mtime_ns) vermerkt, damit
+    manifest.py eine später neu geschriebene Datei gleicher Größe erkennt.
+    
+    Args:
+        entries: Dateiname → {"sha256", "size", "count"} (Shards zusätzlich
+                 "shard", Tabellen mit Schlüssel "rowhashes")
+    """
+    meta_path = Path(compressed_dir) / BUILD_META_FILE
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        meta = {}
+    for name, entry in entries.items():
+        try:
+            mtime_ns = (Path(compressed_dir) / name).stat().st_mtime_ns
+        except OSError:
+            continue
+        meta[name] = {**entry, "mtime_ns": mtime_ns}
+    # Ohne Einrückung: mit den Zeilen-Hashes wird die Datei groß, und nur so
+    # nutzt json den schnellen C-Encoder
+    meta_path.write_text(json.dumps(dict(sorted(meta.items())), separators=(",", ":")), encoding="utf-8")
+
+
+def load_build_meta(compressed_dir: Path) -> dict:
+    """Liest compressed/build_meta.json (leeres Dictionary falls nicht vorhanden)"""
+    try:
+        return json.loads((Path(compressed_dir) / BUILD_META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
 
 
-def compress_all(input_dir: str = DATA_DIR, output_dir: str = DATA_DIR) -> dict:
+def _run_jobs(jobs: list, workers: int) -> dict:
+    """
+    Führt Komprimierungs-Jobs seriell oder im Prozess-Pool aus.
+    
+    Große Dateien werden zuerst gestartet, damit sie nicht am Ende allein
+    auf einem Kern laufen.
+    
+    Args:
+        jobs: Liste von (Eingabe, Ausgabe, Codec, Entpacken messen)
+    
+    Returns:
+        Dateiname → Ergebnis von _compress_job
+    """
+    jobs = sorted(jobs, key=lambda job: job[0].stat().st_size, reverse=True)
+    
+    if workers <= 1 or len(jobs) <= 1:
+        return {job[1].name: _compress_job(*job) for job in jobs}
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(_compress_job, *job): job[1].name for job in jobs}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def print_codec_stats(rows: list):
+    """Gibt Größe, Ratio und Komprimier-/Entpack-Zeit pro Datei und Codec aus"""
+    print("\n📦 Codecs:")
+    print(f"  {'Datei':30} {'Codec':>5} {'KB':>10} {'Ratio':>7} {'Komp. s':>8} {'Entp. s':>8}")
+    print("  " + "-" * 72)
+    
+    previous = None
+    for name, codec, original_size, compressed_size, seconds, decompress in rows:
+        ratio = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
+        comp = "Cache" if seconds is None else f"{seconds:.2f}"
+        decomp = "-" if decompress is None else f"{decompress:.2f}"
+        label = name if name != previous else ""
+        previous = name
+        print(f"  {label:30} {codec:>5} {compressed_size/1024:10.1f} {ratio:6.1f}% {comp:>8} {decomp:>8}")
+
+
+def compress_all(input_dir: str = DATA_DIR, output_dir: str = DATA_DIR, cache: BuildCache = None,
+                 workers: int = COMPRESS_WORKERS, codecs: list = None, codec_tables: list = None,
+                 shards: bool = False) -> dict:
     """
     Komprimiert alle transformierten JSON-Dateien.
     
+    Dateien mit unverändertem Inhalt werden aus dem Build-Cache übernommen,
+    die übrigen mit workers > 1 parallel in einem Prozess-Pool komprimiert
+    (byte-gleiche Ausgabe wie seriell).
+    
+    Args:
+        codecs: Zusätzliche Codecs (z.B. ["xz", "bz2"]) neben GZIP
+        codec_tables: Nur diese Dateien (Name ohne .json) zusätzlich
+                      kodieren; None = alle
+        shards: Große Tabellen zusätzlich in Shards teilen (shards.py)
+    
     Returns:
         Dictionary mit Statistiken pro Datei
     """
+    cache = cache or BuildCache(enabled=False)
     transformed_dir = Path(input_dir) / "transformed"
     compressed_dir = Path(output_dir) / "compressed"
     compressed_dir.mkdir(parents=True, exist_ok=True)
@@ -49,8 +555,18 @@ def compress_all(input_dir: str = DATA_DIR, output_dir: str = DATA_DIR) -> dict:
     total_original = 0
     total_compressed = 0
     
+    # Shards der Vorversion entfernen (Anzahl und Bereiche können sich ändern)
+    for stale in compressed_dir.glob("shard.*"):
+        stale.unlink()
+    shard_dir = compressed_dir / SHARD_STAGING_DIR
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    shard_meta = {}
+    if shards:
+        from shards import write_shards
+        shard_meta = write_shards(transformed_dir, shard_dir)
+    
     print("\n🗜️ Komprimiere Daten...")
-    print("-" * 60)
+    print("-" * 72)
     
     json_files = sorted(transformed_dir.glob("*.json"))
     
@@ -58,15 +574,97 @@ def compress_all(input_dir: str = DATA_DIR, output_dir: str = DATA_DIR) -> dict:
         print("❌ Keine JSON-Dateien in transformed/ gefunden!")
         return stats
     
+    # SQLite-Datenbank (transform.py --sqlite) wird mitkomprimiert
+    sqlite_path = transformed_dir / SQLITE_FILENAME
+    if sqlite_path.exists():
+        json_files.append(sqlite_path)
+    
+    json_files += sorted(shard_dir.glob("*.json"))
+    
+    codecs = codecs or []
+    for codec in codecs:
+        if codec not in EXTRA_CODECS:
+            raise ValueError(f"Unbekannter Codec: {codec} (verfügbar: {', '.join(EXTRA_CODECS)})")
+    
+    # Ausgabedateien: (Eingabe, Ausgabe, Codec)
+    outputs = []
+    for json_path in json_files:
+        outputs.append((json_path, compressed_dir / f"{json_path.name}.gz", "gz"))
+        if codec_tables is None or json_path.stem in codec_tables:
+            for codec in codecs:
+                outputs.append((json_path, compressed_dir / f"{json_path.name}{EXTRA_CODECS[codec][0]}", codec))
+    
+    results = {}
+    jobs = []
+    keys = {}
+    content_hashes = {}
+    previous_meta = load_build_meta(compressed_dir)
+    for json_path, out_path, codec in outputs:
+        # Neue Datei statt Überschreiben: die Vorversion ist evtl. per
+        # Hardlink in data/ veröffentlicht (manifest.py)
+        out_path.unlink(missing_ok=True)
+        if json_path not in content_hashes:
+            content_hashes[json_path] = hash_chunks(iter_chunks(json_path))
+        method = _gzip_method(json_path) if codec == "gz" else f"{codec}-9"
+        key = keys[out_path.name] = hash_bytes(content_hashes[json_path], method)
+        meta = cache.get("compress", out_path.name, key)
+        if meta is not None and "sha256" in meta:
+            cache.restore("compress", out_path.name, out_path)
+            results[out_path.name] = {**meta, "seconds": None, "decompress_s": meta.get("decompress_s")}
+            # Zeilen-Hashes stehen nicht im Cache, nur im letzten build_meta.json
+            previous = previous_meta.get(out_path.name, {})
+            if previous.get("sha256") == meta["sha256"] and "rowhashes" in previous:
+                results[out_path.name]["rowhashes"] = previous["rowhashes"]
+        else:
+            jobs.append((json_path, out_path, codec, bool(codecs)))
+    
+    start = time.perf_counter()
+    results.update(_run_jobs(jobs, workers))
+    wall_time = time.perf_counter() - start
+    
+    for json_path, out_path, codec, _ in jobs:
+        result = results[out_path.name]
+        meta = {field: result[field] for field in ("original_size", "compressed_size", "sha256", "count")}
+        if result["decompress_s"] is not None:
+            meta["decompress_s"] = round(result["decompress_s"], 4)
+        cache.put("compress", out_path.name, keys[out_path.name], meta, out_path)
+    
+    cpu_time = sum(result["seconds"] for result in results.values() if result["seconds"] is not None)
+    
+    # SHA256, Größe, Anzahl und Zeilen-Hashes für manifest.py (liest die Dateien dann nicht erneut)
+    save_build_meta(compressed_dir, {
+        name: {"sha256": result["sha256"], "size": result["compressed_size"], "count": result["count"],
+               **({"shard": shard_meta[name]} if name in shard_meta else {}),
+               **({"rowhashes": result["rowhashes"]} if "rowhashes" in result else {})}
+        for name, result in results.items()
+    })
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    
+    codec_rows = []
+    for json_path, out_path, codec in outputs:
+        result = results[out_path.name]
+        original_size, compressed_size = result["original_size"], result["compressed_size"]
+        seconds, decompress = result["seconds"], result["decompress_s"]
+        METRICS.record_file(out_path.name, codec, original_size, compressed_size, seconds)
+        if codec_tables is None or json_path.stem in codec_tables:
+            codec_rows.append((json_path.stem, codec, original_size, compressed_size, seconds, decompress))
+        if codec != "gz":
+            ratio = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
+            stats[out_path.name] = {
+                "original_kb": round(original_size / 1024, 2),
+                "compressed_kb": round(compressed_size / 1024, 2),
+                "ratio": round(ratio, 1)
+            }
+    
     for json_path in json_files:
         name = json_path.stem
-        gz_path = compressed_dir / f"{name}.json.gz"
-        
-        original_size, compressed_size = compress_file(json_path, gz_path)
+        gz_name = f"{json_path.name}.gz"
+        result = results[gz_name]
+        original_size, compressed_size, seconds = result["original_size"], result["compressed_size"], result["seconds"]
         
         ratio = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
         
-        stats[f"{name}.json.gz"] = {
+        stats[gz_name] = {
             "original_kb": round(original_size / 1024, 2),
             "compressed_kb": round(compressed_size / 1024, 2),
             "ratio": round(ratio, 1)
@@ -75,11 +673,22 @@ def compress_all(input_dir: str = DATA_DIR, output_dir: str = DATA_DIR) -> dict:
         total_original += original_size
         total_compressed += compressed_size
         
-        print(f"  {name:30} {original_size/1024:8.1f} KB → {compressed_size/1024:8.1f} KB ({ratio:5.1f}%)")
+        timing = "Cache" if seconds is None else f"{seconds:6.2f}s"
+        print(f"  {name:30} {original_size/1024:8.1f} KB → {compressed_size/1024:8.1f} KB ({ratio:5.1f}%) {timing:>8}")
     
-    print("-" * 60)
+    print("-" * 72)
     total_ratio = (1 - total_compressed / total_original) * 100 if total_original > 0 else 0
-    print(f"  {'GESAMT':30} {total_original/1024:8.1f} KB → {total_compressed/1024:8.1f} KB ({total_ratio:5.1f}%)")
+    print(f"  {'GESAMT':30} {total_original/1024:8.1f} KB → {total_compressed/1024:8.1f} KB ({total_ratio:5.1f}%) "
+          f"{cpu_time:7.2f}s")
+    if jobs:
+        used_workers = max(1, min(workers, len(jobs)))
+        # CPU-Zeit ist die Summe über alle Jobs, keine serielle Laufzeit
+        print(f"  {'⏱️ Laufzeit':30} {wall_time:.2f}s Wanduhr, {cpu_time:.2f}s CPU mit "
+              f"{used_workers} Worker{'n' if used_workers > 1 else ''}")
+    cache.print_stats("compress")
+    
+    if codecs:
+        print_codec_stats(codec_rows)
     
     stats["_total"] = {
         "original_kb": round(total_original / 1024, 2),
@@ -93,7 +702,35 @@ def compress_all(input_dir: str = DATA_DIR, output_dir: str = DATA_DIR) -> dict:
 
 def main():
     """Hauptfunktion"""
-    stats = compress_all()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Komprimierung (GZIP + optionale Codecs) für PSM-Desk-DB")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Build-Cache nicht verwenden (alle Dateien neu komprimieren)")
+    parser.add_argument("--workers", type=int, default=COMPRESS_WORKERS,
+                        help=f"Anzahl paralleler Komprimierungs-Prozesse (Standard: {COMPRESS_WORKERS}, 0 = alle Kerne)")
+    parser.add_argument("--codecs", default=",".join(COMPRESS_CODECS),
+                        help=f"Zusätzliche Codecs, kommagetrennt ({', '.join(EXTRA_CODECS)})")
+    parser.add_argument("--codec-tables",
+                        help="Zusätzliche Codecs nur für diese Tabellen (kommagetrennt, Standard: alle)")
+    parser.add_argument("--shards", action="store_true",
+                        help="Große Tabellen zusätzlich nach Schlüssel-Präfix teilen (config.SHARD_KEYS)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Stufe mit cProfile messen (.pstats + .collapsed in {PROFILE_DIR})")
+    args = parser.parse_args()
+    
+    codecs = [codec.strip() for codec in args.codecs.split(",") if codec.strip()]
+    unknown = [codec for codec in codecs if codec not in EXTRA_CODECS]
+    if unknown:
+        parser.error(f"Unbekannte Codecs: {', '.join(unknown)}")
+    codec_tables = [t.strip() for t in args.codec_tables.split(",")] if args.codec_tables else None
+    
+    workers = args.workers or os.cpu_count() or 1
+    cache = BuildCache(enabled=not args.no_cache)
+    with profile_stage("compress", args.profile):
+        stats = compress_all(cache=cache, workers=workers, codecs=codecs, codec_tables=codec_tables,
+                             shards=args.shards)
+    cache.save()
     
     if not stats:
         return 1
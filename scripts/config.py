@@ -5,17 +5,182 @@ PSM-Desk-DB Konfiguration
 Alle 25 BVL-Endpunkte (Kern + Wichtig)
 """
 
-# BVL API Basis-URL
-BVL_BASE_URL = "https://psm-api.bvl.bund.de/ords/psm/api-v1"
+import os
+
+# BVL API Basis-URL (Umgebungsvariable BVL_BASE_URL überschreibt sie,
+# z.B. für mock_bvl_server.py)
+BVL_BASE_URL = os.environ.get("BVL_BASE_URL") or "https://psm-api.bvl.bund.de/ords/psm/api-v1"
 
 # Pagination
 DEFAULT_LIMIT = 1000
+# Adaptive Seitengröße pro Endpunkt (pagesize.py), Startwert DEFAULT_LIMIT.
+# Ziel: Seiten unter PAGE_TARGET_SECONDS Antwortzeit und PAGE_TARGET_BYTES
+# JSON; gelernte Größen und Datensatz-Anzahlen in <data>/PAGE_SIZES_FILE.
+PAGE_LIMIT_MIN = 100
+PAGE_LIMIT_MAX = 10000
+PAGE_LIMIT_STEP = 100
+PAGE_TARGET_SECONDS = 2.0
+PAGE_TARGET_BYTES = 4 * 1024 * 1024
+PAGE_SIZES_FILE = "page_sizes.json"
+# Fortschrittsmeldung beim Abruf, sobald die Anzahl geladener Datensätze
+# eine weitere Schwelle (Vielfaches von FETCH_PROGRESS_STEP) überschreitet
+FETCH_PROGRESS_STEP = 5000
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # Sekunden
+RETRY_DELAY = 2  # Sekunden (Basis des exponentiellen Backoffs)
+BACKOFF_MAX = 60  # Sekunden, Obergrenze einer Wartezeit vor Wiederholung
+RETRY_AFTER_MAX = 300  # Sekunden, längere Retry-After-Werte werden gekürzt
+
+# Adaptive Ratenbegrenzung (ratelimit.py) für alle Requests
+# Start mit RATE_LIMIT_INITIAL Requests/s; Erfolge erhöhen die Rate additiv,
+# 429/5xx und Antwortzeiten über RATE_LIMIT_LATENCY_TARGET (Sekunden) senken
+# Rate und Parallelität um den Faktor RATE_LIMIT_DECREASE.
+RATE_LIMIT_INITIAL = 10.0
+RATE_LIMIT_MIN = 0.5
+RATE_LIMIT_MAX = 100.0
+RATE_LIMIT_INCREASE = 2.0
+RATE_LIMIT_DECREASE = 0.5
+RATE_LIMIT_LATENCY_TARGET = 5.0
+
+# Parallelität (fetch_bvl.py --concurrency)
+# 1 = seriell wie bisher, >1 = Worker-Pool für Endpunkte und Offset-Fenster
+DEFAULT_CONCURRENCY = 1
+
+# Komprimierung (compress.py --workers): Prozesse für parallele Dateien
+# 1 = seriell wie bisher
+COMPRESS_WORKERS = 1
+# Zusätzliche Codecs neben GZIP (compress.py --codecs): "xz", "bz2"
+COMPRESS_CODECS = []
+
+# Block-paralleles GZIP (wie pigz) für einzelne große Dateien (z.B. auflagen)
+# Ab PARALLEL_GZIP_MIN_BYTES wird in Blöcken auf mehreren Threads komprimiert;
+# 0 Threads = alle Kerne.
+PARALLEL_GZIP_MIN_BYTES = 8 * 1024 * 1024
+PARALLEL_GZIP_BLOCK_SIZE = 1024 * 1024
+PARALLEL_GZIP_THREADS = 0
 
 # Output-Verzeichnis (relativ zum scripts/ Ordner)
 DATA_DIR = "../data"
 
+# Abruf-Checkpoints (fetch_bvl.py --resume) unter <data>/checkpoints/ und
+# Liste unvollständig geladener Endpunkte unter <data>/raw/ (nicht veröffentlicht)
+CHECKPOINT_DIR = "checkpoints"
+FETCH_STATUS_FILE = "fetch_status.json"
+
+# Build-Cache (relativ zum scripts/ Ordner, nicht im Repository)
+# Inhaltsadressiert pro Stufe und Tabelle; CACHE_VERSION erhöhen, wenn sich
+# die Ausgabe einer Stufe bei gleicher Eingabe ändert.
+CACHE_DIR = "../.build-cache"
+CACHE_VERSION = 1
+
+# Lauf-Metriken (pipeline.py) in data/ neben manifest.json:
+# JSON-Bericht und Prometheus-Textfile (node_exporter textfile collector)
+METRICS_FILE = "metrics.json"
+METRICS_PROM_FILE = "metrics.prom"
+
+# Profile (--profile): <stufe>.pstats und <stufe>.collapsed pro Stufe
+# (relativ zum scripts/ Ordner, nicht im Repository)
+PROFILE_DIR = "../profiles"
+
+# Benchmarks (benchmark.py): Ergebnisse als <zeit>-<commit>.json
+# (relativ zum scripts/ Ordner, nicht im Repository)
+BENCH_DIR = "../bench"
+
+# Shards (compress.py --shards): die Anwendungs-Tabellen zusätzlich nach dem
+# Präfix der kennr geteilt (shard.<tabelle>.<nnn>.json.gz, Bereiche im
+# Manifest). awg_id beginnt mit der kennr; alle Tabellen hier teilen einen
+# gemeinsamen Plan aus Präfixen von SHARD_PREFIX_LENGTH Zeichen (im Mittel
+# SHARD_TARGET_ROWS Zeilen pro Tabelle und Shard). Ist die größte Tabelle
+# kleiner als SHARD_MIN_RECORDS, wird nicht geteilt.
+SHARD_KEYS = {
+    "awg": "kennr",
+    "awg_aufwand": "awg_id",
+    "awg_kultur": "awg_id",
+    "awg_schadorg": "awg_id",
+    "awg_wartezeit": "awg_id",
+    "awg_zulassung": "awg_id",
+}
+SHARD_PREFIX_LENGTH = 4
+SHARD_TARGET_ROWS = 5000
+SHARD_MIN_RECORDS = 10000
+SHARD_FORMAT_VERSION = 1
+
+# Spaltenformat (transform.py --columnar): nur für große Tabellen
+COLUMNAR_MIN_RECORDS = 10000
+COLUMNAR_FORMAT_VERSION = 1
+
+# Dictionary-Encoding (transform.py --dict-encode)
+# Schlüssel-Spalten werden immer kodiert, weitere Spalten nur bei geringer
+# Kardinalität (verschiedene Werte / Werte gesamt). Spalten mit gleichem
+# Namen teilen sich ein Wörterbuch; DICTIONARY_DOMAINS fasst zusätzlich
+# unterschiedlich benannte Spalten zusammen.
+DICTIONARY_MIN_RECORDS = 1000
+DICTIONARY_MAX_CARDINALITY = 0.2
+DICTIONARY_KEY_COLUMNS = ["kennr", "awg_id", "wirknr", "aession", "kultur", "schadorg"]
+DICTIONARY_DOMAINS = {
+    "gehalt_einheit": "einheit",
+    "aufwand_einheit": "einheit",
+}
+
+# Natürliche Schlüssel (SQLite: UNIQUE-Index, Delta-Dateien: Zeilen-Identität)
+# Tabellen ohne Eintrag oder mit doppelten Schlüsseln bekommen keine Deltas.
+PRIMARY_KEYS = {
+    "mittel": ["kennr"],
+    "mittel_abgelaufen": ["kennr"],
+    "staerkung": ["kennr"],
+    "zusatzstoff": ["kennr"],
+    "wirkstoff": ["wirknr"],
+    "awg": ["awg_id"],
+    "adresse": ["aession"],
+    "kultur_gruppe": ["kultur"],
+    "schadorg_gruppe": ["schadorg"],
+    "kodeliste": ["koession_art"],
+    "kode": ["koession_art", "koession"],
+    "ghs_gefahrenhinweise": ["h_nr"],
+    "ghs_sicherheitshinweise": ["p_nr"],
+    "ghs_gefahrensymbole": ["symbol"],
+    "wirkstoff_gehalt": ["kennr", "wirknr"],
+    "awg_kultur": ["awg_id", "kultur"],
+    "awg_schadorg": ["awg_id", "schadorg"],
+    "mittel_vertrieb": ["kennr", "aession"],
+}
+
+# Delta-Dateien zwischen zwei Manifest-Versionen (manifest.py)
+# Zeilen-Hashes der letzten Version liegen in data/<DELTA_STATE_FILE>.
+DELTA_STATE_FILE = "rowhashes.json.gz"
+DELTA_FORMAT_VERSION = 1
+
+# SQLite-Datenbank (transform.py --sqlite)
+SQLITE_FILENAME = "psm.sqlite"
+SQLITE_INDEX_COLUMNS = ["kennr", "awg_id", "wirknr"]
+# Volltextsuche (FTS5): (Tabelle, Art, Schlüsselspalte, Textspalten)
+SQLITE_FTS_SOURCES = [
+    ("mittel", "mittel", "kennr", ["mittelname"]),
+    ("mittel_abgelaufen", "mittel", "kennr", ["mittelname"]),
+    ("wirkstoff", "wirkstoff", "wirknr", ["wirkstoffname", "wirkstoffname_en"]),
+    ("kultur_gruppe", "kultur", "kultur", ["kultur_name"]),
+    ("schadorg_gruppe", "schadorg", "schadorg", ["schadorg_name"]),
+]
+
+# Index-Dateien für Joins im Client (transform.py --indexes)
+#   table: Zieltabelle, key: Schlüsselspalte in der Zieltabelle
+#   value: Spalte, deren Werte gesammelt werden (ohne: Zeilen-Offsets)
+#   via:   Join über eine Zwischentabelle (key dort → join-Spalte → Zieltabelle)
+INDEX_FORMAT_VERSION = 1
+INDEX_DEFINITIONS = {
+    "kennr_awg": {"table": "awg", "key": "kennr", "value": "awg_id"},
+    "awg_kultur": {"table": "awg_kultur", "key": "awg_id"},
+    "awg_schadorg": {"table": "awg_schadorg", "key": "awg_id"},
+    "awg_aufwand": {"table": "awg_aufwand", "key": "awg_id"},
+    "awg_wartezeit": {"table": "awg_wartezeit", "key": "awg_id"},
+    "kennr_wirkstoff": {"table": "wirkstoff_gehalt", "key": "kennr"},
+    "kennr_vertrieb": {"table": "mittel_vertrieb", "key": "kennr"},
+    "kennr_adresse": {
+        "table": "adresse",
+        "key": "aession",
+        "via": {"table": "mittel_vertrieb", "key": "kennr", "join": "aession"},
+    },
+}
+
 # ============================================================================
 # 25 ENDPUNKTE (Variante B: Kern + Wichtig)
 # ============================================================================
@@ -201,6 +366,190 @@ ENDPOINTS = {
     },
 }
 
+# ============================================================================
+# FELD-MAPPINGS (BVL-Rohdaten → App-Struktur)
+# ============================================================================
+
+# Pro Endpunkt: (Zielfeld, Quellfeld, Typ, Default)
+#   Quellfeld None  → Konstante (Default wird immer gesetzt)
+#   Typ None        → Wert unverändert übernehmen, Default nur bei fehlendem Feld
+#   Typ "str"/"int"/"float"/"bool" → Wert konvertieren, Default bei
+#                     null, Leerstring oder nicht konvertierbarem Wert
+# Quellfelder werden exakt (mit Groß-/Kleinschreibung) zugeordnet, wie in den
+# abgelösten transform_*-Funktionen; Werte aus Quellfeldern bleiben dort
+# unverändert (Typ None), damit sich die veröffentlichten Daten nicht ändern.
+
+FIELD_MAPPINGS = {
+    "mittel": [
+        ("kennr", "KENNR", None, ""),
+        ("mittelname", "MITTELNAME", None, ""),
+        ("formulierung_art", "FORMULIERUNG_ART", None, None),
+        ("zul_erstmalig_am", "ZUL_ERSTMALIG_AM", None, None),
+        ("zul_ende", "ZUL_ENDE", None, None),
+        ("wirkungsbereich", "WIRKUNGSBEREICH", None, None),
+        ("kennr_zul", "KENNR_ZUL", None, None),
+        ("is_active", None, "bool", True),
+    ],
+    "mittel_abgelaufen": [
+        ("kennr", "KENNR", None, ""),
+        ("mittelname", "MITTELNAME", None, ""),
+        ("formulierung_art", "FORMULIERUNG_ART", None, None),
+        ("zul_erstmalig_am", "ZUL_ERSTMALIG_AM", None, None),
+        ("zul_ende", "ZUL_ENDE", None, None),
+        ("aufbrauchfrist", "AUFBRAUCHFRIST", None, None),
+        ("status", "STATUS", None, None),
+        ("is_active", None, "bool", False),
+    ],
+    "wirkstoff": [
+        ("wirknr", "WIRKNR", None, ""),
+        ("wirkstoffname", "WIRKSTOFFNAME", None, ""),
+        ("wirkstoffname_en", "WIRKSTOFFNAME_EN", None, None),
+        ("cas_nr", "CAS_NR", None, None),
+        ("kategorie", "KATEGORIE", None, None),
+    ],
+    "wirkstoff_gehalt": [
+        ("kennr", "KENNR", None, ""),
+        ("wirknr", "WIRKNR", None, ""),
+        ("gehalt", "GEHALT", None, None),
+        ("gehalt_einheit", "GEHALT_EINHEIT", None, None),
+        ("gehalt_art", "GEHALT_ART", None, None),
+    ],
+    "awg": [
+        ("awg_id", "AWG_ID", None, None),
+        ("kennr", "KENNR", None, ""),
+        ("awg_auflagen", "AWG_AUFLAGEN", None, None),
+        ("awg_anwendungsbereich", "AWG_ANWENDUNGSBEREICH", None, None),
+        ("awg_bis", "AWG_BIS", None, None),
+        ("awg_von", "AWG_VON", None, None),
+        ("antragsteller", "ANTRAGSTELLER", None, None),
+        ("datum", "DATUM", None, None),
+    ],
+    "awg_kultur": [
+        ("awg_id", "AWG_ID", None, None),
+        ("kultur", "KULTUR", None, ""),
+        ("kultur_gruppe", "KULTUR_GRUPPE", None, None),
+        ("schadorg", "SCHADORG", None, None),  # Manchmal enthalten
+    ],
+    "awg_schadorg": [
+        ("awg_id", "AWG_ID", None, None),
+        ("schadorg", "SCHADORG", None, ""),
+        ("schadorg_gruppe", "SCHADORG_GRUPPE", None, None),
+    ],
+    "awg_aufwand": [
+        ("awg_id", "AWG_ID", None, None),
+        ("aufwand", "AUFWAND", None, None),
+        ("aufwand_einheit", "AUFWAND_EINHEIT", None, None),
+        ("aufwand_text", "AUFWAND_TEXT", None, None),
+        ("stadium_von", "STADIUM_VON", None, None),
+        ("stadium_bis", "STADIUM_BIS", None, None),
+    ],
+    "awg_wartezeit": [
+        ("awg_id", "AWG_ID", None, None),
+        ("wartezeit_tage", "WARTEZEIT_TAGE", None, None),
+        ("wartezeit_text", "WARTEZEIT_TEXT", None, None),
+        ("kultur", "KULTUR", None, None),
+        ("ernte_nutzung", "ERNTE_NUTZUNG", None, None),
+    ],
+    "awg_zulassung": [
+        ("awg_id", "AWG_ID", None, None),
+        ("zulassungsnr", "ZULASSUNGSNR", None, None),
+        ("zul_von", "ZUL_VON", None, None),
+        ("zul_bis", "ZUL_BIS", None, None),
+        ("status", "STATUS", None, None),
+    ],
+    "auflagen": [
+        ("auession", "AUESSION", None, ""),
+        ("auession_gruppe", "AUESSION_GRUPPE", None, None),
+        ("auflage", "AUFLAGE", None, None),
+        ("auflage_gruppe", "AUFLAGE_GRUPPE", None, None),
+    ],
+    "kode": [
+        ("koession", "KOESSION", None, ""),
+        ("koession_art", "KOESSION_ART", None, ""),
+        ("kode_text", "KODE_TEXT", None, None),
+        ("kode_zusatz", "KODE_ZUSATZ", None, None),
+    ],
+    "kodeliste": [
+        ("koession_art", "KOESSION_ART", None, ""),
+        ("beschreibung", "BESCHREIBUNG", None, None),
+    ],
+    "kultur_gruppe": [
+        ("kultur", "KULTUR", None, ""),
+        ("kultur_name", "KULTUR_NAME", None, ""),
+        ("eppo_code", "EPPO_CODE", None, None),
+        ("kultur_gruppe", "KULTUR_GRUPPE", None, None),
+    ],
+    "schadorg_gruppe": [
+        ("schadorg", "SCHADORG", None, ""),
+        ("schadorg_name", "SCHADORG_NAME", None, ""),
+        ("eppo_code", "EPPO_CODE", None, None),
+        ("schadorg_gruppe", "SCHADORG_GRUPPE", None, None),
+    ],
+    "adresse": [
+        ("aession", "AESSION", None, ""),
+        ("firma", "FIRMA", None, None),
+        ("strasse", "STRASSE", None, None),
+        ("plz", "PLZ", None, None),
+        ("ort", "ORT", None, None),
+        ("land", "LAND", None, None),
+        ("telefon", "TELEFON", None, None),
+        ("email", "EMAIL", None, None),
+        ("url", "URL", None, None),
+    ],
+    "mittel_vertrieb": [
+        ("kennr", "KENNR", None, ""),
+        ("aession", "AESSION", None, ""),
+        ("vertrieb_art", "VERTRIEB_ART", None, None),
+    ],
+    "ghs_gefahrenhinweise": [
+        ("h_nr", "H_NR", None, ""),
+        ("h_text", "H_TEXT", None, ""),
+        ("signalwort", "SIGNALWORT", None, None),
+    ],
+    "ghs_sicherheitshinweise": [
+        ("p_nr", "P_NR", None, ""),
+        ("p_text", "P_TEXT", None, ""),
+    ],
+    "ghs_gefahrensymbole": [
+        ("symbol", "SYMBOL", None, ""),
+        ("symbol_text", "SYMBOL_TEXT", None, ""),
+        ("bild_url", "BILD_URL", None, None),
+    ],
+    "mittel_gefahren_symbol": [
+        ("kennr", "KENNR", None, ""),
+        ("symbol", "SYMBOL", None, ""),
+        ("h_nr", "H_NR", None, None),
+        ("p_nr", "P_NR", None, None),
+    ],
+    "hinweis": [
+        ("kennr", "KENNR", None, ""),
+        ("hinweis_art", "HINWEIS_ART", None, None),
+        ("hinweis_text", "HINWEIS_TEXT", None, None),
+    ],
+    "staerkung": [
+        ("kennr", "KENNR", None, ""),
+        ("mittelname", "MITTELNAME", None, ""),
+        ("formulierung_art", "FORMULIERUNG_ART", None, None),
+        ("antragsteller", "ANTRAGSTELLER", None, None),
+        ("listung_von", "LISTUNG_VON", None, None),
+        ("listung_bis", "LISTUNG_BIS", None, None),
+    ],
+    "zusatzstoff": [
+        ("kennr", "KENNR", None, ""),
+        ("mittelname", "MITTELNAME", None, ""),
+        ("formulierung_art", "FORMULIERUNG_ART", None, None),
+        ("antragsteller", "ANTRAGSTELLER", None, None),
+        ("listung_von", "LISTUNG_VON", None, None),
+        ("listung_bis", "LISTUNG_BIS", None, None),
+    ],
+    "stand": [
+        ("stand_datum", "STAND_DATUM", None, None),
+        ("stand_text", "STAND_TEXT", None, None),
+        ("version", "VERSION", None, None),
+    ],
+}
+
+
 def get_endpoints_by_priority():
     """Gibt Endpunkte sortiert nach Priorität zurück"""
     sorted_endpoints = sorted(
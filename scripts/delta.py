@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Delta-Generator
+===============
+Erzeugt pro Tabelle eine Delta-Datei (eingefügte, geänderte und gelöschte
+Zeilen, adressiert über den natürlichen Schlüssel aus config.PRIMARY_KEYS)
+von der zuletzt veröffentlichten Manifest-Version zur aktuellen.
+
+Dafür wird pro Tabelle eine Zuordnung Schlüssel → Zeilen-Hash in
+data/rowhashes.json.gz gehalten. Der neue Stand wird nach compressed/
+geschrieben und erst mit den übrigen Dateien veröffentlicht
+(manifest.run_manifest).
+"""
+
+import gzip
+import hashlib
+import io
+import json
+from pathlib import Path
+
+from config import DATA_DIR, DELTA_FORMAT_VERSION, DELTA_STATE_FILE, PRIMARY_KEYS
+from compress import open_gzip
+from jsonstream import iter_json_array
+
+
+def row_hash(row: dict) -> str:
+    """Hash über die kanonische JSON-Darstellung einer Zeile"""
+    canonical = json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _key_string(row: dict, key: list) -> str:
+    return json.dumps([row.get(column) for column in key], ensure_ascii=False, separators=(",", ":"))
+
+
+def hash_table(rows, key: list) -> dict:
+    """
+    Schlüssel → Zeilen-Hash für eine Tabelle.
+    
+    Returns:
+        None wenn der Schlüssel nicht eindeutig ist
+    """
+    hashes = {}
+    for row in rows:
+        k = _key_string(row, key)
+        if k in hashes:
+            return None
+        hashes[k] = row_hash(row)
+    return hashes
+
+
+def load_state(data_dir: str = DATA_DIR) -> dict:
+    """Lädt die Zeilen-Hashes der veröffentlichten Version (leer falls nicht vorhanden)"""
+    state_path = Path(data_dir) / DELTA_STATE_FILE
+    try:
+        with gzip.open(state_path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: dict, output_dir: Path):
+    """Speichert die Zeilen-Hashes der aktuellen Version (in compressed/, noch unveröffentlicht)"""
+    save_gzip_json(state, Path(output_dir) / DELTA_STATE_FILE)
+
+
+def save_gzip_json(document: dict, path: Path):
+    """Schreibt JSON als GZIP (mtime=0 wie compress.py, gleicher Inhalt = gleiche Bytes)"""
+    path.unlink(missing_ok=True)  # evtl. per Hardlink veröffentlicht
+    with open_gzip(path) as raw, io.TextIOWrapper(raw, encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def diff_table(rows, key: list, hashes: dict, previous: dict) -> dict:
+    """Vergleicht die aktuelle Tabelle mit den Hashes der Vorversion"""
+    inserted = []
+    updated = []
+    for row in rows:
+        k = _key_string(row, key)
+        old = previous.get(k)
+        if old is None:
+            inserted.append(row)
+        elif old != hashes[k]:
+            updated.append(row)
+    
+    deleted = [dict(zip(key, json.loads(k))) for k in previous if k not in hashes]
+    
+    return {"inserted": inserted, "updated": updated, "deleted": deleted}
+
+
+def build_deltas(tables: dict, generated: str, output_dir: Path, data_dir: str = DATA_DIR,
+                 checksums: dict = None, row_hashes: dict = None) -> dict:
+    """
+    Schreibt delta.<tabelle>.json.gz für alle geänderten Tabellen und die
+    fortgeschriebenen Zeilen-Hashes nach output_dir. data/ wird nur gelesen.
+    
+    Die Zeilen-Hashes kommen aus compress.py (build_meta.json, row_hashes);
+    eine GZIP-Datei wird nur gelesen, wenn sie fehlen (z.B. Streaming-Modus)
+    oder wenn sich Zeilen geändert haben (für deren Inhalt im Delta), und
+    dann elementweise.
+    
+    Args:
+        tables: Tabellenname → Pfad der aktuellen <tabelle>.json.gz
+        generated: Zeitstempel der aktuellen Manifest-Version ("generated")
+        output_dir: Zielverzeichnis (compressed/)
+        checksums: Dateiname → SHA256; unveränderte Tabellen werden nicht
+                   erneut gelesen
+        row_hashes: Tabellenname → {"key", "rows"} beim Komprimieren
+                    berechnet (compress._compress_job)
+    
+    Returns:
+        Tabellenname → Vorversion der geschriebenen Deltas
+    """
+    output_dir = Path(output_dir)
+    for stale in output_dir.glob("delta.*.json.gz"):
+        stale.unlink()
+    
+    state = load_state(data_dir)
+    previous_version = state.get("generated")
+    previous_tables = state.get("tables", {})
+    
+    new_tables = {}
+    written = {}
+    
+    print("\n🔀 Erzeuge Delta-Dateien...")
+    if not previous_version:
+        print("  ℹ️ Keine Zeilen-Hashes der Vorversion - nur Zustand speichern")
+    
+    for name, path in sorted(tables.items()):
+        key = PRIMARY_KEYS.get(name)
+        if not key:
+            continue
+        
+        checksum = (checksums or {}).get(path.name)
+        previous = previous_tables.get(name)
+        if checksum and previous and previous.get("key") == key and previous.get("checksum") == checksum:
+            # Datei byte-gleich zur Vorversion: keine Änderungen
+            new_tables[name] = previous
+            continue
+        
+        known = (row_hashes or {}).get(name)
+        if known and known.get("key") == key:
+            hashes = known["rows"]
+        else:
+            hashes = hash_table(iter_json_array(path), key)
+        new_tables[name] = {"key": key, "checksum": checksum, "rows": hashes}
+        if hashes is None:
+            print(f"  ⚠️ {name}: Schlüssel ({', '.join(key)}) nicht eindeutig - kein Delta")
+            continue
+        
+        if not previous_version or not previous or previous.get("key") != key or previous.get("rows") is None:
+            continue
+        if hashes == previous["rows"]:
+            continue
+        
+        delta = diff_table(iter_json_array(path), key, hashes, previous["rows"])
+        count = len(delta["inserted"]) + len(delta["updated"]) + len(delta["deleted"])
+        if not count:
+            continue
+        
+        document = {
+            "format": "delta",
+            "version": DELTA_FORMAT_VERSION,
+            "table": name,
+            "key": key,
+            "from": previous_version,
+            "to": generated,
+            "count": count,
+            **delta,
+        }
+        save_gzip_json(document, output_dir / f"delta.{name}.json.gz")
+        written[name] = previous_version
+        
+        print(f"  {name:30} +{len(delta['inserted']):<7,} ~{len(delta['updated']):<7,} -{len(delta['deleted']):<7,}")
+    
+    save_state({"generated": generated, "tables": new_tables}, output_dir)
+    hashed = sum(1 for table in new_tables.values() if table["rows"] is not None)
+    print(f"  💾 {len(written)} Deltas, Zeilen-Hashes für {hashed} Tabellen gespeichert")
+    
+    return written
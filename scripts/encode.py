@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Dictionary-Encoding
+===================
+Ersetzt häufig wiederholte Strings (kennr, kultur, Einheiten, ...) durch
+Indizes in gemeinsame Wörterbücher.
+
+Ausgabe (im transformed/ Verzeichnis):
+  dictionary.<domain>.json  Wörterbuch: {"format": "dictionary", "values": [...]}
+  <name>.dict.json          Tabelle im Spaltenformat, kodierte Spalten als Indizes
+"""
+
+import json
+from collections import Counter
+from pathlib import Path
+
+from config import (
+    DATA_DIR,
+    DICTIONARY_MIN_RECORDS,
+    DICTIONARY_MAX_CARDINALITY,
+    DICTIONARY_KEY_COLUMNS,
+    DICTIONARY_DOMAINS,
+)
+from transform import to_columnar
+
+
+def _string_columns(rows: list) -> list:
+    """Spalten, die ausschließlich Strings (oder null) enthalten"""
+    if not rows:
+        return []
+    columns = []
+    for column in rows[0]:
+        values = (row.get(column) for row in rows)
+        if all(v is None or isinstance(v, str) for v in values):
+            columns.append(column)
+    return columns
+
+
+def plan_dictionaries(data: dict, min_records: int = DICTIONARY_MIN_RECORDS) -> tuple:
+    """
+    Bestimmt, welche Spalten über welches Wörterbuch kodiert werden, und
+    baut die Wörterbücher. Häufige Werte bekommen kleine Indizes.
+    
+    Jede Tabelle wird genau einmal gelesen (data kann die Tabellen bei
+    jedem Zugriff neu laden, transform.TransformedTables); die Häufigkeiten
+    aller Kandidaten-Spalten dienen zugleich der Auswahl und den
+    Wörterbüchern.
+    
+    Returns:
+        ({tabelle: {spalte: domain}}, {domain: [wert, ...]})
+    """
+    candidates = {}
+    frequencies = {}
+    totals = Counter()
+    
+    for name, rows in data.items():
+        if len(rows) < min_records:
+            continue
+        for column in _string_columns(rows):
+            domain = DICTIONARY_DOMAINS.get(column, column)
+            counter = frequencies.setdefault(domain, Counter())
+            counter.update(row[column] for row in rows if row.get(column) is not None)
+            totals[domain] += len(rows)
+            candidates.setdefault(name, {})[column] = domain
+    
+    selected = set()
+    for domain, counter in frequencies.items():
+        if not counter:
+            continue
+        is_key = domain in DICTIONARY_KEY_COLUMNS
+        if is_key or len(counter) <= totals[domain] * DICTIONARY_MAX_CARDINALITY:
+            selected.add(domain)
+    
+    plan = {}
+    for name, columns in candidates.items():
+        encoded = {column: domain for column, domain in columns.items() if domain in selected}
+        if encoded:
+            plan[name] = encoded
+    
+    # Alle Spalten einer ausgewählten Domain sind im Plan, ihre Häufigkeiten
+    # also schon vollständig gezählt
+    dictionaries = {
+        domain: [value for value, _ in sorted(frequencies[domain].items(), key=lambda item: (-item[1], item[0]))]
+        for domain in sorted(selected)
+    }
+    return plan, dictionaries
+
+
+def encode_table(name: str, rows: list, columns: dict, dictionaries: dict) -> dict:
+    """Kodiert eine Tabelle im Spaltenformat (null bleibt null)"""
+    table = to_columnar(name, rows)
+    
+    for column, domain in columns.items():
+        lookup = {value: idx for idx, value in enumerate(dictionaries[domain])}
+        col_idx = table["columns"].index(column)
+        table["data"][col_idx] = [None if v is None else lookup[v] for v in table["data"][col_idx]]
+    
+    table["dictionaries"] = dict(columns)
+    return table
+
+
+def encode_all(data: dict, min_records: int = DICTIONARY_MIN_RECORDS) -> tuple:
+    """
+    Dictionary-Encoding für alle transformierten Tabellen.
+    
+    Die Tabellen werden erst beim Speichern einzeln kodiert, damit nicht
+    alle kodierten Tabellen zugleich im Speicher liegen.
+    
+    Returns:
+        (dictionaries, Iterator über (name, encoded_table))
+    """
+    print("\n📚 Dictionary-Encoding...")
+    
+    plan, dictionaries = plan_dictionaries(data, min_records)
+    
+    for domain, values in dictionaries.items():
+        print(f"  📖 {domain:25} {len(values):>8,} Werte")
+    
+    def encoded():
+        for name, columns in plan.items():
+            yield name, encode_table(name, data[name], columns, dictionaries)
+            print(f"  ✅ {name:25} {', '.join(columns)}")
+    
+    return dictionaries, encoded()
+
+
+def save_encoded_data(dictionaries: dict, encoded, output_dir: str = DATA_DIR):
+    """Speichert Wörterbücher und kodierte Tabellen (name, table) im transformed/ Verzeichnis"""
+    out_dir = Path(output_dir) / "transformed"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    for domain, values in dictionaries.items():
+        file_path = out_dir / f"dictionary.{domain}.json"
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"format": "dictionary", "domain": domain, "count": len(values), "values": values},
+                      f, ensure_ascii=False)
+        print(f"  💾 dictionary.{domain}.json")
+    
+    for name, table in encoded:
+        file_path = out_dir / f"{name}.dict.json"
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(table, f, ensure_ascii=False)
+        print(f"  💾 {name}.dict.json")
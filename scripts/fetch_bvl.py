@@ -6,169 +6,673 @@ Lädt alle 25 Endpunkte von der BVL API mit Pagination und Retry-Logik.
 """
 
 import json
-import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 
 from config import (
     BVL_BASE_URL,
     DEFAULT_LIMIT,
     MAX_RETRIES,
-    RETRY_DELAY,
+    DEFAULT_CONCURRENCY,
     DATA_DIR,
+    ENDPOINTS,
+    PAGE_SIZES_FILE,
+    FETCH_PROGRESS_STEP,
+    PROFILE_DIR,
     get_endpoints_by_priority,
     get_endpoint_count
 )
+from checkpoint import CheckpointStore, PageCheckpoint, save_fetch_status
+from http_client import HttpClient
+from pagesize import PageSizer
+from profiling import profile_stage
+from ratelimit import AdaptiveRateLimiter, parse_retry_after
+from compress import JsonArrayWriter, save_build_meta
+from transform import print_mapping_report, transform_items
+
+# Eine Keep-Alive-Verbindung pro Host und Worker-Thread, gzip-komprimiert
+HTTP = HttpClient(timeout=60, headers={"User-Agent": "PSM-Desk-DB/1.0"})
+# Gemeinsame Ratenbegrenzung aller Abruf-Threads
+LIMITER = AdaptiveRateLimiter()
+# Gelernte Seitengröße pro Endpunkt
+PAGE_SIZES = PageSizer()
+
+# Basis-URL der Requests (--base-url, sonst config.BVL_BASE_URL)
+API_BASE_URL = BVL_BASE_URL
+
+
+def set_base_url(url: str):
+    """Setzt die Basis-URL der API (z.B. mock_bvl_server.py)"""
+    global API_BASE_URL
+    API_BASE_URL = url.rstrip("/")
 
 
 def fetch_with_retry(url: str, retries: int = MAX_RETRIES) -> dict:
-    """Fetch URL mit Retry-Logik"""
+    """
+    Fetch URL mit Retry-Logik.
+    
+    Jeder Request läuft über LIMITER; 429/5xx, Verbindungsfehler und
+    ungültiges JSON senken dessen Rate, Retry-After pausiert alle Threads.
+    Vor einer Wiederholung wird zufällig mit exponentiell wachsender
+    Obergrenze gewartet.
+    """
+    return fetch_with_retry_timed(url, retries)[0]
+
+
+def fetch_with_retry_timed(url: str, retries: int = MAX_RETRIES) -> tuple:
+    """
+    Wie fetch_with_retry.
+    
+    Returns:
+        (JSON, Antwortzeit des erfolgreichen Requests, Bytes der Antwort)
+    """
     last_error = None
     
     for attempt in range(retries):
+        if attempt:
+            HTTP.record_retry(url)
         try:
-            req = Request(url, headers={
-                "Accept": "application/json",
-                "User-Agent": "PSM-Desk-DB/1.0"
-            })
-            with urlopen(req, timeout=60) as response:
-                return json.loads(response.read().decode("utf-8"))
+            with LIMITER.slot():
+                start = time.perf_counter()
+                body = HTTP.get(url)
+            latency = time.perf_counter() - start
+            data = json.loads(body.decode("utf-8"))
+            LIMITER.on_success(latency)
+            return data, latency, len(body)
         except HTTPError as e:
             last_error = e
-            if e.code == 429:  # Too Many Requests
-                wait_time = RETRY_DELAY * (attempt + 1) * 2
-                print(f"    ⏳ Rate limited, warte {wait_time}s...")
-                time.sleep(wait_time)
-            elif e.code >= 500:  # Server Error
-                wait_time = RETRY_DELAY * (attempt + 1)
-                print(f"    ⚠️ Server Error {e.code}, Retry in {wait_time}s...")
-                time.sleep(wait_time)
-            else:
+            if e.code != 429 and e.code < 500:
                 raise
-        except URLError as e:
+            retry_after = parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+            LIMITER.on_throttle(e.code, retry_after)
+            if attempt + 1 == retries:
+                break
+            reason = "Rate limited" if e.code == 429 else f"Server Error {e.code}"
+            if retry_after:
+                # Die Pause gilt im Limiter für alle Threads
+                print(f"    ⏳ {reason}, warte {retry_after:g}s (Retry-After)...")
+            else:
+                wait_time = LIMITER.backoff(attempt)
+                print(f"    ⚠️ {reason}, Retry in {wait_time:.1f}s...")
+                time.sleep(wait_time)
+        except (URLError, ValueError) as e:
+            # ValueError: abgeschnittene oder kaputte JSON-Antwort
             last_error = e
-            wait_time = RETRY_DELAY * (attempt + 1)
-            print(f"    ⚠️ Netzwerkfehler, Retry in {wait_time}s...")
+            LIMITER.on_error()
+            if attempt + 1 == retries:
+                break
+            wait_time = LIMITER.backoff(attempt)
+            reason = "Netzwerkfehler" if isinstance(e, URLError) else "Ungültige JSON-Antwort"
+            print(f"    ⚠️ {reason}, Retry in {wait_time:.1f}s...")
             time.sleep(wait_time)
     
     raise last_error
 
 
-def fetch_endpoint(name: str, path: str) -> list:
+def fetch_page(path: str, offset: int, limit: int = DEFAULT_LIMIT) -> list:
+    """Fetch eine einzelne Seite eines Endpunkts"""
+    url = f"{API_BASE_URL}{path}?limit={limit}&offset={offset}"
+    data = fetch_with_retry(url)
+    return data.get("items", [])
+
+
+def fetch_page_sized(path: str, offset: int, limit: int) -> dict:
     """
-    Fetch einen Endpunkt mit Pagination.
-    Gibt alle Datensätze zurück.
+    Fetch eine Seite und lernt aus Antwortzeit und Größe die Seitengröße
+    des Endpunkts (PAGE_SIZES).
+    
+    Returns:
+        {"items": [...], "hasMore": bool}; ohne hasMore in der Antwort
+        gilt eine volle Seite als "weitere Daten vorhanden"
     """
-    all_items = []
-    offset = 0
+    url = f"{API_BASE_URL}{path}?limit={limit}&offset={offset}"
+    data, latency, size = fetch_with_retry_timed(url)
+    items = data.get("items", [])
+    server_limit = data.get("limit")
+    PAGE_SIZES.observe(path, limit, len(items), latency, size,
+                       server_limit if isinstance(server_limit, int) else None)
+    return {"items": items, "hasMore": bool(data.get("hasMore", len(items) >= limit))}
+
+
+def _cancel_pending(pending: list):
+    """Bricht noch nicht gestartete Seiten-Abrufe ab"""
+    for _, future in pending:
+        if future is not None:
+            future.cancel()
+
+
+class PageFetchError(Exception):
+    """Eine Seite konnte auch nach allen Retries nicht geladen werden"""
+    
+    def __init__(self, offset: int, error: Exception):
+        super().__init__(f"Offset {offset}: {error}")
+        self.offset = offset
+
+
+def _is_overload(error: Exception) -> bool:
+    """Timeout oder 5xx: die Seite war evtl. zu groß (anders als z.B. 404)"""
+    if isinstance(error, HTTPError):
+        return error.code >= 500
+    return isinstance(error, URLError) and isinstance(error.reason, TimeoutError)
+
+
+def iter_pages(path: str, pool: ThreadPoolExecutor = None, window: int = 1, offset: int = 0):
+    """
+    Liefert die Seiten eines Endpunkts in Offset-Reihenfolge ab `offset`.
+    
+    Die Seitengröße kommt aus PAGE_SIZES und wird pro Fenster neu gelesen.
+    Ohne Pool wird seriell geblättert (Tempo bestimmt LIMITER).
+    Mit Pool werden Fenster von `window` Offsets parallel abgerufen. Ist die
+    Anzahl Datensätze aus dem letzten Abruf bekannt, wird das erste Fenster
+    danach geplant; sonst dient die erste Seite allein als Probe.
+    Das Ende erkennt hasMore der API. Liefert der Server kleinere Seiten als
+    angefragt, wird ab dem Ende der Seite mit seiner Grenze neu geplant.
+    
+    Raises:
+        PageFetchError: Eine Seite ist fehlgeschlagen (der Endpunkt ist
+            unvollständig; die bisherigen Seiten wurden bereits geliefert)
+    """
+    expected = PAGE_SIZES.expected_count(path)
+    batch = 1
     
     while True:
-        url = f"{BVL_BASE_URL}{path}?limit={DEFAULT_LIMIT}&offset={offset}"
-        
-        try:
-            data = fetch_with_retry(url)
-        except Exception as e:
-            print(f"    ❌ Fehler bei Offset {offset}: {e}")
-            break
+        limit = PAGE_SIZES.limit(path)
+        if pool is not None and expected and offset < expected:
+            batch = min(max(1, window), -(-(expected - offset) // limit))
+        offsets = [offset + i * limit for i in range(batch)]
+        if pool is None:
+            pending = [(o, None) for o in offsets]
+        else:
+            pending = [(o, pool.submit(fetch_page_sized, path, o, limit)) for o in offsets]
         
-        items = data.get("items", [])
-        if not items:
-            break
+        for page_offset, future in pending:
+            try:
+                page = future.result() if future else fetch_page_sized(path, page_offset, limit)
+            except Exception as e:
+                print(f"    ❌ Fehler bei Offset {page_offset}: {e}")
+                _cancel_pending(pending)
+                if _is_overload(e):
+                    PAGE_SIZES.on_failure(path)
+                raise PageFetchError(page_offset, e) from e
+            
+            items = page["items"]
+            if items:
+                yield items
+            offset = page_offset + len(items)
+            
+            # Prüfen ob es mehr Daten gibt
+            if not page["hasMore"] or not items:
+                _cancel_pending(pending)
+                PAGE_SIZES.set_count(path, offset)
+                return
+            
+            # Kleinere Seite als angefragt: folgende Offsets passen nicht mehr
+            if len(items) < limit:
+                _cancel_pending(pending)
+                break
         
+        if pool is not None:
+            batch = max(1, window)
+
+
+def iter_endpoint_pages(name: str, path: str, pool: ThreadPoolExecutor = None, window: int = 1,
+                        checkpoint: PageCheckpoint = None):
+    """
+    Wie iter_pages, mit Checkpoint: gespeicherte Seiten werden zuerst
+    geliefert, dann wird ab dem ersten fehlenden Offset weitergeladen und
+    jede neue Seite gespeichert.
+    """
+    if checkpoint is None:
+        yield from iter_pages(path, pool, window)
+        return
+    
+    pages, offset, complete = checkpoint.load()
+    if pages:
+        state = "vollständig" if complete else f"weiter ab Offset {offset:,}"
+        print(f"    ⏩ {name}: {offset:,} Datensätze aus Checkpoint ({state})")
+    yield from pages
+    if complete:
+        return
+    
+    for items in iter_pages(path, pool, window, offset):
+        checkpoint.save_page(offset, items)
+        offset += len(items)
+        yield items
+    checkpoint.mark_complete(offset)
+
+
+def _with_progress(name: str, pages):
+    """
+    Reicht Seiten durch und meldet den Fortschritt bei großen Datensätzen.
+    
+    Seitengrößen sind adaptiv, die Summe trifft also selten ein exaktes
+    Vielfaches; gemeldet wird, sobald die nächste Schwelle überschritten ist.
+    """
+    count = 0
+    next_report = FETCH_PROGRESS_STEP
+    for items in pages:
+        count += len(items)
+        if count >= next_report:
+            print(f"    📥 {name}: {count:,} Datensätze geladen...")
+            next_report = (count // FETCH_PROGRESS_STEP + 1) * FETCH_PROGRESS_STEP
+        yield items
+
+
+def fetch_endpoint(name: str, path: str, pool: ThreadPoolExecutor = None, window: int = 1,
+                   checkpoint: PageCheckpoint = None) -> list:
+    """
+    Fetch einen Endpunkt mit Pagination.
+    Gibt alle Datensätze zurück.
+    """
+    all_items = []
+    
+    for items in _with_progress(name, iter_endpoint_pages(name, path, pool, window, checkpoint)):
         all_items.extend(items)
-        
-        # Prüfen ob es mehr Daten gibt
-        if len(items) < DEFAULT_LIMIT:
-            break
-        
-        offset += DEFAULT_LIMIT
-        
-        # Fortschritt anzeigen bei großen Datensätzen
-        if offset % 5000 == 0:
-            print(f"    📥 {len(all_items):,} Datensätze geladen...")
-        
-        # Kurze Pause um API nicht zu überlasten
-        time.sleep(0.1)
     
     return all_items
 
 
-def fetch_all_endpoints(test_mode: bool = False) -> dict:
+def _fetch_one(name: str, cfg: dict, test_mode: bool, pool: ThreadPoolExecutor = None, window: int = 1,
+               checkpoint: PageCheckpoint = None) -> list:
+    """Lädt einen Endpunkt (Test-Modus: nur 1 Datensatz)"""
+    path = cfg["path"]
+    
+    if test_mode:
+        if pool is None:
+            return fetch_page(path, 0, limit=1)
+        return pool.submit(fetch_page, path, 0, 1).result()
+    
+    return fetch_endpoint(name, path, pool, window, checkpoint)
+
+
+class StreamSink:
+    """
+    Leitet jede geladene Seite durch den passenden Transformer direkt in
+    den GZIP-Writer. Roh- und transformierte Dumps sind optional.
+    """
+    
+    def __init__(self, name: str, output_dir: str = DATA_DIR,
+                 dump_raw: bool = False, dump_transformed: bool = False):
+        out_dir = Path(output_dir)
+        self.name = name
+        self.compressed = JsonArrayWriter(out_dir / "compressed" / f"{name}.json.gz")
+        self.raw = JsonArrayWriter(out_dir / "raw" / f"{name}.json", compress=False) if dump_raw else None
+        self.transformed = (JsonArrayWriter(out_dir / "transformed" / f"{name}.json", compress=False)
+                            if dump_transformed else None)
+    
+    def write(self, items: list):
+        if self.raw:
+            self.raw.write(items)
+        rows = transform_items(self.name, items)
+        self.compressed.write(rows)
+        if self.transformed:
+            self.transformed.write(rows)
+    
+    def close(self) -> dict:
+        for writer in (self.raw, self.transformed):
+            if writer:
+                writer.close()
+        original_size, compressed_size = self.compressed.close()
+        print_mapping_report(self.name)
+        return {
+            "count": self.compressed.count,
+            "original_size": original_size,
+            "compressed_size": compressed_size,
+            "sha256": self.compressed.sha256,
+        }
+    
+    def abort(self):
+        """Schließt die Writer und löscht die unvollständigen Dateien"""
+        for writer in (self.raw, self.transformed, self.compressed):
+            if writer:
+                writer.close()
+                writer.path.unlink(missing_ok=True)
+
+
+class RawSink:
+    """Schreibt die geladenen Seiten eines Endpunkts direkt nach raw/<name>.json"""
+    
+    def __init__(self, name: str, output_dir: str = DATA_DIR):
+        self.raw = JsonArrayWriter(Path(output_dir) / "raw" / f"{name}.json", compress=False)
+    
+    def write(self, items: list):
+        self.raw.write(items)
+    
+    def close(self) -> dict:
+        self.raw.close()
+        return {"count": self.raw.count}
+    
+    def abort(self):
+        """Schließt den Writer und löscht die unvollständige Datei"""
+        self.raw.close()
+        self.raw.path.unlink(missing_ok=True)
+
+
+def _stream_one(name: str, cfg: dict, test_mode: bool, sink,
+                pool: ThreadPoolExecutor = None, window: int = 1, checkpoint: PageCheckpoint = None) -> dict:
+    """Lädt einen Endpunkt seitenweise in einen Sink (StreamSink, RawSink; bei Fehler ohne Ausgabe-Datei)"""
+    try:
+        if test_mode:
+            sink.write(_fetch_one(name, cfg, test_mode, pool, window))
+        else:
+            for items in _with_progress(name, iter_endpoint_pages(name, cfg["path"], pool, window, checkpoint)):
+                sink.write(items)
+    except BaseException:
+        sink.abort()
+        raise
+    return sink.close()
+
+
+def _run_endpoint(name: str, cfg: dict, test_mode: bool, sink_factory=None,
+                  pool: ThreadPoolExecutor = None, window: int = 1, checkpoints: CheckpointStore = None) -> tuple:
+    """
+    Lädt einen Endpunkt - gesammelt oder über einen Sink.
+    
+    Returns:
+        (Datensätze bzw. Stream-Statistik, Anzahl Datensätze)
+    """
+    checkpoint = checkpoints.endpoint(name, cfg["path"]) if checkpoints and not test_mode else None
+    
+    if sink_factory is None:
+        items = _fetch_one(name, cfg, test_mode, pool, window, checkpoint)
+        return items, len(items)
+    
+    stats = _stream_one(name, cfg, test_mode, sink_factory(name), pool, window, checkpoint)
+    return stats, stats["count"]
+
+
+def _fetch_concurrent(endpoints: list, test_mode: bool, concurrency: int, sink_factory=None,
+                      checkpoints: CheckpointStore = None) -> tuple:
+    """
+    Lädt alle Endpunkte parallel.
+    
+    Die Endpunkte sind beim Abruf voneinander unabhängig; die Priorität
+    bestimmt nur, in welcher Reihenfolge sie eingeplant werden (Lookups
+    zuerst) und in welcher Reihenfolge die Ergebnisse zurückgegeben werden.
+    Ein Seiten-Pool begrenzt die gleichzeitigen Requests auf `concurrency`.
+    Fehlgeschlagene Endpunkte fehlen im Ergebnis.
+    """
+    total = len(endpoints)
+    results = {}
+    counts = {}
+    
+    def timed_fetch(name: str, cfg: dict) -> tuple:
+        start = time.time()
+        value, count = _run_endpoint(name, cfg, test_mode, sink_factory, pool, concurrency, checkpoints)
+        return value, count, time.time() - start
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bvl-page") as pool, \
+         ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bvl-endpoint") as coordinators:
+        futures = {}
+        for name, cfg in endpoints:
+            futures[coordinators.submit(timed_fetch, name, cfg)] = (name, cfg)
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            name, cfg = futures[future]
+            try:
+                value, count, elapsed = future.result()
+                print(f"[{done:2}/{total}] ✅ {name:25} {count:>8,} Datensätze in {elapsed:.1f}s ({cfg['group']})")
+            except Exception as e:
+                print(f"[{done:2}/{total}] ❌ {name:25} FEHLER: {e}")
+                continue
+            results[name] = value
+            counts[name] = count
+    
+    # Ergebnisse in Prioritäts-Reihenfolge zurückgeben
+    return {name: results[name] for name, _ in endpoints if name in results}, counts
+
+
+def fetch_all_endpoints(test_mode: bool = False, concurrency: int = DEFAULT_CONCURRENCY,
+                        sink_factory=None, checkpoints: CheckpointStore = None,
+                        page_sizes: Path = None, stream: bool = False) -> dict:
     """
     Fetch alle 25 Endpunkte in der richtigen Reihenfolge.
     
     Args:
         test_mode: Wenn True, nur ersten Datensatz pro Endpunkt laden
+        concurrency: Anzahl paralleler Requests (1 = seriell)
+        sink_factory: Optional name -> Sink (StreamSink, RawSink); dann
+            werden die Seiten gestreamt statt gesammelt
+        checkpoints: Optional; jede Seite wird gespeichert bzw. aus einem
+            früheren Abruf übernommen (--resume)
+        page_sizes: Optional Zustands-Datei der Seitengrößen (pagesize.py);
+            wird gelesen und nach dem Abruf aktualisiert
+        stream: Streaming-Modus (--stream), nur für die Ausgabe
     
     Returns:
-        Dictionary mit allen Daten
+        Dictionary mit allen Daten (bzw. Sink-Statistik pro Endpunkt);
+        nicht vollständig geladene Endpunkte fehlen
     """
     results = {}
+    counts = {}
     total = get_endpoint_count()
+    endpoints = get_endpoints_by_priority()
     
     print(f"\n{'='*60}")
     print(f"🌐 BVL API Fetch - {total} Endpunkte")
     print(f"{'='*60}")
     print(f"📅 Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"🔧 Test-Modus: {'JA (nur 1 Datensatz)' if test_mode else 'NEIN (alle Daten)'}")
+    print(f"🔀 Parallelität: {concurrency}")
+    if stream:
+        print(f"🌊 Streaming: Seiten → Transformer → GZIP")
     print(f"{'='*60}\n")
     
     start_time = time.time()
+    HTTP.reset_stats()
+    LIMITER.reset(concurrency=concurrency)
+    PAGE_SIZES.reset(page_sizes)
     
-    for idx, (name, cfg) in enumerate(get_endpoints_by_priority(), 1):
-        path = cfg["path"]
-        desc = cfg["description"]
-        group = cfg["group"]
-        
-        print(f"[{idx:2}/{total}] 📡 {name}")
-        print(f"        Gruppe: {group} | {desc}")
-        
-        endpoint_start = time.time()
-        
-        try:
-            if test_mode:
-                # Test-Modus: nur 1 Datensatz
-                url = f"{BVL_BASE_URL}{path}?limit=1&offset=0"
-                data = fetch_with_retry(url)
-                items = data.get("items", [])
-            else:
-                items = fetch_endpoint(name, path)
+    if concurrency > 1:
+        results, counts = _fetch_concurrent(endpoints, test_mode, concurrency, sink_factory, checkpoints)
+    else:
+        for idx, (name, cfg) in enumerate(endpoints, 1):
+            desc = cfg["description"]
+            group = cfg["group"]
+            
+            print(f"[{idx:2}/{total}] 📡 {name}")
+            print(f"        Gruppe: {group} | {desc}")
             
-            results[name] = items
+            endpoint_start = time.time()
             
-            elapsed = time.time() - endpoint_start
-            print(f"        ✅ {len(items):,} Datensätze in {elapsed:.1f}s")
+            try:
+                results[name], counts[name] = _run_endpoint(name, cfg, test_mode, sink_factory,
+                                                            checkpoints=checkpoints)
+                
+                elapsed = time.time() - endpoint_start
+                print(f"        ✅ {counts[name]:,} Datensätze in {elapsed:.1f}s")
             
-        except Exception as e:
-            print(f"        ❌ FEHLER: {e}")
-            results[name] = []
+            except Exception as e:
+                print(f"        ❌ FEHLER: {e}")
     
     total_time = time.time() - start_time
-    total_records = sum(len(v) for v in results.values())
+    total_records = sum(counts.values())
+    failed = [name for name, _ in endpoints if name not in results]
     
     print(f"\n{'='*60}")
-    print(f"✅ Fetch abgeschlossen!")
-    print(f"   📊 {total_records:,} Datensätze von {total} Endpunkten")
+    print(f"{'⚠️' if failed else '✅'} Fetch abgeschlossen!")
+    print(f"   📊 {total_records:,} Datensätze von {len(results)}/{total} Endpunkten")
     print(f"   ⏱️  Gesamtzeit: {total_time:.1f}s")
+    if failed:
+        hint = " (fortsetzen mit --resume)" if checkpoints else ""
+        print(f"   ❌ Unvollständig: {', '.join(failed)}{hint}")
     print(f"{'='*60}\n")
     
+    HTTP.print_stats()
+    LIMITER.print_state()
+    PAGE_SIZES.print_state()
+    PAGE_SIZES.save()
+    print()
+    
     return results
 
 
-def save_raw_data(data: dict, output_dir: str = DATA_DIR):
-    """Speichert Rohdaten als JSON"""
-    raw_dir = Path(output_dir) / "raw"
-    raw_dir.mkdir(parents=True, exist_ok=True)
+def print_stream_stats(stats: dict):
+    """Gibt die Komprimierungs-Statistik des Streaming-Modus aus"""
+    print("🗜️ Gestreamt und komprimiert:")
+    print("-" * 60)
+    
+    total_original = 0
+    total_compressed = 0
+    for name, s in sorted(stats.items()):
+        if not isinstance(s, dict):
+            continue
+        original_size, compressed_size = s["original_size"], s["compressed_size"]
+        ratio = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
+        total_original += original_size
+        total_compressed += compressed_size
+        print(f"  {name:30} {original_size/1024:8.1f} KB → {compressed_size/1024:8.1f} KB ({ratio:5.1f}%)")
     
-    for name, items in data.items():
-        file_path = raw_dir / f"{name}.json"
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False, indent=2)
-        print(f"  💾 {name}.json ({len(items):,} Datensätze)")
+    print("-" * 60)
+    total_ratio = (1 - total_compressed / total_original) * 100 if total_original > 0 else 0
+    print(f"  {'GESAMT':30} {total_original/1024:8.1f} KB → {total_compressed/1024:8.1f} KB ({total_ratio:5.1f}%)")
+
+
+def load_published_manifest(output_dir: str = DATA_DIR) -> dict:
+    """Liest das zuletzt veröffentlichte manifest.json (leer, falls nicht vorhanden)"""
+    manifest_path = Path(output_dir) / "manifest.json"
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_published_stand(output_dir: str = DATA_DIR) -> dict:
+    """Liest den Datenstand aus dem zuletzt veröffentlichten manifest.json"""
+    return load_published_manifest(output_dir).get("stand")
+
+
+def fetch_current_stand() -> dict:
+    """Lädt den aktuellen Datenstand (transformiert wie im Manifest)"""
+    items = fetch_page(ENDPOINTS["stand"]["path"], 0)
+    transformed = transform_items("stand", items)
+    return transformed[0] if transformed else None
+
+
+def load_current_stand(test_mode: bool = False) -> dict:
+    """
+    Datenstand für einen Abruf, einmal pro Lauf geladen (None im
+    Test-Modus oder bei einem Abruffehler).
+    """
+    if test_mode:
+        return None
+    try:
+        return fetch_current_stand()
+    except Exception as e:
+        print(f"⚠️ Datenstand konnte nicht abgerufen werden: {e}")
+        return None
+
+
+def _has_stand_value(stand: dict) -> bool:
+    """Ein Datenstand ohne einen einzigen Wert ist nicht vergleichbar"""
+    return bool(stand) and any(v not in (None, "") for v in stand.values())
+
+
+def is_stand_unchanged(current: dict, output_dir: str = DATA_DIR) -> bool:
+    """
+    Vergleicht den Datenstand der BVL (load_current_stand) mit dem zuletzt
+    veröffentlichten.
+    
+    Im Zweifel (kein Manifest, leerer Datenstand, Abruffehler) und wenn die
+    veröffentlichte Version unvollständige Tabellen enthält, wird False
+    zurückgegeben, damit ein vollständiger Abruf stattfindet.
+    """
+    manifest = load_published_manifest(output_dir)
+    published = manifest.get("stand")
+    
+    if manifest.get("incomplete"):
+        print(f"⚠️ Veröffentlichte Version unvollständig: {', '.join(manifest['incomplete'])}")
+        return False
+    
+    print(f"📅 Datenstand BVL:           {current}")
+    print(f"📅 Datenstand veröffentlicht: {published}")
+    
+    if not _has_stand_value(current) or not _has_stand_value(published):
+        return False
+    
+    return current == published
+
+
+def check_stand_changed(stand: dict, output_dir: str = DATA_DIR, test_mode: bool = False,
+                        force: bool = False) -> bool:
+    """
+    Prüft, ob ein Abruf nötig ist.
+    
+    Returns:
+        False bei unverändertem Datenstand (Abruf überspringen)
+    """
+    if not test_mode and not force and is_stand_unchanged(stand, output_dir):
+        print("\n⏭️ Datenstand unverändert - Abruf wird übersprungen (--force erzwingt ihn)")
+        return False
+    return True
+
+
+def open_checkpoints(stand: dict, output_dir: str = DATA_DIR, test_mode: bool = False,
+                     resume: bool = False) -> CheckpointStore:
+    """
+    Checkpoints für einen Abruf zum Datenstand stand (None im Test-Modus).
+    
+    Mit resume werden vorhandene Checkpoints desselben Datenstands
+    fortgesetzt, sonst verworfen.
+    """
+    if test_mode:
+        return None
+    return CheckpointStore(output_dir, stand, resume)
+
+
+def page_sizes_path(output_dir: str = DATA_DIR, test_mode: bool = False) -> Path:
+    """Zustands-Datei der Seitengrößen (None im Test-Modus)"""
+    return None if test_mode else Path(output_dir) / PAGE_SIZES_FILE
+
+
+def finish_fetch(results: dict, output_dir: str = DATA_DIR, checkpoints: CheckpointStore = None) -> list:
+    """
+    Schreibt raw/fetch_status.json; nach einem vollständigen Abruf werden
+    die Checkpoints gelöscht.
+    
+    Returns:
+        Namen der unvollständig geladenen Endpunkte
+    """
+    incomplete = [name for name in ENDPOINTS if name not in results]
+    save_fetch_status(output_dir, incomplete)
+    if checkpoints is not None and not incomplete:
+        checkpoints.clear()
+    return incomplete
+
+
+def run_fetch(output_dir: str = DATA_DIR, test_mode: bool = False, force: bool = False,
+              concurrency: int = DEFAULT_CONCURRENCY, resume: bool = False) -> dict:
+    """
+    Lädt alle Endpunkte und schreibt die Rohdaten seitenweise nach
+    raw/<name>.json (RawSink), ohne eine Tabelle im Speicher zu sammeln.
+    
+    Unvollständig geladene Endpunkte bekommen keine Rohdaten-Datei, sondern
+    einen Eintrag in raw/fetch_status.json (siehe checkpoint.py).
+    
+    Returns:
+        Anzahl Datensätze pro Endpunkt (None bei unverändertem Datenstand)
+    """
+    stand = load_current_stand(test_mode)
+    if not check_stand_changed(stand, output_dir, test_mode, force):
+        return None
+    
+    def sink_factory(name: str) -> RawSink:
+        return RawSink(name, output_dir)
+    
+    checkpoints = open_checkpoints(stand, output_dir, test_mode, resume)
+    stats = fetch_all_endpoints(test_mode=test_mode, concurrency=concurrency, sink_factory=sink_factory,
+                                checkpoints=checkpoints, page_sizes=page_sizes_path(output_dir, test_mode))
+    
+    print("💾 Rohdaten gespeichert:")
+    for name, s in stats.items():
+        print(f"  💾 {name}.json ({s['count']:,} Datensätze)")
+    finish_fetch(stats, output_dir, checkpoints)
+    return {name: s["count"] for name, s in stats.items()}
 
 
 def main():
@@ -178,14 +682,56 @@ def main():
     parser = argparse.ArgumentParser(description="BVL API Fetcher für PSM-Desk-DB")
     parser.add_argument("--test", action="store_true", help="Test-Modus (nur 1 Datensatz pro Endpunkt)")
     parser.add_argument("--output", default=DATA_DIR, help="Output-Verzeichnis")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Parallele Requests (Standard: {DEFAULT_CONCURRENCY} = seriell)")
+    parser.add_argument("--force", action="store_true",
+                        help="Vollständiger Abruf auch bei unverändertem Datenstand")
+    parser.add_argument("--base-url", default=BVL_BASE_URL,
+                        help="Basis-URL der API (Standard: BVL_BASE_URL, z.B. mock_bvl_server.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Abgebrochenen Abruf ab den gespeicherten Seiten fortsetzen (checkpoints/)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Streaming-Modus: Seiten direkt transformieren und nach compressed/ schreiben")
+    parser.add_argument("--dump-raw", action="store_true",
+                        help="Streaming-Modus: zusätzlich raw/*.json schreiben (Debug)")
+    parser.add_argument("--dump-transformed", action="store_true",
+                        help="Streaming-Modus: zusätzlich transformed/*.json schreiben (Debug)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Stufe mit cProfile messen (.pstats + .collapsed in {PROFILE_DIR})")
     args = parser.parse_args()
     
-    # Fetch alle Daten
-    data = fetch_all_endpoints(test_mode=args.test)
+    if args.concurrency < 1:
+        parser.error("--concurrency muss mindestens 1 sein")
+    set_base_url(args.base_url)
+    
+    if args.stream:
+        # Datenstand prüfen - bei unveränderten Daten ist kein Abruf nötig
+        stand = load_current_stand(args.test)
+        if not check_stand_changed(stand, args.output, args.test, args.force):
+            return 0
+        
+        def sink_factory(name: str) -> StreamSink:
+            return StreamSink(name, args.output, args.dump_raw, args.dump_transformed)
+        
+        with profile_stage("fetch", args.profile):
+            checkpoints = open_checkpoints(stand, args.output, args.test, args.resume)
+            stats = fetch_all_endpoints(test_mode=args.test, concurrency=args.concurrency,
+                                        sink_factory=sink_factory, checkpoints=checkpoints,
+                                        page_sizes=page_sizes_path(args.output, args.test), stream=True)
+        finish_fetch(stats, args.output, checkpoints)
+        print_stream_stats(stats)
+        save_build_meta(Path(args.output) / "compressed", {
+            f"{name}.json.gz": {"sha256": s["sha256"], "size": s["compressed_size"], "count": s["count"]}
+            for name, s in stats.items() if isinstance(s, dict)
+        })
+        print("\n✅ Fertig! (weiter mit manifest.py)")
+        return 0
+    
+    with profile_stage("fetch", args.profile):
+        counts = run_fetch(args.output, args.test, args.force, args.concurrency, args.resume)
     
-    # Speichern
-    print("💾 Speichere Rohdaten...")
-    save_raw_data(data, args.output)
+    if counts is None:
+        return 0
     
     print("\n✅ Fertig!")
     return 0
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport
+==============
+Keep-Alive-Verbindungen (eine pro Host und Worker-Thread) mit
+gzip/deflate-Komprimierung und Transfer-Statistik pro Endpunkt
+(Latenz-Histogramm, Status-Codes, Retries).
+"""
+
+import http.client
+import json
+import threading
+import time
+import zlib
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+
+READ_CHUNK = 64 * 1024
+
+# Weiterleitungen, denen get() folgt (wie urllib), und ihre Höchstzahl
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Obergrenzen der Latenz-Buckets in Sekunden (Prometheus-Histogramm, "le")
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class TransferStats:
+    """Latenz und Bytes für einen Endpunkt"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.bytes_wire = 0
+        self.bytes_decoded = 0
+        self.statuses = {}
+        self.retries = 0
+        self.errors = 0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+    
+    def add(self, latency: float, bytes_wire: int, bytes_decoded: int, new_connection: bool, status: int = 200):
+        self.requests += 1
+        self.connections += int(new_connection)
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.bytes_wire += bytes_wire
+        self.bytes_decoded += bytes_decoded
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.latency_buckets[idx] += 1
+                break
+    
+    def merge(self, other: "TransferStats"):
+        """Addiert die Werte eines anderen Endpunkts (für Summenzeilen)"""
+        self.requests += other.requests
+        self.connections += other.connections
+        self.latency_total += other.latency_total
+        self.latency_max = max(self.latency_max, other.latency_max)
+        self.bytes_wire += other.bytes_wire
+        self.bytes_decoded += other.bytes_decoded
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        self.retries += other.retries
+        self.errors += other.errors
+        self.latency_buckets = [a + b for a, b in zip(self.latency_buckets, other.latency_buckets)]
+    
+    @property
+    def pages(self) -> int:
+        """Erfolgreiche Antworten"""
+        return sum(count for status, count in self.statuses.items() if status < 300)
+    
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.requests if self.requests else 0.0
+    
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "latency_avg_ms": round(self.latency_avg * 1000, 1),
+            "latency_max_ms": round(self.latency_max * 1000, 1),
+            "bytes_wire": self.bytes_wire,
+            "bytes_decoded": self.bytes_decoded,
+            "pages": self.pages,
+            "retries": self.retries,
+            "errors": self.errors,
+            "rate_limited": self.statuses.get(429, 0),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency_buckets": dict(zip((str(bound) for bound in LATENCY_BUCKETS), self.latency_buckets)),
+            "latency_sum_s": round(self.latency_total, 4),
+        }
+
+
+def _decoder(encoding: str):
+    """Liefert einen Streaming-Decoder für Content-Encoding (None = unkomprimiert)"""
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # 32 + MAX_WBITS erkennt gzip- und zlib-Header automatisch
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    return None
+
+
+class HttpClient:
+    """
+    Minimaler HTTP/1.1-Client mit persistenten Verbindungen.
+    
+    http.client-Verbindungen sind nicht thread-sicher, daher hält jeder
+    Thread seine eigene Verbindung pro Host.
+    """
+    
+    def __init__(self, timeout: float = 60, headers: dict = None):
+        self.timeout = timeout
+        self.headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        self.headers.update(headers or {})
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {}
+    
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        key = (scheme, netloc)
+        conn = connections.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = connections[key] = conn_class(netloc, timeout=self.timeout)
+        return conn
+    
+    def _drop_connection(self, scheme: str, netloc: str):
+        conn = getattr(self._local, "connections", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+    
+    def close(self):
+        """Schließt die Verbindungen des aktuellen Threads"""
+        for conn in getattr(self._local, "connections", {}).values():
+            conn.close()
+        self._local.connections = {}
+    
+    def _stats(self, label: str) -> TransferStats:
+        stats = self.stats.get(label)
+        if stats is None:
+            stats = self.stats[label] = TransferStats()
+        return stats
+    
+    def _record(self, label: str, latency: float, bytes_wire: int, bytes_decoded: int,
+                new_connection: bool, status: int):
+        with self._lock:
+            self._stats(label).add(latency, bytes_wire, bytes_decoded, new_connection, status)
+    
+    def record_retry(self, url: str, label: str = None):
+        """Zählt eine Wiederholung (Retry-Logik liegt beim Aufrufer)"""
+        with self._lock:
+            self._stats(label or urlsplit(url).path).retries += 1
+    
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {}
+    
+    def get(self, url: str, label: str = None) -> bytes:
+        """
+        GET-Request über die persistente Verbindung.
+        
+        Weiterleitungen (301/302/303/307/308) werden über Location verfolgt,
+        höchstens MAX_REDIRECTS-mal; Statistik zählt unter dem Label der
+        ursprünglichen URL.
+        
+        Raises:
+            HTTPError: Bei Status >= 400, anderen 3xx und zu vielen
+                       Weiterleitungen (wie urllib)
+            URLError: Bei Verbindungsfehlern
+        """
+        label = label or urlsplit(url).path
+        
+        for _ in range(MAX_REDIRECTS + 1):
+            response, body = self._request(url, label)
+            location = response.getheader("Location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 300:
+                raise HTTPError(url, response.status, response.reason, response.headers, None)
+            return body
+        
+        raise HTTPError(url, response.status, f"Mehr als {MAX_REDIRECTS} Weiterleitungen",
+                        response.headers, None)
+    
+    def _request(self, url: str, label: str) -> tuple:
+        """Ein einzelner GET-Request ohne Weiterleitung. Gibt (response, body) zurück."""
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        
+        # Eine wiederverwendete Verbindung kann serverseitig bereits geschlossen
+        # sein - dann einmal mit frischer Verbindung wiederholen (GET ist idempotent)
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            new_connection = conn.sock is None
+            start = time.perf_counter()
+            try:
+                conn.request("GET", target, headers=self.headers)
+                response = conn.getresponse()
+                body, bytes_wire = self._read_body(response)
+            except (http.client.HTTPException, OSError, zlib.error) as e:
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt == 0 and not new_connection:
+                    continue
+                with self._lock:
+                    self._stats(label).errors += 1
+                raise URLError(e) from e
+            latency = time.perf_counter() - start
+            
+            if response.will_close:
+                self._drop_connection(parts.scheme, parts.netloc)
+            
+            self._record(label, latency, bytes_wire, len(body), new_connection, response.status)
+            return response, body
+    
+    @staticmethod
+    def _read_body(response: http.client.HTTPResponse) -> tuple:
+        """Liest und dekodiert den Body beim Streamen. Gibt (body, wire_bytes) zurück."""
+        decoder = _decoder(response.getheader("Content-Encoding"))
+        chunks = []
+        bytes_wire = 0
+        
+        while True:
+            chunk = response.read(READ_CHUNK)
+            if not chunk:
+                break
+            bytes_wire += len(chunk)
+            chunks.append(decoder.decompress(chunk) if decoder else chunk)
+        
+        if decoder:
+            chunks.append(decoder.flush())
+        
+        return b"".join(chunks), bytes_wire
+    
+    def get_json(self, url: str, label: str = None):
+        """GET-Request mit JSON-Antwort"""
+        return json.loads(self.get(url, label).decode("utf-8"))
+    
+    def print_stats(self):
+        """Gibt die Transfer-Statistik pro Endpunkt aus"""
+        with self._lock:
+            items = sorted(self.stats.items())
+        
+        if not items:
+            return
+        
+        print("📶 Transfer pro Endpunkt:")
+        print(f"  {'Endpunkt':28} {'Req':>5} {'Verb.':>5} {'Ø ms':>7} {'max ms':>7} {'Netz KB':>10} {'JSON KB':>10}")
+        print("  " + "-" * 78)
+        
+        total = TransferStats()
+        for label, stats in items:
+            print(f"  {label:28} {stats.requests:>5} {stats.connections:>5} "
+                  f"{stats.latency_avg * 1000:>7.1f} {stats.latency_max * 1000:>7.1f} "
+                  f"{stats.bytes_wire / 1024:>10.1f} {stats.bytes_decoded / 1024:>10.1f}")
+            total.merge(stats)
+        
+        print("  " + "-" * 78)
+        print(f"  {'GESAMT':28} {total.requests:>5} {total.connections:>5} "
+              f"{total.latency_avg * 1000:>7.1f} {total.latency_max * 1000:>7.1f} "
+              f"{total.bytes_wire / 1024:>10.1f} {total.bytes_decoded / 1024:>10.1f}")
+        if total.retries or total.errors:
+            print(f"  🔁 {total.retries} Retries, {total.statuses.get(429, 0)} × 429, {total.errors} Verbindungsfehler")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Index-Generator
+===============
+Erzeugt kompakte Lookup-Dateien für Joins im Client (config.INDEX_DEFINITIONS),
+z.B. kennr → awg_ids oder awg_id → Zeilen-Offsets in awg_kultur.
+
+Zeilen-Offsets beziehen sich auf die Position im veröffentlichten
+<tabelle>.json.gz derselben Manifest-Version.
+"""
+
+import json
+from pathlib import Path
+
+from config import DATA_DIR, INDEX_DEFINITIONS, INDEX_FORMAT_VERSION
+
+
+def _group(rows, key: str, value: str = None) -> dict:
+    """Gruppiert Zeilen-Offsets (oder Werte einer Spalte) nach Schlüssel"""
+    # dict statt list: Werte ohne Duplikate in Reihenfolge des ersten Auftretens
+    index = {}
+    for offset, row in enumerate(rows):
+        k = row.get(key)
+        if k is None or k == "":
+            continue
+        entries = index.setdefault(k, {})
+        entry = offset if value is None else row.get(value)
+        if entry is not None:
+            entries[entry] = None
+    return {k: list(entries) for k, entries in index.items()}
+
+
+def build_index(name: str, definition: dict, data: dict) -> dict:
+    """Baut einen Index nach seiner Definition"""
+    target = _group(data.get(definition["table"], []), definition["key"], definition.get("value"))
+    
+    via = definition.get("via")
+    if via:
+        # Zwischentabelle: via.key → via.join → Zieltabelle
+        joined = {}
+        for k, join_values in _group(data.get(via["table"], []), via["key"], via["join"]).items():
+            offsets = {}
+            for join_value in join_values:
+                offsets.update(dict.fromkeys(target.get(join_value, ())))
+            if offsets:
+                joined[k] = list(offsets)
+        target = joined
+        key = via["key"]
+    else:
+        key = definition["key"]
+    
+    return {
+        "format": "index",
+        "version": INDEX_FORMAT_VERSION,
+        "name": name,
+        "table": definition["table"],
+        "key": key,
+        "values": definition.get("value", "row"),
+        "count": len(target),
+        "index": target,
+    }
+
+
+def build_indexes(data: dict) -> dict:
+    """Baut alle Indizes aus den transformierten Daten"""
+    print("\n🗂️ Erzeuge Index-Dateien...")
+    
+    indexes = {}
+    for name, definition in INDEX_DEFINITIONS.items():
+        indexes[name] = build_index(name, definition, data)
+        print(f"  ✅ {name:25} {indexes[name]['count']:>8,} Schlüssel → {definition['table']}")
+    
+    return indexes
+
+
+def save_indexes(indexes: dict, output_dir: str = DATA_DIR):
+    """Speichert die Indizes als index.<name>.json im transformed/ Verzeichnis"""
+    out_dir = Path(output_dir) / "transformed"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    for name, index in indexes.items():
+        file_path = out_dir / f"index.{name}.json"
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"  💾 index.{name}.json")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+JSON-Streaming
+==============
+Liest JSON-Arrays (raw/*.json, transformed/*.json, *.json.gz)
+elementweise, damit nie eine ganze Tabelle als Text und als Liste zugleich
+im Speicher liegt.
+
+- iter_json_array: liefert die Elemente eines Arrays aus einer Datei
+  einzeln (json.JSONDecoder.raw_decode auf einem gleitenden Puffer)
+- iter_batches: teilt einen Iterator in Listen fester Größe
+"""
+
+import codecs
+import gzip
+import json
+import re
+from itertools import islice
+from pathlib import Path
+
+READ_CHUNK = 1024 * 1024
+# Elemente pro Liste für Transformation und Kodierung
+BATCH_SIZE = 5000
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Zeichen, die in einem Array auf ein Element folgen dürfen
+DELIMITERS = " \t\n\r,]"
+
+
+def iter_chunks(path: Path, size: int = READ_CHUNK):
+    """Liest eine Datei in Bytes-Stücken (*.gz entpackt)"""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for chunk in iter(lambda: f.read(size), b""):
+            yield chunk
+
+
+def iter_json_array(path: Path, chunk_size: int = READ_CHUNK):
+    """
+    Liefert die Elemente eines JSON-Arrays aus einer Datei einzeln.
+    
+    Es liegt nur der aktuelle Lese-Puffer (etwa chunk_size) und das
+    aktuelle Element im Speicher.
+    
+    Raises:
+        ValueError: Kein JSON-Array oder abgeschnittene Datei
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter_chunks(path, chunk_size)
+    buf = ""
+    pos = 0
+    eof = False
+    # "start" → "[" → "first" (Element oder "]") → "next" ("," oder "]") → "value" → ...
+    state = "start"
+    
+    while True:
+        pos = WHITESPACE.match(buf, pos).end()
+        if pos < len(buf):
+            char = buf[pos]
+            if state == "start":
+                if char != "[":
+                    raise ValueError(f"{path}: kein JSON-Array")
+                state = "first"
+                pos += 1
+                continue
+            if char == "]" and state in ("first", "next"):
+                return
+            if state == "next":
+                if char != ",":
+                    raise ValueError(f"{path}: ',' erwartet bei Zeichen {pos}")
+                state = "value"
+                pos += 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # Ein Element am Pufferende kann abgeschnitten sein: "3.2|5e-7"
+            # dekodiert als 3.2, daher muss ein Trennzeichen folgen
+            if end is not None and (eof or (end < len(buf) and buf[end] in DELIMITERS)):
+                yield item
+                pos = end
+                state = "next"
+                continue
+        elif eof:
+            raise ValueError(f"{path}: unerwartetes Dateiende")
+        
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + utf8.decode(chunk)
+        pos = 0
+
+
+def iter_batches(items, size: int = BATCH_SIZE):
+    """Teilt ein Iterable in Listen von höchstens size Elementen"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
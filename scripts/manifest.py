@@ -9,11 +9,29 @@ import gzip
 import hashlib
 import json
 import os
+import shutil
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-from config import DATA_DIR, get_endpoint_count
+from config import (
+    DATA_DIR,
+    DELTA_FORMAT_VERSION,
+    DELTA_STATE_FILE,
+    INDEX_DEFINITIONS,
+    INDEX_FORMAT_VERSION,
+    PROFILE_DIR,
+    SHARD_FORMAT_VERSION,
+    SHARD_KEYS,
+    SHARD_PREFIX_LENGTH,
+    SQLITE_FILENAME,
+    get_endpoint_count
+)
+from buildcache import BuildCache
+from checkpoint import load_incomplete
+from compress import EXTRA_CODECS, load_build_meta
+from delta import build_deltas
+from profiling import profile_stage
 
 
 def sha256_file(file_path: Path) -> str:
@@ -32,18 +50,129 @@ def count_records_in_gz(file_path: Path) -> int:
             data = json.load(f)
             if isinstance(data, list):
                 return len(data)
+            if isinstance(data, dict) and "count" in data:
+                return data["count"]
             return 1
     except Exception:
         return 0
 
 
-def generate_manifest(data_dir: str = DATA_DIR) -> dict:
+# Hilfsdateien mit eigenem Abschnitt im Manifest: Präfix → Abschnitt
+SECTIONS = {
+    "dictionary.": "dictionaries",
+    "index.": "indexes",
+    "delta.": "deltas",
+    "shard.": "shards",
+}
+
+
+def file_meta(path: Path, build_meta: dict) -> dict:
+    """
+    Liefert SHA256 und Anzahl einer komprimierten Datei.
+    
+    compress.py ermittelt beides beim Schreiben (build_meta.json); passen
+    Größe oder mtime nicht zur Datei auf der Platte, wird die Checksumme neu
+    berechnet und "count" weggelassen.
+    """
+    meta = build_meta.get(path.name)
+    stat = path.stat()
+    if meta and meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+        return meta
+    return {"sha256": sha256_file(path)}
+
+
+def split_section(filename: str) -> tuple:
+    """
+    Ordnet Hilfsdateien ihrem Manifest-Abschnitt zu.
+    
+    "dictionary.kennr.json.gz" → ("dictionaries", "kennr")
+    "awg.json.gz"              → (None, None)
+    """
+    for prefix, section in SECTIONS.items():
+        if filename.startswith(prefix):
+            return section, filename[len(prefix):-len(".json.gz")]
+    return None, None
+
+
+def split_variant(filename: str) -> tuple:
+    """
+    Trennt Varianten-Dateien von der Zeilen-Datei einer Tabelle.
+    
+    "auflagen.json.gz"          → ("auflagen.json.gz", None)
+    "auflagen.columnar.json.gz" → ("auflagen.json.gz", "columnar")
+    """
+    stem = filename[:-len(".json.gz")]
+    table, dot, variant = stem.partition(".")
+    if not dot:
+        return filename, None
+    return f"{table}.json.gz", variant
+
+
+def read_stand(file_path: Path) -> dict:
+    """Liest den Datenstand-Eintrag aus stand.json.gz (None falls nicht vorhanden)"""
+    try:
+        with gzip.open(file_path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if isinstance(data, list) and data:
+        return data[0]
+    return None
+
+
+def load_previous_manifest(data_dir: str = DATA_DIR) -> dict:
+    """Zuletzt veröffentlichtes manifest.json (leer, falls nicht vorhanden)"""
+    try:
+        with open(Path(data_dir) / "manifest.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def data_gz_files(compressed_dir: Path) -> list:
+    """GZIP-Dateien in compressed/ ohne den Delta-Zustand (kein Manifest-Eintrag)"""
+    return [path for path in compressed_dir.glob("*.json.gz") if path.name != DELTA_STATE_FILE]
+
+
+def group_shards(entries: dict) -> dict:
+    """
+    Shard-Index pro Tabelle aus den Einträgen "shard.<tabelle>.<nnn>".
+    
+    Returns:
+        {tabelle: {"version", "table", "key", "prefix_length",
+                   "shards": [{"file", "from", "to", "count", "checksum", ...}]}}
+    """
+    tables = {}
+    for name, entry in sorted(entries.items()):
+        table = name.rsplit(".", 1)[0]
+        meta = tables.setdefault(table, {
+            "version": SHARD_FORMAT_VERSION,
+            "table": f"{table}.json.gz",
+            "key": SHARD_KEYS.get(table),
+            "prefix_length": SHARD_PREFIX_LENGTH,
+            "shards": [],
+        })
+        meta["shards"].append(entry)
+    return tables
+
+
+def generate_manifest(data_dir: str = DATA_DIR, cache: BuildCache = None) -> dict:
     """
     Generiert das manifest.json für GitHub Pages.
     
+    Checksumme und Anzahl Datensätze kommen aus compressed/build_meta.json
+    (beim Komprimieren im selben Durchgang ermittelt). Für Dateien ohne
+    Eintrag wird die Anzahl über die Checksumme im Build-Cache gehalten,
+    unveränderte Dateien werden daher nicht erneut entpackt und geparst.
+    
+    Unvollständig geladene Tabellen (raw/fetch_status.json) werden mit
+    "incomplete": true markiert; fehlt ihre Datei (Streaming-Modus), bleibt
+    der Eintrag der Vorversion samt Datei veröffentlicht.
+    
     Returns:
         Manifest-Dictionary
     """
+    cache = cache or BuildCache(enabled=False)
     compressed_dir = Path(data_dir) / "compressed"
     
     if not compressed_dir.exists():
@@ -61,76 +190,298 @@ def generate_manifest(data_dir: str = DATA_DIR) -> dict:
     print("\n📋 Generiere Manifest...")
     print("-" * 60)
     
-    gz_files = sorted(compressed_dir.glob("*.json.gz"))
+    build_meta = load_build_meta(compressed_dir)
+    
+    # Deltas gegenüber der Vorversion (nur Zeilen-Dateien der Tabellen)
+    tables = {
+        path.name[:-len(".json.gz")]: path
+        for path in data_gz_files(compressed_dir)
+        if split_section(path.name)[0] is None and split_variant(path.name)[1] is None
+    }
+    metas = {name: file_meta(path, build_meta) for name, path in tables.items()}
+    checksums = {f"{name}.json.gz": meta["sha256"] for name, meta in metas.items()}
+    row_hashes = {name: meta["rowhashes"] for name, meta in metas.items() if "rowhashes" in meta}
+    delta_from = build_deltas(tables, generated, compressed_dir, data_dir, checksums, row_hashes)
+    
+    gz_files = sorted(data_gz_files(compressed_dir))
+    
+    variants = []
+    sections = {}
+    by_file = {}
+    meta_by_file = {}
     
     for gz_path in gz_files:
         filename = gz_path.name
-        checksum = sha256_file(gz_path)
+        meta = file_meta(gz_path, build_meta)
+        checksum = meta["sha256"]
         size_bytes = gz_path.stat().st_size
         size_kb = round(size_bytes / 1024, 2)
-        count = count_records_in_gz(gz_path)
         
-        files[filename] = {
+        meta_by_file[filename] = meta
+        count = meta.get("count")
+        if count is None:
+            cached = cache.get("manifest", filename, checksum)
+            if cached is not None:
+                count = cached["count"]
+            else:
+                count = count_records_in_gz(gz_path)
+                cache.put("manifest", filename, checksum, {"count": count})
+        
+        entry = {
             "count": count,
             "checksum": f"sha256:{checksum}",
             "size_kb": size_kb
         }
         
+        section, key = split_section(filename)
+        if section:
+            sections.setdefault(section, {})[key] = by_file[filename] = {"file": filename, **entry}
+            continue
+        
+        base, variant = split_variant(filename)
+        if variant:
+            variants.append((base, variant, {"file": filename, **entry}))
+            by_file[filename] = variants[-1][2]
+            continue
+        
+        files[filename] = by_file[filename] = entry
+        
         total_records += count
         total_size += size_bytes
         
         print(f"  {filename:35} {count:>8,} records  {size_kb:>8.2f} KB")
     
+    # Unvollständig geladene Tabellen: Vorversion statt abgeschnittener Daten
+    incomplete = sorted(load_incomplete(data_dir))
+    previous_files = load_previous_manifest(data_dir).get("files", {}) if incomplete else {}
+    for name in incomplete:
+        filename = f"{name}.json.gz"
+        if filename not in files:
+            if filename not in previous_files:
+                print(f"  ❌ {filename}: unvollständig, keine Vorversion vorhanden")
+                continue
+            files[filename] = dict(previous_files[filename])
+            total_records += files[filename]["count"]
+            total_size += round(files[filename]["size_kb"] * 1024)
+            print(f"  {filename:35} {files[filename]['count']:>8,} records  (Vorversion)")
+        files[filename]["incomplete"] = True
+        print(f"  ⏸️ {filename}: unvollständig geladen")
+    
+    # Varianten (z.B. Spaltenformat) neben der Zeilen-Datei eintragen
+    for base, variant, entry in variants:
+        if base not in files:
+            print(f"  ⚠️ {entry['file']}: keine Zeilen-Datei {base} - übersprungen")
+            continue
+        files[base][variant] = entry
+        print(f"  {'└ ' + entry['file']:35} {entry['count']:>8,} records  {entry['size_kb']:>8.2f} KB")
+    
+    # Wörterbücher und Indizes
+    for section, entries in sorted(sections.items()):
+        for key, entry in sorted(entries.items()):
+            if section == "indexes" and key in INDEX_DEFINITIONS:
+                entry["version"] = INDEX_FORMAT_VERSION
+                entry["table"] = f"{INDEX_DEFINITIONS[key]['table']}.json.gz"
+            if section == "deltas" and key in delta_from:
+                entry["version"] = DELTA_FORMAT_VERSION
+                entry["table"] = f"{key}.json.gz"
+                entry["from"] = delta_from[key]
+            if section == "shards":
+                shard = meta_by_file.get(entry["file"], {}).get("shard", {})
+                entry.update({"from": shard.get("from"), "to": shard.get("to")})
+            unit = "rows    " if section in ("deltas", "shards") else "keys    "
+            print(f"  {'⊕ ' + entry['file']:35} {entry['count']:>8,} {unit} {entry['size_kb']:>8.2f} KB")
+    
+    # SQLite-Datenbank (transform.py --sqlite)
+    sqlite_entry = None
+    sqlite_path = compressed_dir / f"{SQLITE_FILENAME}.gz"
+    if sqlite_path.exists():
+        sqlite_entry = {
+            "file": sqlite_path.name,
+            "checksum": f"sha256:{file_meta(sqlite_path, build_meta)['sha256']}",
+            "size_kb": round(sqlite_path.stat().st_size / 1024, 2)
+        }
+        print(f"  {'🗄️ ' + sqlite_path.name:35} {'':>8}          {sqlite_entry['size_kb']:>8.2f} KB")
+        by_file[sqlite_path.name] = sqlite_entry
+    
+    # Zusätzliche Codecs (compress.py --codecs) beim GZIP-Eintrag aufführen
+    for codec, (suffix, _, _) in EXTRA_CODECS.items():
+        for codec_path in sorted(compressed_dir.glob(f"*{suffix}")):
+            gz_name = codec_path.name[:-len(suffix)] + ".gz"
+            entry = by_file.get(gz_name)
+            if entry is None:
+                print(f"  ⚠️ {codec_path.name}: keine GZIP-Datei {gz_name} - übersprungen")
+                continue
+            codec_entry = {
+                "file": codec_path.name,
+                "checksum": f"sha256:{file_meta(codec_path, build_meta)['sha256']}",
+                "size_kb": round(codec_path.stat().st_size / 1024, 2)
+            }
+            entry.setdefault("codecs", {})[codec] = codec_entry
+            print(f"  {'⇄ ' + codec_path.name:35} {codec:>8}          {codec_entry['size_kb']:>8.2f} KB")
+    
     print("-" * 60)
     print(f"  {'GESAMT':35} {total_records:>8,} records  {total_size/1024:>8.2f} KB")
+    cache.print_stats("manifest")
+    
+    stand = read_stand(compressed_dir / "stand.json.gz")
     
     manifest = {
         "version": version,
         "generated": generated,
+        "stand": stand,
         "endpoints": get_endpoint_count(),
         "total_records": total_records,
         "total_size_kb": round(total_size / 1024, 2),
         "files": files
     }
     
+    for section, entries in sorted(sections.items()):
+        if section == "shards":
+            manifest[section] = group_shards(entries)
+            continue
+        manifest[section] = dict(sorted(entries.items()))
+    
+    if sqlite_entry:
+        manifest["sqlite"] = sqlite_entry
+    
+    if incomplete:
+        manifest["incomplete"] = incomplete
+    
     return manifest
 
 
 def save_manifest(manifest: dict, output_dir: str = DATA_DIR):
-    """Speichert manifest.json im data/ Verzeichnis"""
+    """Speichert manifest.json im data/ Verzeichnis (atomar per Umbenennen)"""
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     
     manifest_path = out_dir / "manifest.json"
+    tmp_path = out_dir / ".manifest.json.tmp"
     
-    with open(manifest_path, "w", encoding="utf-8") as f:
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
     
     print(f"\n💾 Manifest gespeichert: {manifest_path}")
 
 
-def copy_compressed_to_data(data_dir: str = DATA_DIR):
-    """Kopiert komprimierte Dateien in data/ für GitHub Pages"""
+def publish_file(src_path: Path, dest_path: Path):
+    """
+    Veröffentlicht eine Datei atomar: Hardlink (bzw. Kopie auf anderem
+    Dateisystem) unter temporärem Namen, dann os.replace. Leser sehen
+    immer entweder die alte oder die neue Datei, nie eine halbe.
+    """
+    tmp_path = dest_path.with_name(f".{dest_path.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(src_path, tmp_path)
+    except OSError:
+        shutil.copyfile(src_path, tmp_path)
+    os.replace(tmp_path, dest_path)
+
+
+def copy_compressed_to_data(data_dir: str = DATA_DIR) -> set:
+    """
+    Veröffentlicht komprimierte Dateien in data/ für GitHub Pages.
+    
+    Returns:
+        Namen der veröffentlichten Dateien
+    """
     compressed_dir = Path(data_dir) / "compressed"
     out_dir = Path(data_dir)
     
-    print("\n📦 Kopiere Dateien für GitHub Pages...")
+    print("\n📦 Veröffentliche Dateien für GitHub Pages...")
     
-    for gz_path in compressed_dir.glob("*.json.gz"):
-        dest_path = out_dir / gz_path.name
-        dest_path.write_bytes(gz_path.read_bytes())
+    gz_files = data_gz_files(compressed_dir)
+    gz_files += compressed_dir.glob(f"{SQLITE_FILENAME}.gz")
+    for suffix, _, _ in EXTRA_CODECS.values():
+        gz_files += compressed_dir.glob(f"*{suffix}")
+    
+    for gz_path in sorted(gz_files):
+        publish_file(gz_path, out_dir / gz_path.name)
         print(f"  📄 {gz_path.name}")
+    
+    return {gz_path.name for gz_path in gz_files}
+
+
+def referenced_files(manifest: dict) -> set:
+    """Alle Dateinamen, auf die das Manifest verweist (inkl. Varianten und Codecs)"""
+    names = set()
+    
+    def collect(entry: dict):
+        for key, value in entry.items():
+            if key == "file":
+                names.add(value)
+            elif isinstance(value, dict):
+                collect(value)
+    
+    for filename, entry in manifest.get("files", {}).items():
+        names.add(filename)
+        collect(entry)
+    collect({key: value for key, value in manifest.items() if key != "files" and isinstance(value, dict)})
+    return names
+
+
+def remove_stale_files(published: set, data_dir: str = DATA_DIR):
+    """
+    Entfernt Deltas, Shards und Codec-Dateien der Vorversion, die nicht neu
+    veröffentlicht wurden (nicht jede Tabelle hat ein neues Delta, die Anzahl
+    der Shards ändert sich, Codecs sind optional). Läuft erst nach dem
+    Manifest, damit das alte Manifest nie auf fehlende Dateien zeigt.
+    """
+    out_dir = Path(data_dir)
+    patterns = ["delta.*.json.gz", "shard.*.json.gz"] + [f"*{suffix}" for suffix, _, _ in EXTRA_CODECS.values()]
+    for pattern in patterns:
+        for stale in out_dir.glob(pattern):
+            if stale.name not in published:
+                stale.unlink()
+                print(f"  🗑️ {stale.name}")
+
+
+def run_manifest(cache: BuildCache, data_dir: str = DATA_DIR) -> dict:
+    """
+    Generiert das Manifest und veröffentlicht Dateien und Manifest in data/.
+    
+    Returns:
+        Manifest-Dictionary (leer ohne komprimierte Dateien)
+    """
+    manifest = generate_manifest(data_dir, cache)
+    
+    if not manifest:
+        return manifest
+    
+    published = copy_compressed_to_data(data_dir)
+    save_manifest(manifest, data_dir)
+    # Zeilen-Hashes erst nach dem Manifest: sie beschreiben dessen Version
+    state_path = Path(data_dir) / "compressed" / DELTA_STATE_FILE
+    if state_path.exists():
+        publish_file(state_path, Path(data_dir) / DELTA_STATE_FILE)
+    # Übernommene Einträge unvollständiger Tabellen verweisen auf alte Dateien
+    remove_stale_files(published | referenced_files(manifest), data_dir)
+    
+    return manifest
 
 
 def main():
     """Hauptfunktion"""
-    manifest = generate_manifest()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Manifest-Generator für PSM-Desk-DB")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Build-Cache nicht verwenden (alle Dateien neu zählen)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Stufe mit cProfile messen (.pstats + .collapsed in {PROFILE_DIR})")
+    args = parser.parse_args()
+    
+    cache = BuildCache(enabled=not args.no_cache)
+    with profile_stage("manifest", args.profile):
+        manifest = run_manifest(cache)
     
     if not manifest:
         return 1
     
-    save_manifest(manifest)
-    copy_compressed_to_data()
+    cache.save()
     
     print(f"\n✅ Manifest generiert!")
     print(f"   Version: {manifest['version']}")
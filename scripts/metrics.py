@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Lauf-Metriken
+=============
+Sammelt strukturierte Metriken eines Pipeline-Laufs (Stufen, Endpunkte,
+Tabellen, Dateien) und schreibt sie als JSON-Bericht und Prometheus-Textfile
+neben manifest.json.
+
+Die Stufen schreiben über das modulweite METRICS; ohne pipeline.py bleibt
+der Sammler einfach ungenutzt.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from config import DATA_DIR, METRICS_FILE, METRICS_PROM_FILE
+from http_client import LATENCY_BUCKETS
+
+PROM_PREFIX = "psm"
+
+
+def peak_rss_bytes() -> int:
+    """Maximaler Speicher (RSS) des Prozesses bisher (0 falls unbekannt)"""
+    if resource is None:
+        return 0
+    # Linux: ru_maxrss in KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RunMetrics:
+    """
+    Metriken eines Laufs.
+    
+    Speicher-Spitzen pro Stufe kommen aus tracemalloc, wenn trace_memory
+    gesetzt ist (kostet beim Parsen ein Vielfaches der Laufzeit), sonst
+    nur der maximale RSS des Prozesses.
+    """
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.started = datetime.now(timezone.utc)
+        self.status = "ok"
+        self.stages = []
+        self.endpoints = {}
+        self.rate_limiter = None
+        self.tables = {}
+        self.files = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Misst Laufzeit und Speicher-Spitze einer Stufe.
+        
+        Yields:
+            Eintrag der Stufe; "bytes" und "records" setzt der Aufrufer
+        """
+        entry = {"stage": name, "seconds": 0.0, "bytes": 0, "records": None}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = time.perf_counter() - start
+            entry["peak_rss_bytes"] = peak_rss_bytes()
+            if self.trace_memory:
+                entry["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+            self.stages.append(entry)
+    
+    def stop(self):
+        """Beendet tracemalloc (falls gestartet)"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    
+    def record_endpoints(self, transfer_stats: dict):
+        """Übernimmt die Transfer-Statistik des HttpClient (Endpunkt → TransferStats)"""
+        for label, stats in transfer_stats.items():
+            self.endpoints[label] = stats.as_dict()
+    
+    def record_rate_limiter(self, state: dict):
+        """Zustand der Ratenbegrenzung nach dem Abruf (AdaptiveRateLimiter.state())"""
+        self.rate_limiter = state
+    
+    def record_table(self, name: str, rows: int, seconds: float, cached: bool = False):
+        """Transformation einer Tabelle"""
+        self.tables[name] = {
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "rows_per_s": round(rows / seconds) if seconds > 0 and not cached else None,
+            "cached": cached,
+        }
+    
+    def record_file(self, name: str, codec: str, original_size: int, compressed_size: int,
+                    seconds: float = None):
+        """Komprimierung einer Datei (seconds None = aus dem Build-Cache)"""
+        self.files[name] = {
+            "codec": codec,
+            "original_bytes": original_size,
+            "compressed_bytes": compressed_size,
+            "ratio": round(compressed_size / original_size, 4) if original_size else None,
+            "seconds": round(seconds, 4) if seconds is not None else None,
+        }
+    
+    def as_dict(self) -> dict:
+        return {
+            "generated": self.started.isoformat(),
+            "status": self.status,
+            "trace_memory": self.trace_memory,
+            "stages": [
+                {key: round(value, 4) if isinstance(value, float) else value for key, value in stage.items()}
+                for stage in self.stages
+            ],
+            "endpoints": dict(sorted(self.endpoints.items())),
+            "rate_limiter": self.rate_limiter,
+            "tables": dict(sorted(self.tables.items())),
+            "files": dict(sorted(self.files.items())),
+        }
+    
+    def to_prometheus(self) -> str:
+        """Textformat für den node_exporter textfile collector"""
+        lines = []
+        
+        def metric(name: str, kind: str, help_text: str, samples: list):
+            if not samples:
+                return
+            lines.append(f"# HELP {PROM_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{PROM_PREFIX}_{name}{suffix}{label_text} {_number(value)}")
+        
+        metric("run_timestamp_seconds", "gauge", "Start des Laufs (Unix-Zeit)",
+               [("", {"status": self.status}, self.started.timestamp())])
+        
+        metric("stage_duration_seconds", "gauge", "Laufzeit pro Stufe",
+               [("", {"stage": s["stage"]}, s["seconds"]) for s in self.stages])
+        metric("stage_bytes", "gauge", "Verarbeitete Bytes pro Stufe",
+               [("", {"stage": s["stage"]}, s["bytes"]) for s in self.stages])
+        metric("stage_records", "gauge", "Verarbeitete Datensätze pro Stufe",
+               [("", {"stage": s["stage"]}, s["records"]) for s in self.stages if s["records"] is not None])
+        metric("stage_peak_rss_bytes", "gauge", "Maximaler RSS des Prozesses nach der Stufe",
+               [("", {"stage": s["stage"]}, s["peak_rss_bytes"]) for s in self.stages])
+        metric("stage_peak_traced_bytes", "gauge", "Speicher-Spitze der Stufe (tracemalloc)",
+               [("", {"stage": s["stage"]}, s["peak_traced_bytes"]) for s in self.stages
+                if "peak_traced_bytes" in s])
+        
+        endpoints = sorted(self.endpoints.items())
+        for name, key, help_text in (
+            ("fetch_requests_total", "requests", "HTTP-Requests pro Endpunkt"),
+            ("fetch_pages_total", "pages", "Erfolgreich geladene Seiten pro Endpunkt"),
+            ("fetch_retries_total", "retries", "Wiederholte Requests pro Endpunkt"),
+            ("fetch_rate_limited_total", "rate_limited", "Antworten mit Status 429 pro Endpunkt"),
+            ("fetch_errors_total", "errors", "Verbindungsfehler pro Endpunkt"),
+            ("fetch_bytes_wire_total", "bytes_wire", "Übertragene Bytes (komprimiert) pro Endpunkt"),
+            ("fetch_bytes_decoded_total", "bytes_decoded", "Dekodierte JSON-Bytes pro Endpunkt"),
+        ):
+            metric(name, "counter", help_text, [("", {"endpoint": label}, e[key]) for label, e in endpoints])
+        
+        metric("fetch_responses_total", "counter", "HTTP-Antworten pro Endpunkt und Status",
+               [("", {"endpoint": label, "code": code}, count)
+                for label, e in endpoints for code, count in e["statuses"].items()])
+        
+        histogram = []
+        for label, e in endpoints:
+            cumulative = 0
+            for bound in LATENCY_BUCKETS:
+                cumulative += e["latency_buckets"][str(bound)]
+                histogram.append(("_bucket", {"endpoint": label, "le": str(bound)}, cumulative))
+            histogram.append(("_bucket", {"endpoint": label, "le": "+Inf"}, e["requests"]))
+            histogram.append(("_sum", {"endpoint": label}, e["latency_sum_s"]))
+            histogram.append(("_count", {"endpoint": label}, e["requests"]))
+        metric("fetch_latency_seconds", "histogram", "Latenz der Requests pro Endpunkt", histogram)
+        
+        limiter = self.rate_limiter
+        if limiter:
+            metric("fetch_rate_limit_requests_per_second", "gauge", "Rate der Ratenbegrenzung am Ende des Abrufs",
+                   [("", {}, limiter["rate"])])
+            metric("fetch_rate_limit_concurrency", "gauge", "Parallelität der Ratenbegrenzung am Ende des Abrufs",
+                   [("", {}, limiter["concurrency"])])
+            metric("fetch_rate_limit_decreases_total", "counter", "Absenkungen von Rate und Parallelität",
+                   [("", {}, limiter["decreases"])])
+            metric("fetch_rate_limit_wait_seconds_total", "counter", "Wartezeit der Threads in der Ratenbegrenzung",
+                   [("", {}, limiter["waited_s"])])
+        
+        tables = sorted(self.tables.items())
+        metric("transform_rows", "gauge", "Datensätze pro Tabelle",
+               [("", {"table": name}, t["rows"]) for name, t in tables])
+        metric("transform_rows_per_second", "gauge", "Transformierte Datensätze pro Sekunde",
+               [("", {"table": name}, t["rows_per_s"]) for name, t in tables if t["rows_per_s"] is not None])
+        
+        files = sorted(self.files.items())
+        metric("compress_original_bytes", "gauge", "Unkomprimierte Größe pro Datei",
+               [("", {"file": name, "codec": f["codec"]}, f["original_bytes"]) for name, f in files])
+        metric("compress_compressed_bytes", "gauge", "Komprimierte Größe pro Datei",
+               [("", {"file": name, "codec": f["codec"]}, f["compressed_bytes"]) for name, f in files])
+        metric("compress_ratio", "gauge", "Komprimiert / unkomprimiert pro Datei",
+               [("", {"file": name, "codec": f["codec"]}, f["ratio"]) for name, f in files
+                if f["ratio"] is not None])
+        metric("compress_duration_seconds", "gauge", "CPU-Zeit der Komprimierung pro Datei",
+               [("", {"file": name, "codec": f["codec"]}, f["seconds"]) for name, f in files
+                if f["seconds"] is not None])
+        
+        return "\n".join(lines) + "\n"
+    
+    def save(self, output_dir: str = DATA_DIR) -> tuple:
+        """
+        Schreibt metrics.json und metrics.prom (atomar per Umbenennen,
+        der textfile collector liest nie eine halbe Datei).
+        
+        Returns:
+            (Pfad JSON-Bericht, Pfad Prometheus-Datei)
+        """
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        json_path = out_dir / METRICS_FILE
+        prom_path = out_dir / METRICS_PROM_FILE
+        
+        for path, content in ((json_path, json.dumps(self.as_dict(), ensure_ascii=False, indent=2)),
+                              (prom_path, self.to_prometheus())):
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+        
+        print(f"\n📈 Metriken gespeichert: {json_path}, {prom_path}")
+        return json_path, prom_path
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(int(value))
+
+
+# Sammler des laufenden Prozesses
+METRICS = RunMetrics()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Lokaler BVL-API-Server
+======================
+Stellvertreter der BVL API für Benchmarks und Fehlertests von fetch_bvl.py.
+
+Bedient jeden Pfad aus config.ENDPOINTS mit der ORDS-Pagination
+(?limit=&offset=) und der "items"-Hülle (hasMore, limit, offset, count,
+links). Die Daten kommen aus synthetic.py.
+
+Einstellbar sind Latenz, maximale Seitengröße, zufällige 429-/5xx-Antworten
+mit Retry-After und eine Grenze gleichzeitiger Requests (darüber 429).
+GET /_stats liefert die Zähler des Servers als JSON.
+
+Beispiel:
+    python mock_bvl_server.py --port 8765 --latency 50 --rate-429 0.02
+    BVL_BASE_URL=http://127.0.0.1:8765/ords/psm/api-v1 python fetch_bvl.py --force
+"""
+
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from config import ENDPOINTS
+from synthetic import generate_dataset
+
+# Pfad-Präfix wie bei der echten API (https://psm-api.bvl.bund.de/ords/psm/api-v1)
+API_PREFIX = "/ords/psm/api-v1"
+# ORDS-Standard ohne ?limit=
+ORDS_DEFAULT_LIMIT = 25
+
+
+class MockBvlApi:
+    """
+    Daten, Fehler-Einstellungen und Zähler des Servers.
+    
+    Args:
+        scale, seed: Umfang der synthetischen Daten (synthetic.py)
+        latency_ms, jitter_ms: Antwortzeit pro Request (gleichverteilt ± jitter)
+        max_limit: Höchstens so viele Datensätze pro Seite (None = unbegrenzt)
+        rate_429, rate_5xx: Anteil der Requests mit 429 bzw. 503
+        retry_after: Retry-After-Header (Sekunden) bei 429/503, None = keiner
+        max_concurrent: Mehr gleichzeitige Requests werden mit 429 abgelehnt
+    """
+    
+    def __init__(self, scale: float = 1.0, seed: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 max_limit: int = None, rate_429: float = 0.0, rate_5xx: float = 0.0,
+                 retry_after: float = None, max_concurrent: int = None):
+        data = generate_dataset(scale, seed)
+        self.rows = {cfg["path"]: data[name] for name, cfg in ENDPOINTS.items()}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.max_limit = max_limit
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.max_concurrent = max_concurrent
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.statuses = {}
+        self.rows_served = 0
+    
+    @property
+    def records(self) -> int:
+        return sum(len(rows) for rows in self.rows.values())
+    
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+                "rows_served": self.rows_served,
+                "max_in_flight": self.max_in_flight,
+            }
+    
+    def count_response(self, status: int, rows: int = 0):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.rows_served += rows
+    
+    def enter(self) -> int:
+        """
+        Beginnt einen Request.
+        
+        Returns:
+            Fehler-Status für diesen Request (429/503) oder None
+        """
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.max_concurrent and self.in_flight > self.max_concurrent:
+                return 429
+            roll = self.random.random()
+        if roll < self.rate_429:
+            return 429
+        if roll < self.rate_429 + self.rate_5xx:
+            return 503
+        return None
+    
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+    
+    def delay(self):
+        """Simulierte Antwortzeit"""
+        if self.latency_ms or self.jitter_ms:
+            with self.lock:
+                jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+    
+    def page(self, path: str, limit: int, offset: int, url: str) -> dict:
+        """ORDS-Antwort für eine Seite (None bei unbekanntem Pfad)"""
+        rows = self.rows.get(path)
+        if rows is None:
+            return None
+        if self.max_limit:
+            limit = min(limit, self.max_limit)
+        items = rows[offset:offset + limit]
+        has_more = offset + len(items) < len(rows)
+        links = [{"rel": "self", "href": url}]
+        if has_more:
+            links.append({"rel": "next", "href": f"{url.split('?')[0]}?limit={limit}&offset={offset + len(items)}"})
+        return {"items": items, "hasMore": has_more, "limit": limit, "offset": offset,
+                "count": len(items), "links": links}
+
+
+def make_handler(api: MockBvlApi):
+    """Request-Handler für einen MockBvlApi"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def log_message(self, format, *args):
+            pass
+        
+        def _send(self, status: int, payload=None, headers: dict = None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            if body and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=1)
+                self.send_header("Content-Encoding", "gzip")
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/_stats":
+                self._send(200, api.stats())
+                return
+            
+            error = api.enter()
+            try:
+                api.delay()
+                if error:
+                    headers = {"Retry-After": f"{api.retry_after:g}"} if api.retry_after is not None else {}
+                    api.count_response(error)
+                    self._send(error, {"code": error, "message": "Injected"}, headers)
+                    return
+                
+                path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+                query = parse_qs(url.query)
+                try:
+                    limit = int(query.get("limit", [ORDS_DEFAULT_LIMIT])[0])
+                    offset = int(query.get("offset", [0])[0])
+                except ValueError:
+                    api.count_response(400)
+                    self._send(400, {"code": 400, "message": "Invalid limit/offset"})
+                    return
+                
+                page = api.page(path, max(0, limit), max(0, offset), self.path)
+                if page is None:
+                    api.count_response(404)
+                    self._send(404, {"code": 404, "message": "Not Found"})
+                    return
+                api.count_response(200, page["count"])
+                self._send(200, page)
+            finally:
+                api.leave()
+    
+    return Handler
+
+
+def create_server(api: MockBvlApi, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """HTTP-Server (port 0 = freier Port, siehe server.server_address)"""
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    server.daemon_threads = True
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """Basis-URL für fetch_bvl.py (BVL_BASE_URL bzw. --base-url)"""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{API_PREFIX}"
+
+
+def serve(options: dict, ready=None, host: str = "127.0.0.1", port: int = 0):
+    """
+    Startet den Server und blockiert (für multiprocessing.Process).
+    
+    Args:
+        options: Argumente für MockBvlApi
+        ready: Optional Queue, bekommt die Basis-URL, sobald der Server läuft
+    """
+    server = create_server(MockBvlApi(**options), host, port)
+    if ready is not None:
+        ready.put(base_url(server))
+    server.serve_forever()
+
+
+def main():
+    """Hauptfunktion"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Lokaler BVL-API-Server mit synthetischen Daten")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse (Standard: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (Standard: 8765, 0 = frei)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor der synthetischen Daten")
+    parser.add_argument("--seed", type=int, default=0, help="Seed für Daten und Fehler")
+    parser.add_argument("--latency", type=float, default=0, help="Antwortzeit pro Request in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Zufällige Abweichung der Antwortzeit in ms")
+    parser.add_argument("--max-limit", type=int, help="Maximale Seitengröße (kleinere Seiten als angefragt)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Anteil der Requests mit 429 (0-1)")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Anteil der Requests mit 503 (0-1)")
+    parser.add_argument("--retry-after", type=float, help="Retry-After-Header bei 429/503 (Sekunden)")
+    parser.add_argument("--max-concurrent", type=int, help="Mehr gleichzeitige Requests bekommen 429")
+    args = parser.parse_args()
+    
+    if not 0 <= args.rate_429 + args.rate_5xx <= 1:
+        parser.error("--rate-429 und --rate-5xx müssen zusammen zwischen 0 und 1 liegen")
+    
+    api = MockBvlApi(args.scale, args.seed, args.latency, args.jitter, args.max_limit,
+                     args.rate_429, args.rate_5xx, args.retry_after, args.max_concurrent)
+    server = create_server(api, args.host, args.port)
+    
+    print(f"🧪 Mock-BVL-API: {api.records:,} Datensätze ({len(api.rows)} Endpunkte)")
+    print(f"   BVL_BASE_URL={base_url(server)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = api.stats()
+        print(f"\n📊 {stats['requests']:,} Requests, Status {stats['statuses']}, "
+              f"{stats['rows_served']:,} Datensätze, max. {stats['max_in_flight']} gleichzeitig")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
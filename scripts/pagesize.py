@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Adaptive Seitengrößen
+=====================
+fetch_bvl.py lernt pro Endpunkt eine Seitengröße (?limit=) aus Antwortzeit
+und Datenmenge der vollen Seiten:
+
+- Zeit und Bytes pro Datensatz werden geglättet (gleitender Mittelwert)
+- Ziel ist die größte Seite unter PAGE_TARGET_SECONDS und PAGE_TARGET_BYTES,
+  begrenzt auf PAGE_LIMIT_MIN..PAGE_LIMIT_MAX und die Grenze des Servers
+  (ORDS meldet das tatsächlich verwendete "limit" in der Antwort)
+- pro Seite wächst die Größe höchstens auf das Doppelte, verkleinert wird
+  sofort; eine an Timeout oder 5xx gescheiterte Seite halbiert sie
+
+Gelernte Größen und die Anzahl Datensätze des letzten vollständigen Abrufs
+stehen in <data>/PAGE_SIZES_FILE. Mit der bekannten Anzahl plant
+iter_pages die Offset-Fenster vorab, statt erst eine einzelne Seite zu
+laden.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from config import (
+    DEFAULT_LIMIT,
+    PAGE_LIMIT_MAX,
+    PAGE_LIMIT_MIN,
+    PAGE_LIMIT_STEP,
+    PAGE_TARGET_BYTES,
+    PAGE_TARGET_SECONDS,
+)
+
+STATE_VERSION = 1
+# Gewicht einer neuen Messung im gleitenden Mittelwert
+SMOOTHING = 0.5
+
+
+def _round_limit(limit: float, upper: int) -> int:
+    """Auf PAGE_LIMIT_STEP abrunden und in die Grenzen legen"""
+    limit = int(limit) // PAGE_LIMIT_STEP * PAGE_LIMIT_STEP
+    return max(PAGE_LIMIT_MIN, min(upper, limit))
+
+
+class PageSizer:
+    """
+    Seitengrößen pro Endpunkt-Pfad.
+    
+    Thread-sicher; ein Exemplar wird von allen Abruf-Threads geteilt.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self, state_path: Path = None):
+        """
+        Startwerte für einen neuen Abruf.
+        
+        Args:
+            state_path: Zustands-Datei früherer Abrufe (None = ohne, es wird
+                        mit DEFAULT_LIMIT begonnen und nichts gespeichert)
+        """
+        with self._lock:
+            self.state_path = Path(state_path) if state_path else None
+            self.endpoints = {}
+            self.initial = {}
+            if self.state_path is None:
+                return
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                return
+            if state.get("version") == STATE_VERSION:
+                self.endpoints = state.get("endpoints", {})
+                self.initial = {path: entry.get("limit") for path, entry in self.endpoints.items()}
+    
+    def _entry(self, path: str) -> dict:
+        entry = self.endpoints.get(path)
+        if entry is None:
+            entry = self.endpoints[path] = {"limit": DEFAULT_LIMIT}
+        return entry
+    
+    def _upper(self, entry: dict) -> int:
+        return min(PAGE_LIMIT_MAX, entry.get("server_limit") or PAGE_LIMIT_MAX)
+    
+    def limit(self, path: str) -> int:
+        """Aktuelle Seitengröße für einen Endpunkt"""
+        with self._lock:
+            entry = self.endpoints.get(path)
+            return entry["limit"] if entry else DEFAULT_LIMIT
+    
+    def expected_count(self, path: str) -> int:
+        """Datensätze beim letzten vollständigen Abruf (None = unbekannt)"""
+        with self._lock:
+            return self.endpoints.get(path, {}).get("count")
+    
+    def observe(self, path: str, limit: int, rows: int, seconds: float, size: int, server_limit: int = None):
+        """
+        Wertet eine Antwort aus.
+        
+        Args:
+            limit: Angefragte Seitengröße
+            rows, seconds, size: Datensätze, Antwortzeit und JSON-Bytes
+            server_limit: Von der API gemeldetes limit (kleiner = Obergrenze)
+        """
+        with self._lock:
+            entry = self._entry(path)
+            if server_limit and server_limit < limit:
+                entry["server_limit"] = server_limit
+                entry["limit"] = min(entry["limit"], server_limit)
+            # Nur volle Seiten: beim Rest überwiegt die feste Antwortzeit
+            if rows < limit:
+                return
+            for key, value in (("seconds_per_row", seconds / rows), ("bytes_per_row", size / rows)):
+                old = entry.get(key)
+                entry[key] = value if old is None else old + SMOOTHING * (value - old)
+            target = min(PAGE_TARGET_SECONDS / max(entry["seconds_per_row"], 1e-9),
+                         PAGE_TARGET_BYTES / max(entry["bytes_per_row"], 1e-9))
+            entry["limit"] = _round_limit(min(target, 2 * entry["limit"]), self._upper(entry))
+    
+    def on_failure(self, path: str):
+        """Seite an Timeout oder 5xx gescheitert: Seitengröße halbieren"""
+        with self._lock:
+            entry = self._entry(path)
+            entry["limit"] = _round_limit(entry["limit"] / 2, self._upper(entry))
+    
+    def set_count(self, path: str, count: int):
+        """Anzahl Datensätze nach einem vollständigen Abruf"""
+        with self._lock:
+            self._entry(path)["count"] = count
+    
+    def save(self):
+        """Schreibt die Zustands-Datei (atomar; ohne state_path nichts)"""
+        if self.state_path is None:
+            return
+        with self._lock:
+            endpoints = {
+                path: {key: round(value, 9) if isinstance(value, float) else value
+                       for key, value in sorted(entry.items())}
+                for path, entry in sorted(self.endpoints.items())
+            }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "endpoints": endpoints}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+    
+    def print_state(self):
+        """Gibt geänderte Seitengrößen nach einem Abruf aus"""
+        with self._lock:
+            changed = [(path, self.initial.get(path) or DEFAULT_LIMIT, entry["limit"])
+                       for path, entry in sorted(self.endpoints.items())
+                       if entry["limit"] != (self.initial.get(path) or DEFAULT_LIMIT)]
+        if not changed:
+            return
+        print("📏 Seitengrößen:")
+        for path, old, new in changed:
+            print(f"  {path:28} {old:>6,} → {new:>6,}")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Pipeline
+========
+Führt fetch_bvl.py, transform.py, compress.py und manifest.py in einem
+Prozess aus.
+
+Bewusst werden keine Tabellen im Speicher von Stufe zu Stufe gereicht: Das
+hielte den ganzen Datenstand gleichzeitig im Speicher (bei 3× Datenstand
+mit allen Zusatzformaten über 900 MB). Die Stufen geben ihre Daten über die
+Zwischendateien (raw/, transformed/, compressed/) weiter und lesen sie
+tabellenweise bzw. elementweise. Im Speicher weitergereicht werden nur
+kleine Ergebnisse (Anzahl Datensätze, Statistiken, Build-Cache, Metriken).
+Mit --from/--to lässt sich jede Stufe einzeln wiederholen.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from config import (
+    BVL_BASE_URL,
+    COMPRESS_CODECS,
+    COMPRESS_WORKERS,
+    DATA_DIR,
+    DEFAULT_CONCURRENCY,
+    PROFILE_DIR,
+)
+from buildcache import BuildCache
+from compress import EXTRA_CODECS, compress_all
+from fetch_bvl import HTTP, LIMITER, run_fetch, set_base_url
+from manifest import run_manifest
+from metrics import METRICS
+from profiling import profile_stage
+from transform import run_transform
+
+STAGES = ["fetch", "transform", "compress", "manifest"]
+
+
+def _file_bytes(directory: Path, pattern: str) -> int:
+    """Summe der Dateigrößen in einem Verzeichnis"""
+    return sum(path.stat().st_size for path in directory.glob(pattern))
+
+
+def print_stage_report(stages: list, records: int = None):
+    """
+    Gibt Laufzeit und Durchsatz pro Stufe aus.
+    
+    Stufen ohne eigene Datensatz-Anzahl werden mit der Anzahl der Pipeline
+    gerechnet (jede Stufe verarbeitet dieselben Datensätze). "Peak MB" ist
+    die tracemalloc-Spitze der Stufe (--trace-memory), sonst der maximale
+    RSS des Prozesses.
+    """
+    print(f"\n⏱️ Pipeline-Stufen:")
+    print(f"  {'Stufe':12} {'Zeit':>9} {'MB':>9} {'MB/s':>8} {'Datensätze/s':>14} {'Peak MB':>9}")
+    print("  " + "-" * 66)
+    
+    total_seconds = 0.0
+    for stage in stages:
+        seconds = stage["seconds"]
+        total_seconds += seconds
+        mb = stage["bytes"] / (1024 * 1024)
+        count = stage["records"] if stage["records"] is not None else records
+        mb_rate = f"{mb / seconds:8.1f}" if seconds > 0 else f"{'-':>8}"
+        rec_rate = f"{count / seconds:14,.0f}" if count and seconds > 0 else f"{'-':>14}"
+        peak = stage.get("peak_traced_bytes", stage.get("peak_rss_bytes", 0)) / (1024 * 1024)
+        print(f"  {stage['stage']:12} {seconds:8.2f}s {mb:9.1f} {mb_rate} {rec_rate} {peak:9.1f}")
+    
+    print("  " + "-" * 66)
+    print(f"  {'GESAMT':12} {total_seconds:8.2f}s")
+
+
+def run_pipeline(first: str = STAGES[0], last: str = STAGES[-1], data_dir: str = DATA_DIR,
+                 cache: BuildCache = None, test_mode: bool = False, force: bool = False,
+                 concurrency: int = DEFAULT_CONCURRENCY, resume: bool = False, columnar: bool = False,
+                 dict_encode: bool = False, indexes: bool = False, sqlite: bool = False,
+                 workers: int = COMPRESS_WORKERS, codecs: list = None, codec_tables: list = None,
+                 shards: bool = False, trace_memory: bool = False, profile: bool = False) -> dict:
+    """
+    Führt die Stufen first bis last nacheinander aus.
+    
+    Args:
+        first, last: Erste und letzte Stufe (aus STAGES)
+        trace_memory: Speicher-Spitze pro Stufe mit tracemalloc messen (langsam)
+        profile: Jede Stufe mit cProfile messen (profiling.py)
+        Übrige Argumente wie bei fetch_bvl.py, transform.py und compress.py
+    
+    Metriken (Stufen, Endpunkte, Tabellen, Dateien) werden nach dem Lauf als
+    metrics.json und metrics.prom neben manifest.json gespeichert.
+    
+    Returns:
+        {"status": "ok" | "unchanged" | "failed", "failed": Stufe oder None,
+         "records": Anzahl Datensätze, "stages": [{"stage", "seconds", "bytes", "records", ...}]}
+    """
+    cache = cache or BuildCache(enabled=False)
+    METRICS.reset(trace_memory)
+    data_path = Path(data_dir)
+    selected = STAGES[STAGES.index(first):STAGES.index(last) + 1]
+    
+    result = {"status": "ok", "failed": None, "records": None, "stages": METRICS.stages}
+    
+    for stage in selected:
+        with METRICS.stage(stage) as entry, profile_stage(stage, profile):
+            if stage == "fetch":
+                counts = run_fetch(data_dir, test_mode, force, concurrency, resume)
+                METRICS.record_endpoints(HTTP.stats)
+                METRICS.record_rate_limiter(LIMITER.state())
+                if counts is None:
+                    result["status"] = "unchanged"
+                    break
+                entry["records"] = sum(counts.values())
+                if not entry["records"]:
+                    print("❌ Keine Datensätze von der BVL API geladen!")
+                    result.update(status="failed", failed=stage)
+                    break
+                entry["bytes"] = _file_bytes(data_path / "raw", "*.json")
+            
+            elif stage == "transform":
+                entry["bytes"] = _file_bytes(data_path / "raw", "*.json")
+                transformed = run_transform(cache, columnar, dict_encode, indexes, sqlite, data_dir=data_dir)
+                if transformed is None:
+                    print("❌ Keine Rohdaten gefunden! Bitte erst die Stufe fetch ausführen.")
+                    result.update(status="failed", failed=stage)
+                    break
+                entry["records"] = sum(table["rows"] for table in METRICS.tables.values())
+            
+            elif stage == "compress":
+                stats = compress_all(data_dir, data_dir, cache, workers, codecs, codec_tables, shards)
+                if not stats:
+                    result.update(status="failed", failed=stage)
+                    break
+                entry["bytes"] = int(stats["_total"]["original_kb"] * 1024)
+            
+            elif stage == "manifest":
+                manifest = run_manifest(cache, data_dir)
+                if not manifest:
+                    result.update(status="failed", failed=stage)
+                    break
+                entry["records"] = manifest["total_records"]
+                entry["bytes"] = int(manifest["total_size_kb"] * 1024)
+            
+            cache.save()
+        
+        if entry["records"] is not None:
+            result["records"] = entry["records"]
+    
+    METRICS.status = result["status"]
+    METRICS.stop()
+    if result["stages"]:
+        print_stage_report(result["stages"], result["records"])
+    if result["status"] != "unchanged":
+        # Bei unverändertem Datenstand bleibt data/ unverändert (kein Commit)
+        METRICS.save(data_dir)
+    
+    return result
+
+
+def main():
+    """Hauptfunktion"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Komplette Pipeline (Abruf bis Manifest) für PSM-Desk-DB")
+    parser.add_argument("--from", dest="first", choices=STAGES, default=STAGES[0],
+                        help="Erste Stufe (Standard: fetch)")
+    parser.add_argument("--to", dest="last", choices=STAGES, default=STAGES[-1],
+                        help="Letzte Stufe (Standard: manifest)")
+    parser.add_argument("--output", default=DATA_DIR, help="Daten-Verzeichnis")
+    parser.add_argument("--no-cache", action="store_true", help="Build-Cache nicht verwenden")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Speicher-Spitze pro Stufe mit tracemalloc messen (deutlich langsamer)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Jede Stufe mit cProfile messen (.pstats + .collapsed in {PROFILE_DIR})")
+    # fetch
+    parser.add_argument("--test", action="store_true", help="Test-Modus (nur 1 Datensatz pro Endpunkt)")
+    parser.add_argument("--force", action="store_true",
+                        help="Vollständiger Abruf auch bei unverändertem Datenstand")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Parallele Requests (Standard: {DEFAULT_CONCURRENCY} = seriell)")
+    parser.add_argument("--base-url", default=BVL_BASE_URL,
+                        help="Basis-URL der API (Standard: BVL_BASE_URL, z.B. mock_bvl_server.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Abgebrochenen Abruf ab den gespeicherten Seiten fortsetzen (checkpoints/)")
+    # transform
+    parser.add_argument("--columnar", action="store_true", help="Große Tabellen zusätzlich im Spaltenformat")
+    parser.add_argument("--dict-encode", action="store_true", help="Zusätzlich dictionary-kodierte Tabellen")
+    parser.add_argument("--indexes", action="store_true", help="Index-Dateien für Joins im Client")
+    parser.add_argument("--sqlite", action="store_true", help="Zusätzlich SQLite-Datenbank")
+    # compress
+    parser.add_argument("--workers", type=int, default=COMPRESS_WORKERS,
+                        help=f"Parallele Komprimierungs-Prozesse (Standard: {COMPRESS_WORKERS}, 0 = alle Kerne)")
+    parser.add_argument("--codecs", default=",".join(COMPRESS_CODECS),
+                        help=f"Zusätzliche Codecs, kommagetrennt ({', '.join(EXTRA_CODECS)})")
+    parser.add_argument("--codec-tables",
+                        help="Zusätzliche Codecs nur für diese Tabellen (kommagetrennt, Standard: alle)")
+    parser.add_argument("--shards", action="store_true",
+                        help="Große Tabellen zusätzlich nach Schlüssel-Präfix teilen (config.SHARD_KEYS)")
+    args = parser.parse_args()
+    
+    if STAGES.index(args.first) > STAGES.index(args.last):
+        parser.error(f"--from {args.first} liegt nach --to {args.last}")
+    if args.concurrency < 1:
+        parser.error("--concurrency muss mindestens 1 sein")
+    codecs = [codec.strip() for codec in args.codecs.split(",") if codec.strip()]
+    unknown = [codec for codec in codecs if codec not in EXTRA_CODECS]
+    if unknown:
+        parser.error(f"Unbekannte Codecs: {', '.join(unknown)}")
+    codec_tables = [t.strip() for t in args.codec_tables.split(",")] if args.codec_tables else None
+    set_base_url(args.base_url)
+    
+    result = run_pipeline(
+        args.first, args.last, args.output,
+        cache=BuildCache(enabled=not args.no_cache),
+        test_mode=args.test, force=args.force, concurrency=args.concurrency, resume=args.resume,
+        columnar=args.columnar, dict_encode=args.dict_encode, indexes=args.indexes, sqlite=args.sqlite,
+        workers=args.workers or os.cpu_count() or 1, codecs=codecs, codec_tables=codec_tables,
+        shards=args.shards,
+        trace_memory=args.trace_memory, profile=args.profile,
+    )
+    
+    if result["status"] == "failed":
+        print(f"\n❌ Pipeline in Stufe '{result['failed']}' abgebrochen")
+        return 1
+    
+    print("\n✅ Pipeline abgeschlossen!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
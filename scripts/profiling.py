@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Profiling
+=========
+Opt-in cProfile pro Stufe (--profile). Pro Stufe entstehen
+<stufe>.pstats (für pstats/snakeviz) und <stufe>.collapsed im
+"collapsed stack"-Format (flamegraph.pl, speedscope, inferno).
+
+Ohne --profile liefert profile_stage() einen leeren Kontext - in den
+Stufen selbst gibt es keine zusätzlichen Aufrufe.
+
+cProfile misst nur den Haupt-Thread: Komprimierungs-Prozesse
+(compress.py --workers) und GZIP-Block-Threads erscheinen als Wartezeit.
+Für ein vollständiges Bild mit --workers 1 profilieren. Ebenso zeigt
+profile_stage("fetch") nur den Haupt-Thread, der auf die Seiten aus dem
+Thread-Pool wartet; die Requests selbst sieht cProfile dort nicht.
+"""
+
+import cProfile
+import os
+import pstats
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from config import PROFILE_DIR
+
+# Maximale Stack-Tiefe im collapsed-Format (Schutz bei Rekursion)
+MAX_STACK_DEPTH = 64
+# Teilbäume unter diesem Anteil der Gesamtzeit werden nicht aufgefächert
+# (die Zahl der Pfade wächst sonst mit jeder gemeinsam genutzten Funktion)
+MIN_STACK_FRACTION = 0.0005
+# Summe der collapsed-Zeiten darf total_tt höchstens so weit übersteigen
+# (Rundung auf Mikrosekunden)
+COLLAPSED_TOLERANCE = 1.01
+
+
+def _frame_label(func: tuple) -> str:
+    """(Datei, Zeile, Funktion) → "funktion (datei.py:zeile)" """
+    filename, line, name = func
+    if filename == "~":  # Built-ins
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ":")
+
+
+def collapse_stats(stats: pstats.Stats) -> dict:
+    """
+    Wandelt cProfile-Statistiken in "collapsed stacks" um.
+    
+    cProfile speichert nur Aufrufer-Kanten, keine vollständigen Stacks. Die
+    Stacks werden daher von den Wurzeln aus über die Kanten rekonstruiert.
+    Hat eine Funktion mehrere Aufrufer, wird ihre Zeit anteilig verteilt:
+    jeder Pfad erhält den Anteil an der Gesamtzeit (cumtime) der Funktion,
+    den seine Aufrufer-Kante beisteuert, und gibt ihn an die Kanten darunter
+    weiter. Die Summe bleibt so bei total_tt; die Aufteilung auf die Pfade
+    ist eine Näherung (cProfile kennt nicht, welcher Aufruf von b aus a1
+    oder a2 zu welchem Aufruf von c geführt hat). Rekursion und Pfade unter
+    MIN_STACK_FRACTION der Gesamtzeit werden weggelassen.
+    
+    Returns:
+        "a;b;c" → Eigenzeit in Mikrosekunden
+    """
+    children = defaultdict(dict)
+    cumtimes = {}
+    roots = []
+    for func, (_, _, tottime, cumtime, callers) in stats.stats.items():
+        cumtimes[func] = cumtime
+        if not callers:
+            roots.append((func, tottime, cumtime))
+        for caller, (_, _, edge_tottime, edge_cumtime) in callers.items():
+            children[caller][func] = (edge_tottime, edge_cumtime)
+    
+    min_time = stats.total_tt * MIN_STACK_FRACTION
+    stacks = defaultdict(int)
+    
+    def walk(func: tuple, path: list, tottime: float, share: float, on_path: set):
+        """share: Anteil dieses Pfads an der Gesamtzeit von func"""
+        path = path + [_frame_label(func)]
+        micros = int(round(tottime * 1_000_000))
+        if micros > 0:
+            stacks[";".join(path)] += micros
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        on_path = on_path | {func}
+        for child, (edge_tottime, edge_cumtime) in children.get(func, {}).items():
+            path_cumtime = edge_cumtime * share
+            if child in on_path or path_cumtime < min_time:
+                continue
+            child_cumtime = cumtimes.get(child) or 0
+            child_share = path_cumtime / child_cumtime if child_cumtime > 0 else 0.0
+            walk(child, path, edge_tottime * share, min(1.0, child_share), on_path)
+    
+    for func, tottime, cumtime in roots:
+        if cumtime >= min_time:
+            walk(func, [], tottime, 1.0, set())
+    
+    return stacks
+
+
+def save_profile(profiler: cProfile.Profile, name: str, output_dir: str = PROFILE_DIR) -> tuple:
+    """
+    Schreibt <name>.pstats und <name>.collapsed.
+    
+    Returns:
+        (Pfad .pstats, Pfad .collapsed)
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pstats_path = out_dir / f"{name}.pstats"
+    collapsed_path = out_dir / f"{name}.collapsed"
+    
+    profiler.dump_stats(pstats_path)
+    stats = pstats.Stats(profiler)
+    
+    stacks = collapse_stats(stats)
+    with open(collapsed_path, "w", encoding="utf-8") as f:
+        for stack, micros in sorted(stacks.items()):
+            f.write(f"{stack} {micros}\n")
+    
+    print(f"\n🔬 Profil '{name}': {pstats_path}, {collapsed_path}")
+    # Plausibilität: die Stacks dürfen nicht mehr Zeit ergeben als gemessen
+    collapsed_s = sum(stacks.values()) / 1_000_000
+    coverage = collapsed_s / stats.total_tt if stats.total_tt else 1.0
+    marker = "⚠️" if coverage > COLLAPSED_TOLERANCE else "  "
+    print(f"{marker} collapsed {collapsed_s:.3f}s von {stats.total_tt:.3f}s gemessen ({coverage:.1%})")
+    top = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:5]
+    for func, (_, calls, tottime, cumtime, _) in top:
+        print(f"  {tottime:8.3f}s eigen {cumtime:8.3f}s gesamt {calls:>10,}×  {_frame_label(func)}")
+    
+    return pstats_path, collapsed_path
+
+
+@contextmanager
+def _profiled(name: str, output_dir: str):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        save_profile(profiler, name, output_dir)
+
+
+def profile_stage(name: str, enabled: bool = False, output_dir: str = PROFILE_DIR):
+    """
+    Kontext für eine Stufe: mit enabled unter cProfile, sonst ohne Wirkung.
+    
+    Beispiel:
+        with profile_stage("transform", args.profile):
+            run_transform(...)
+    """
+    if not enabled:
+        return nullcontext()
+    return _profiled(name, output_dir)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Adaptive Ratenbegrenzung
+========================
+Token-Bucket für alle Requests an die BVL API, dessen Rate und Parallelität
+sich nach den Antworten richten (AIMD wie bei der TCP-Staukontrolle):
+
+- bis zur ersten Drosselung wächst die Rate um 1 Request/s pro Antwort
+  (verdoppelt sich also etwa pro Sekunde, "slow start")
+- danach erhöhen erfolgreiche Antworten die Rate additiv (etwa
+  RATE_LIMIT_INCREASE Requests/s pro Sekunde) und die Parallelität um 1 pro
+  voller Runde
+- 429, 5xx und Latenzen über RATE_LIMIT_LATENCY_TARGET senken beide
+  multiplikativ (höchstens einmal pro Abkühlzeit, damit ein Schwall
+  paralleler Fehler die Rate nicht auf das Minimum drückt)
+- Retry-After hält alle Requests bis zum angegebenen Zeitpunkt an
+
+Wiederholungen warten zufällig zwischen 0 und einer exponentiell wachsenden
+Obergrenze ("full jitter"), damit parallele Threads nicht gleichzeitig
+wiederkommen.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import (
+    BACKOFF_MAX,
+    RATE_LIMIT_DECREASE,
+    RATE_LIMIT_INCREASE,
+    RATE_LIMIT_INITIAL,
+    RATE_LIMIT_LATENCY_TARGET,
+    RATE_LIMIT_MAX,
+    RATE_LIMIT_MIN,
+    RETRY_AFTER_MAX,
+    RETRY_DELAY,
+)
+
+# Mindestabstand zwischen zwei Absenkungen (Sekunden)
+DECREASE_COOLDOWN = 1.0
+
+
+def parse_retry_after(value: str) -> float:
+    """
+    Retry-After-Header → Sekunden (Zahl oder HTTP-Datum).
+    
+    Returns:
+        Wartezeit in Sekunden (höchstens RETRY_AFTER_MAX) oder None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(0.0, seconds), RETRY_AFTER_MAX)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-Bucket mit adaptiver Rate (Requests/s) und Parallelität.
+    
+    Thread-sicher; ein Exemplar wird von allen Abruf-Threads geteilt.
+    """
+    
+    def __init__(self, rate: float = RATE_LIMIT_INITIAL, concurrency: int = 1,
+                 min_rate: float = RATE_LIMIT_MIN, max_rate: float = RATE_LIMIT_MAX,
+                 increase: float = RATE_LIMIT_INCREASE, decrease: float = RATE_LIMIT_DECREASE,
+                 latency_target: float = RATE_LIMIT_LATENCY_TARGET):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self._cond = threading.Condition()
+        self._random = random.Random()
+        self.reset(rate, concurrency)
+    
+    def reset(self, rate: float = RATE_LIMIT_INITIAL, concurrency: int = 1):
+        """
+        Startwerte für einen neuen Abruf.
+        
+        Args:
+            concurrency: Obergrenze der Parallelität (--concurrency); gestartet
+                         wird mit diesem Wert, abgesenkt bis 1
+        """
+        with self._cond:
+            self.rate = min(max(rate, self.min_rate), self.max_rate)
+            self.max_concurrency = max(1, concurrency)
+            self.concurrency = self.max_concurrency
+            self.tokens = 1.0
+            self.in_flight = 0
+            self.paused_until = 0.0
+            self._last_refill = time.monotonic()
+            self._last_decrease = float("-inf")
+            self._round_successes = 0
+            self.slow_start_limit = self.max_rate
+            self.min_rate_seen = self.rate
+            self.max_rate_seen = self.rate
+            self.min_concurrency_seen = self.concurrency
+            self.successes = 0
+            self.throttled = 0
+            self.slow = 0
+            self.errors = 0
+            self.decreases = 0
+            self.retry_after_pauses = 0
+            self.waited_s = 0.0
+    
+    def _refill(self, now: float):
+        burst = max(1.0, float(self.concurrency))
+        self.tokens = min(burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+    
+    def acquire(self):
+        """Wartet auf einen Token und einen freien Platz (Parallelität)"""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self.in_flight >= self.concurrency:
+                    self._cond.wait()
+                    continue
+                if now < self.paused_until:
+                    self._cond.wait(self.paused_until - now)
+                    continue
+                if self.tokens < 1:
+                    self._cond.wait((1 - self.tokens) / self.rate)
+                    continue
+                self.tokens -= 1
+                self.in_flight += 1
+                self.waited_s += now - start
+                return
+    
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+    
+    @contextmanager
+    def slot(self):
+        """Kontext für einen Request: acquire() ... release()"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def on_success(self, latency: float):
+        """Erfolgreiche Antwort: additive Erhöhung (bzw. Absenkung bei hoher Latenz)"""
+        with self._cond:
+            self.successes += 1
+            if latency > self.latency_target:
+                self.slow += 1
+                self._decrease()
+                return
+            if self.rate < self.slow_start_limit:
+                self.rate = min(self.slow_start_limit, self.rate + 1)
+            else:
+                # +increase Requests/s pro Sekunde bei voller Rate
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            self.max_rate_seen = max(self.max_rate_seen, self.rate)
+            self._round_successes += 1
+            if self._round_successes >= self.concurrency and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._round_successes = 0
+                self._cond.notify_all()
+    
+    def on_throttle(self, status: int, retry_after: float = None):
+        """429/5xx: multiplikative Absenkung, bei Retry-After Pause für alle"""
+        with self._cond:
+            self.throttled += 1
+            self._decrease()
+            if retry_after:
+                self.retry_after_pauses += 1
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+    
+    def on_error(self):
+        """Verbindungsfehler: wie eine Drosselung ohne Retry-After"""
+        with self._cond:
+            self.errors += 1
+            self._decrease()
+    
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.slow_start_limit = self.rate
+        self.concurrency = max(1, int(self.concurrency * self.decrease))
+        self._round_successes = 0
+        self.tokens = min(self.tokens, 1.0)
+        self.min_rate_seen = min(self.min_rate_seen, self.rate)
+        self.min_concurrency_seen = min(self.min_concurrency_seen, self.concurrency)
+    
+    def backoff(self, attempt: int) -> float:
+        """Wartezeit vor Wiederholung Nr. attempt+1: zufällig in [0, RETRY_DELAY·2^attempt]"""
+        with self._cond:
+            return self._random.uniform(0, min(BACKOFF_MAX, RETRY_DELAY * 2 ** attempt))
+    
+    def state(self) -> dict:
+        with self._cond:
+            return {
+                "rate": round(self.rate, 2),
+                "rate_min": round(self.min_rate_seen, 2),
+                "rate_max": round(self.max_rate_seen, 2),
+                "concurrency": self.concurrency,
+                "concurrency_min": self.min_concurrency_seen,
+                "concurrency_max": self.max_concurrency,
+                "successes": self.successes,
+                "throttled": self.throttled,
+                "slow": self.slow,
+                "errors": self.errors,
+                "decreases": self.decreases,
+                "retry_after_pauses": self.retry_after_pauses,
+                "waited_s": round(self.waited_s, 2),
+            }
+    
+    def print_state(self):
+        """Gibt den Zustand nach einem Abruf aus"""
+        s = self.state()
+        print("🚦 Ratenbegrenzung:")
+        print(f"  Rate {s['rate']:.1f} Req/s (min {s['rate_min']:.1f}, max {s['rate_max']:.1f}), "
+              f"Parallelität {s['concurrency']} (min {s['concurrency_min']}, max {s['concurrency_max']})")
+        print(f"  {s['throttled']} × gedrosselt (429/5xx), {s['slow']} × langsam, {s['errors']} Fehler, "
+              f"{s['decreases']} Absenkungen, {s['retry_after_pauses']} × Retry-After, "
+              f"{s['waited_s']:.1f}s gewartet")
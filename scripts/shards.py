@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Shards
+======
+Teilt große Tabellen nach einem Schlüssel-Präfix in mehrere Dateien, damit
+ein Client nur die Teile lädt, die er für ein Mittel braucht
+(config.SHARD_KEYS, compress.py --shards).
+
+Die Zeilen werden nach den ersten SHARD_PREFIX_LENGTH Zeichen ihres
+Schlüssels gruppiert; benachbarte Präfixe (sortiert) werden zu Shards
+zusammengefasst. Der Plan wird einmal über alle Tabellen aus SHARD_KEYS
+gemeinsam berechnet (awg nach kennr, awg_* nach awg_id, das mit der kennr
+beginnt) und auf jede Tabelle angewendet: shard.awg.003 und
+shard.awg_kultur.003 decken denselben Präfix-Bereich ab, ein Client lädt für
+ein Mittel also in jeder Tabelle den Shard mit derselben Nummer. Innerhalb
+eines Shards bleibt die Reihenfolge der Tabelle erhalten.
+
+Ausgabe: shard.<tabelle>.<nnn>.json, Bereich und Anzahl gibt write_shards
+für build_meta.json bzw. manifest.json zurück.
+"""
+
+from bisect import bisect_left
+from pathlib import Path
+
+from config import SHARD_KEYS, SHARD_MIN_RECORDS, SHARD_PREFIX_LENGTH, SHARD_TARGET_ROWS
+from compress import JsonArrayWriter
+from jsonstream import iter_batches, iter_json_array
+
+
+def key_prefix(row: dict, key: str, length: int = SHARD_PREFIX_LENGTH) -> str:
+    """Präfix des Schlüssels einer Zeile ("" ohne Schlüssel)"""
+    value = row.get(key)
+    return "" if value is None else str(value)[:length]
+
+
+def plan_shards(counts: dict, target: int = SHARD_TARGET_ROWS) -> list:
+    """
+    Fasst sortierte Präfixe zu Shards zusammen.
+    
+    Args:
+        counts: Präfix → Anzahl Zeilen
+    
+    Returns:
+        [(erstes Präfix, letztes Präfix, Anzahl), ...]
+    """
+    shards = []
+    first = None
+    rows = 0
+    for prefix in sorted(counts):
+        if first is None:
+            first = prefix
+        rows += counts[prefix]
+        if rows >= target:
+            shards.append((first, prefix, rows))
+            first = None
+            rows = 0
+    if first is not None:
+        if shards and rows < target / 2:
+            # Kleinen Rest an den letzten Shard anhängen
+            start, _, count = shards.pop()
+            shards.append((start, prefix, count + rows))
+        else:
+            shards.append((first, prefix, rows))
+    return shards
+
+
+def count_prefixes(json_path: Path, key: str) -> dict:
+    """Präfix → Anzahl Zeilen einer transformierten Tabelle"""
+    counts = {}
+    for row in iter_json_array(json_path):
+        prefix = key_prefix(row, key)
+        counts[prefix] = counts.get(prefix, 0) + 1
+    return counts
+
+
+def write_table_shards(json_path: Path, out_dir: Path, key: str, plan: list) -> dict:
+    """
+    Teilt eine transformierte Tabelle nach einem gemeinsamen Plan in Shards
+    (es liegt nur eine Seite im Speicher). Jeder Bereich des Plans bekommt
+    eine Datei, auch wenn die Tabelle dort keine Zeilen hat.
+    
+    Args:
+        plan: [(erstes Präfix, letztes Präfix, Anzahl), ...] aus plan_shards;
+              muss alle Präfixe der Tabelle abdecken
+    
+    Returns:
+        {dateiname.json.gz: {"table", "key", "from", "to"}}
+    """
+    table = json_path.stem
+    writers = []
+    meta = {}
+    for number, (first, last, _) in enumerate(plan):
+        filename = f"shard.{table}.{number:03d}.json"
+        writers.append(JsonArrayWriter(out_dir / filename, compress=False))
+        meta[f"{filename}.gz"] = {"table": table, "key": key, "from": first, "to": last}
+    
+    lasts = [last for _, last, _ in plan]
+    shard_of = {}
+    for batch in iter_batches(iter_json_array(json_path)):
+        pages = {}
+        for row in batch:
+            prefix = key_prefix(row, key)
+            number = shard_of.get(prefix)
+            if number is None:
+                number = shard_of[prefix] = bisect_left(lasts, prefix)
+            pages.setdefault(number, []).append(row)
+        for number, rows in pages.items():
+            writers[number].write(rows)
+    for writer in writers:
+        writer.close()
+    
+    return meta
+
+
+def write_shards(transformed_dir: Path, out_dir: Path, shard_keys: dict = SHARD_KEYS,
+                 min_records: int = SHARD_MIN_RECORDS) -> dict:
+    """
+    Schreibt die Shards aller Tabellen aus config.SHARD_KEYS nach einem
+    gemeinsamen Präfix-Plan (Zählung über alle Tabellen, im Mittel etwa
+    SHARD_TARGET_ROWS Zeilen pro Tabelle und Shard). Geteilt wird nur, wenn
+    die größte Tabelle mindestens min_records Zeilen hat.
+    
+    Returns:
+        {dateiname.json.gz: Bereich} für alle Shards
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print("\n🧩 Teile große Tabellen in Shards...")
+    
+    counts = {}
+    for table, key in shard_keys.items():
+        json_path = Path(transformed_dir) / f"{table}.json"
+        if json_path.exists():
+            counts[table] = count_prefixes(json_path, key)
+    if not counts or max(sum(c.values()) for c in counts.values()) < min_records:
+        return {}
+    
+    combined = {}
+    for table_counts in counts.values():
+        for prefix, count in table_counts.items():
+            combined[prefix] = combined.get(prefix, 0) + count
+    plan = plan_shards(combined, SHARD_TARGET_ROWS * len(counts))
+    
+    meta = {}
+    for table in counts:
+        key = shard_keys[table]
+        meta.update(write_table_shards(Path(transformed_dir) / f"{table}.json", out_dir, key, plan))
+        print(f"  ✅ {table:25} {len(plan):>4} Shards nach {key}[:{SHARD_PREFIX_LENGTH}]")
+    return meta
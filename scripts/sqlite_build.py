@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+SQLite-Builder
+==============
+Baut aus den transformierten Daten eine SQLite-Datenbank (psm.sqlite) mit
+einer Tabelle pro Endpunkt, Indizes auf kennr/awg_id/wirknr und einer
+FTS5-Volltextsuche über Mittel, Wirkstoffe, Kulturen und Schadorganismen.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+from config import (
+    DATA_DIR,
+    FIELD_MAPPINGS,
+    PRIMARY_KEYS,
+    SQLITE_FILENAME,
+    SQLITE_INDEX_COLUMNS,
+    SQLITE_FTS_SOURCES,
+)
+
+# Typ aus config.FIELD_MAPPINGS → SQLite-Spaltentyp (ohne Typ: keine Affinität)
+SQL_TYPES = {"str": "TEXT", "int": "INTEGER", "float": "REAL", "bool": "INTEGER"}
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _columns(name: str, rows: list) -> list:
+    """Spalten (Name, SQL-Typ) einer Tabelle"""
+    if name in FIELD_MAPPINGS:
+        return [(field[0], SQL_TYPES.get(field[2], "")) for field in FIELD_MAPPINGS[name]]
+    return [(column, "") for column in (rows[0] if rows else [])]
+
+
+def _create_table(conn: sqlite3.Connection, name: str, columns: list):
+    column_sql = ", ".join(f"{_quote(column)} {sql_type}".strip() for column, sql_type in columns)
+    conn.execute(f"CREATE TABLE {_quote(name)} ({column_sql})")
+
+
+def _create_indexes(conn: sqlite3.Connection, name: str, columns: list) -> list:
+    """Legt UNIQUE-Index (natürlicher Schlüssel) und Fremdschlüssel-Indizes an"""
+    created = []
+    column_names = {column for column, _ in columns}
+    
+    key = PRIMARY_KEYS.get(name)
+    if key and set(key) <= column_names:
+        index_name = f"pk_{name}"
+        key_sql = ", ".join(_quote(column) for column in key)
+        duplicate = conn.execute(
+            f"SELECT 1 FROM {_quote(name)} GROUP BY {key_sql} HAVING COUNT(*) > 1 LIMIT 1"
+        ).fetchone()
+        if duplicate:
+            # Doppelte Schlüssel in den Quelldaten - Index ohne UNIQUE anlegen
+            print(f"    ⚠️ {name}: Schlüssel ({', '.join(key)}) nicht eindeutig")
+        unique = "" if duplicate else "UNIQUE "
+        conn.execute(f"CREATE {unique}INDEX {_quote(index_name)} ON {_quote(name)} ({key_sql})")
+        created.append(index_name)
+    
+    for column in SQLITE_INDEX_COLUMNS:
+        if column in column_names and (not key or key[0] != column):
+            index_name = f"idx_{name}_{column}"
+            conn.execute(f"CREATE INDEX {_quote(index_name)} ON {_quote(name)} ({_quote(column)})")
+            created.append(index_name)
+    
+    return created
+
+
+def _create_fts(conn: sqlite3.Connection, data: dict) -> int:
+    """Füllt die Volltextsuche; gibt die Anzahl Einträge zurück (-1 ohne FTS5)"""
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE search USING fts5("
+            "kind UNINDEXED, key UNINDEXED, name, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    except sqlite3.OperationalError as e:
+        print(f"    ⚠️ FTS5 nicht verfügbar ({e}) - Volltextsuche übersprungen")
+        return -1
+    
+    total = 0
+    for table, kind, key_column, text_columns in SQLITE_FTS_SOURCES:
+        entries = [
+            (kind, row.get(key_column), row[column])
+            for row in data.get(table, [])
+            for column in text_columns
+            if row.get(column)
+        ]
+        conn.executemany("INSERT INTO search (kind, key, name) VALUES (?, ?, ?)", entries)
+        total += len(entries)
+    return total
+
+
+def build_sqlite(data: dict, output_dir: str = DATA_DIR) -> dict:
+    """
+    Baut psm.sqlite im transformed/ Verzeichnis.
+    
+    Alle Inserts laufen in einer Transaktion; Indizes werden erst nach dem
+    Laden angelegt, danach ANALYZE und VACUUM.
+    
+    Returns:
+        Statistik (Pfad, Tabellen, Zeilen, Indizes, FTS-Einträge, Größe)
+    """
+    out_dir = Path(output_dir) / "transformed"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    db_path = out_dir / SQLITE_FILENAME
+    if db_path.exists():
+        db_path.unlink()
+    
+    print(f"\n🗄️ Erzeuge {SQLITE_FILENAME}...")
+    start = time.time()
+    
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA page_size = 4096")
+    
+    stats = {"path": str(db_path), "tables": 0, "rows": 0, "indexes": 0, "fts_entries": 0}
+    
+    try:
+        conn.execute("BEGIN")
+        for name, rows in data.items():
+            columns = _columns(name, rows)
+            if not columns:
+                continue
+            _create_table(conn, name, columns)
+            placeholders = ", ".join("?" for _ in columns)
+            keys = [column for column, _ in columns]
+            conn.executemany(
+                f"INSERT INTO {_quote(name)} VALUES ({placeholders})",
+                ([row.get(key) for key in keys] for row in rows),
+            )
+            stats["indexes"] += len(_create_indexes(conn, name, columns))
+            stats["tables"] += 1
+            stats["rows"] += len(rows)
+            print(f"  ✅ {name:25} {len(rows):>8,} Zeilen")
+        stats["fts_entries"] = _create_fts(conn, data)
+        conn.execute("COMMIT")
+        
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    
+    stats["size_bytes"] = db_path.stat().st_size
+    print(f"  📊 {stats['tables']} Tabellen, {stats['rows']:,} Zeilen, {stats['indexes']} Indizes, "
+          f"{stats['fts_entries']:,} FTS-Einträge")
+    print(f"  💾 {SQLITE_FILENAME} ({stats['size_bytes']/1024:.1f} KB) in {time.time() - start:.1f}s")
+    
+    return stats
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Synthetische BVL-Daten
+======================
+Erzeugt Rohdaten für alle Endpunkte aus config.ENDPOINTS mit den echten
+Feldnamen der BVL-API (Großbuchstaben wie in config.FIELD_MAPPINGS).
+
+Zeilenzahlen und Kardinalitäten orientieren sich am aktuellen Datenstand
+(~440.000 Datensätze bei Faktor 1) und skalieren linear. Die Schlüssel sind
+konsistent: KENNR, AWG_ID, KULTUR, SCHADORG, WIRKNR und AESSION in den
+Verknüpfungstabellen verweisen auf vorhandene Stammdaten, die natürlichen
+Schlüssel aus config.PRIMARY_KEYS sind eindeutig.
+
+Die Daten sind deterministisch (gleicher Faktor und Seed → gleiche Bytes).
+"""
+
+import random
+import sys
+import zlib
+from pathlib import Path
+
+from config import DATA_DIR, ENDPOINTS
+from compress import JsonArrayWriter
+from jsonstream import iter_batches
+
+# Datensätze pro Endpunkt bei Faktor 1 (ungefähr der aktuelle Datenstand)
+BASE_ROWS = {
+    "kode": 5_200,
+    "kodeliste": 160,
+    "kultur_gruppe": 2_600,
+    "schadorg_gruppe": 3_400,
+    "ghs_gefahrenhinweise": 120,
+    "ghs_sicherheitshinweise": 260,
+    "ghs_gefahrensymbole": 9,
+    "hinweis": 8_000,
+    "stand": 1,
+    "wirkstoff": 1_300,
+    "adresse": 2_400,
+    "auflagen": 150_000,
+    "mittel": 3_000,
+    "mittel_abgelaufen": 6_200,
+    "staerkung": 900,
+    "zusatzstoff": 700,
+    "wirkstoff_gehalt": 4_700,
+    "mittel_vertrieb": 9_000,
+    "mittel_gefahren_symbol": 9_600,
+    "awg": 20_000,
+    "awg_zulassung": 20_000,
+    "awg_kultur": 36_000,
+    "awg_schadorg": 48_000,
+    "awg_aufwand": 66_000,
+    "awg_wartezeit": 40_000,
+}
+
+# Feste Kataloge, die nicht mit dem Faktor wachsen
+FIXED_TABLES = {"stand", "ghs_gefahrensymbole", "kodeliste"}
+
+WORDS = [
+    "Winterweizen", "Wintergerste", "Sommergerste", "Roggen", "Triticale", "Hafer", "Mais",
+    "Winterraps", "Zuckerrübe", "Kartoffel", "Apfel", "Birne", "Kirsche", "Pflaume", "Weinrebe",
+    "Hopfen", "Erdbeere", "Salat", "Kohl", "Zwiebel", "Möhre", "Tomate", "Gurke", "Spargel",
+    "Zierpflanzen", "Rasen", "Forst", "Gräser", "Unkräuter", "zweikeimblättrige", "einjährige",
+    "Blattläuse", "Echter", "Mehltau", "Falscher", "Schorf", "Rost", "Septoria", "Fusarium",
+    "Kartoffelkäfer", "Rapsglanzkäfer", "Schnecken", "Wühlmäuse", "Freiland", "Gewächshaus",
+    "Anwendung", "Behandlung", "Spritzen", "Gießen", "Beizen", "vor", "nach", "dem", "Auflaufen",
+    "Befallsbeginn", "bei", "Sicht", "Warndienst", "Abstand", "zu", "Gewässern", "m", "und",
+]
+SIGNAL_WORDS = ["Achtung", "Gefahr", None]
+UNITS = ["l/ha", "kg/ha", "g/ha", "ml/ha", "%", "ml/10 l", "g/10 l", "kg/t", "l/t", "Stück/ha"]
+FORMULATIONS = ["EC", "SC", "WG", "WP", "SL", "SE", "EW", "OD", "CS", "GR", "FS", "ME", "DC", "RB"]
+RANGES = ["F", "H", "I", "A", "M", "N", "R", "W", "B", "L", "S", "V"]
+STATUS = ["zugelassen", "abgelaufen", "ruhend", "widerrufen"]
+COUNTRIES = ["DE", "DE", "DE", "NL", "FR", "BE", "CH", "AT", "GB", "US"]
+
+
+def _rng(name: str, seed: int) -> random.Random:
+    return random.Random(seed * 1_000_003 + zlib.crc32(name.encode("utf-8")))
+
+
+def _text(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+def _date(rng: random.Random, first_year: int = 1995, last_year: int = 2035) -> str:
+    return f"{rng.randint(first_year, last_year)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _code(index: int, length: int = 5) -> str:
+    """Eindeutiger Buchstaben-Code (wie EPPO-Codes, z.B. TRZAW)"""
+    letters = []
+    for _ in range(length):
+        index, rest = divmod(index, 26)
+        letters.append(chr(65 + rest))
+    return "".join(reversed(letters))
+
+
+def kennr(index: int) -> str:
+    """Kennnummer im BVL-Format 024023-00"""
+    return f"{index % 1_000_000:06d}-{index // 1_000_000:02d}"
+
+
+class Pools:
+    """Schlüssel der Stammdaten, auf die die Verknüpfungstabellen verweisen"""
+    
+    def __init__(self, rows: dict):
+        self.rows = rows
+        self.mittel = [kennr(i) for i in range(rows["mittel"])]
+        self.awg_per_mittel = max(1, -(-rows["awg"] // max(1, rows["mittel"])))
+        self.awg = [
+            f"{self.mittel[i // self.awg_per_mittel]}/00-{i % self.awg_per_mittel + 1:03d}"
+            for i in range(rows["awg"])
+        ]
+        self.kultur = [_code(i) for i in range(rows["kultur_gruppe"])]
+        self.schadorg = [_code(i + 26 ** 4) for i in range(rows["schadorg_gruppe"])]
+        self.wirkstoff = [f"{i:04d}" for i in range(rows["wirkstoff"])]
+        self.adresse = [str(i + 1) for i in range(rows["adresse"])]
+        self.kodeliste = [f"{i:03d}" for i in range(rows["kodeliste"])]
+        self.h_nr = [f"H{200 + i}" for i in range(rows["ghs_gefahrenhinweise"])]
+        self.p_nr = [f"P{100 + i}" for i in range(rows["ghs_sicherheitshinweise"])]
+        self.symbol = [f"GHS{i + 1:02d}" for i in range(rows["ghs_gefahrensymbole"])]
+        self.auflagen = [f"N{_code(i, 2)}{i % 1000:03d}" for i in range(max(1, rows["auflagen"] // 80))]
+
+
+def _spread(index: int, count: int, parents: int) -> int:
+    """Verteilt count Zeilen gleichmäßig auf parents Elternzeilen"""
+    return index * parents // count
+
+
+def _pick_distinct(pool: list, parent: int, index: int) -> str:
+    """Pro Elternzeile verschiedene Werte (Zusammengesetzte Schlüssel bleiben eindeutig)"""
+    return pool[(parent * 7919 + index) % len(pool)]
+
+
+def _iter_table(name: str, count: int, pools: Pools, rng: random.Random):
+    """Liefert die Datensätze eines Endpunkts einzeln"""
+    p = pools
+    
+    if name == "mittel":
+        for i in range(count):
+            yield {
+                "KENNR": p.mittel[i], "MITTELNAME": f"{_text(rng, 1, 2).split()[0].upper()} {i}",
+                "FORMULIERUNG_ART": rng.choice(FORMULATIONS), "ZUL_ERSTMALIG_AM": _date(rng, 1995, 2025),
+                "ZUL_ENDE": _date(rng, 2025, 2040), "WIRKUNGSBEREICH": rng.choice(RANGES),
+                "KENNR_ZUL": p.mittel[i][:6],
+            }
+    elif name in ("mittel_abgelaufen", "staerkung", "zusatzstoff"):
+        # Eigene Kennnummer-Bereiche (Suffix -10, -20, -30), keine Überschneidung mit mittel
+        offset = {"mittel_abgelaufen": 10, "staerkung": 20, "zusatzstoff": 30}[name] * 1_000_000
+        for i in range(count):
+            row = {"KENNR": kennr(offset + i),
+                   "MITTELNAME": f"{_text(rng, 1, 2).split()[0].upper()} {name[0].upper()}{i}",
+                   "FORMULIERUNG_ART": rng.choice(FORMULATIONS)}
+            if name == "mittel_abgelaufen":
+                row.update({"ZUL_ERSTMALIG_AM": _date(rng, 1980, 2015), "ZUL_ENDE": _date(rng, 2000, 2025),
+                            "AUFBRAUCHFRIST": _date(rng, 2000, 2026), "STATUS": rng.choice(STATUS)})
+            else:
+                row.update({"ANTRAGSTELLER": rng.choice(p.adresse), "LISTUNG_VON": _date(rng, 2000, 2024),
+                            "LISTUNG_BIS": _date(rng, 2024, 2035)})
+            yield row
+    elif name == "wirkstoff":
+        for i in range(count):
+            yield {"WIRKNR": p.wirkstoff[i], "WIRKSTOFFNAME": f"{_text(rng, 1, 1)}-{i}",
+                   "WIRKSTOFFNAME_EN": f"substance-{i}", "CAS_NR": f"{rng.randint(50, 999999)}-{rng.randint(10, 99)}-{i % 10}",
+                   "KATEGORIE": rng.choice(["chemisch", "biologisch", "Grundstoff", None])}
+    elif name == "wirkstoff_gehalt":
+        for i in range(count):
+            m = _spread(i, count, len(p.mittel))
+            yield {"KENNR": p.mittel[m], "WIRKNR": _pick_distinct(p.wirkstoff, m, i),
+                   "GEHALT": round(rng.uniform(0.1, 800), 2), "GEHALT_EINHEIT": rng.choice(["g/l", "g/kg", "%"]),
+                   "GEHALT_ART": rng.choice(["rein", "Salz", "Ester"])}
+    elif name == "awg":
+        for i in range(count):
+            yield {"AWG_ID": p.awg[i], "KENNR": p.awg[i][:9], "AWG_AUFLAGEN": rng.choice(p.auflagen),
+                   "AWG_ANWENDUNGSBEREICH": rng.choice(["Freiland", "Gewächshaus", "Vorratsschutz", "Haus- und Kleingarten"]),
+                   "AWG_BIS": _date(rng, 2025, 2040), "AWG_VON": _date(rng, 1995, 2025),
+                   "ANTRAGSTELLER": rng.choice(p.adresse), "DATUM": _date(rng, 2000, 2025)}
+    elif name in ("awg_kultur", "awg_schadorg", "awg_aufwand", "awg_wartezeit", "awg_zulassung"):
+        for i in range(count):
+            a = _spread(i, count, len(p.awg))
+            row = {"AWG_ID": p.awg[a]}
+            if name == "awg_kultur":
+                kultur = _pick_distinct(p.kultur, a, i)
+                row.update({"KULTUR": kultur, "KULTUR_GRUPPE": kultur[:3]})
+                if rng.random() < 0.1:
+                    row["SCHADORG"] = rng.choice(p.schadorg)
+            elif name == "awg_schadorg":
+                schadorg = _pick_distinct(p.schadorg, a, i)
+                row.update({"SCHADORG": schadorg, "SCHADORG_GRUPPE": schadorg[:3]})
+            elif name == "awg_aufwand":
+                row.update({"AUFWAND": round(rng.choice([0.05, 0.1, 0.25, 0.5, 1, 1.5, 2, 3, 5]) * rng.randint(1, 4), 2),
+                            "AUFWAND_EINHEIT": rng.choice(UNITS), "AUFWAND_TEXT": _text(rng, 0, 6) or None,
+                            "STADIUM_VON": rng.randint(0, 89), "STADIUM_BIS": rng.randint(0, 99)})
+            elif name == "awg_wartezeit":
+                row.update({"WARTEZEIT_TAGE": rng.choice([None, 3, 7, 14, 21, 28, 35, 42, 56, 60, 90]),
+                            "WARTEZEIT_TEXT": rng.choice([None, "F", "N", "Die Wartezeit ist durch die Anwendung abgedeckt"]),
+                            "KULTUR": rng.choice(p.kultur), "ERNTE_NUTZUNG": rng.choice([None, "Ernte", "Grünfutter"])})
+            else:
+                row.update({"ZULASSUNGSNR": f"{p.awg[a][:6]}-{i % 100:02d}", "ZUL_VON": _date(rng, 1995, 2025),
+                            "ZUL_BIS": _date(rng, 2025, 2040), "STATUS": rng.choice(STATUS)})
+            yield row
+    elif name == "auflagen":
+        for i in range(count):
+            auession = rng.choice(p.auflagen)
+            yield {"AUESSION": auession, "AUESSION_GRUPPE": auession[:3],
+                   "AUFLAGE": _text(rng, 4, 18), "AUFLAGE_GRUPPE": rng.choice(["NW", "NT", "VA", "WA", "SB", "SS"])}
+    elif name == "kode":
+        for i in range(count):
+            yield {"KOESSION": f"K{i:06d}", "KOESSION_ART": rng.choice(p.kodeliste),
+                   "KODE_TEXT": _text(rng, 1, 6), "KODE_ZUSATZ": rng.choice([None, None, _text(rng, 1, 3)])}
+    elif name == "kodeliste":
+        for i in range(count):
+            yield {"KOESSION_ART": p.kodeliste[i], "BESCHREIBUNG": _text(rng, 2, 5)}
+    elif name in ("kultur_gruppe", "schadorg_gruppe"):
+        prefix, keys = ("KULTUR", p.kultur) if name == "kultur_gruppe" else ("SCHADORG", p.schadorg)
+        for i in range(count):
+            yield {prefix: keys[i], f"{prefix}_NAME": f"{_text(rng, 1, 3)} {i}",
+                   "EPPO_CODE": keys[i], f"{prefix}_GRUPPE": keys[i][:3]}
+    elif name == "adresse":
+        for i in range(count):
+            yield {"AESSION": p.adresse[i], "FIRMA": f"{_text(rng, 1, 2)} GmbH {i}",
+                   "STRASSE": f"{rng.choice(WORDS)}straße {rng.randint(1, 200)}",
+                   "PLZ": f"{rng.randint(1000, 99999):05d}", "ORT": rng.choice(WORDS),
+                   "LAND": rng.choice(COUNTRIES), "TELEFON": f"+49 {rng.randint(100, 9999)} {rng.randint(10000, 9999999)}",
+                   "EMAIL": f"info{i}@example.com", "URL": rng.choice([None, f"https://www.example{i}.de"])}
+    elif name == "mittel_vertrieb":
+        for i in range(count):
+            m = _spread(i, count, len(p.mittel))
+            yield {"KENNR": p.mittel[m], "AESSION": _pick_distinct(p.adresse, m, i),
+                   "VERTRIEB_ART": rng.choice(["Vertrieb", "Zulassungsinhaber", "Parallelimport"])}
+    elif name == "ghs_gefahrenhinweise":
+        for i in range(count):
+            yield {"H_NR": p.h_nr[i], "H_TEXT": _text(rng, 4, 12), "SIGNALWORT": rng.choice(SIGNAL_WORDS)}
+    elif name == "ghs_sicherheitshinweise":
+        for i in range(count):
+            yield {"P_NR": p.p_nr[i], "P_TEXT": _text(rng, 4, 16)}
+    elif name == "ghs_gefahrensymbole":
+        for i in range(count):
+            yield {"SYMBOL": p.symbol[i], "SYMBOL_TEXT": _text(rng, 1, 3),
+                   "BILD_URL": f"https://example.com/ghs/{p.symbol[i].lower()}.png"}
+    elif name == "mittel_gefahren_symbol":
+        for i in range(count):
+            yield {"KENNR": p.mittel[_spread(i, count, len(p.mittel))], "SYMBOL": rng.choice(p.symbol),
+                   "H_NR": rng.choice(p.h_nr), "P_NR": rng.choice(p.p_nr)}
+    elif name == "hinweis":
+        for i in range(count):
+            yield {"KENNR": p.mittel[_spread(i, count, len(p.mittel))],
+                   "HINWEIS_ART": rng.choice(["WH", "NG", "NN", "NT", "VH"]), "HINWEIS_TEXT": _text(rng, 3, 20)}
+    elif name == "stand":
+        yield {"STAND_DATUM": "2025-01-01", "STAND_TEXT": "Synthetischer Datenstand", "VERSION": "1"}
+
+
+def table_rows(scale: float = 1.0) -> dict:
+    """Anzahl Datensätze pro Endpunkt für einen Faktor"""
+    return {
+        name: count if name in FIXED_TABLES else max(1, int(count * scale))
+        for name, count in BASE_ROWS.items()
+    }
+
+
+def generate_dataset(scale: float = 1.0, seed: int = 0) -> dict:
+    """
+    Erzeugt Rohdaten für alle Endpunkte aus config.ENDPOINTS im Speicher
+    (mock_bvl_server.py; für große Faktoren write_dataset verwenden).
+    
+    Returns:
+        Endpunkt → Liste von Datensätzen (wie fetch_all_endpoints)
+    """
+    rows = table_rows(scale)
+    pools = Pools(rows)
+    return {
+        name: list(_iter_table(name, rows.get(name, 0), pools, _rng(name, seed)))
+        for name in ENDPOINTS
+    }
+
+
+def write_dataset(output_dir: str, scale: float = 1.0, seed: int = 0) -> dict:
+    """
+    Schreibt die Rohdaten direkt nach <output_dir>/raw/<endpunkt>.json.
+    
+    Tabelle für Tabelle und seitenweise (compress.JsonArrayWriter), im
+    Speicher liegen nur die Schlüssel-Pools und eine Seite. Die Dateien
+    sind byte-gleich zu json.dump(generate_dataset(...)[name]).
+    
+    Returns:
+        Endpunkt → Anzahl Datensätze
+    """
+    raw_dir = Path(output_dir) / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    rows = table_rows(scale)
+    pools = Pools(rows)
+    
+    counts = {}
+    for name in ENDPOINTS:
+        writer = JsonArrayWriter(raw_dir / f"{name}.json", compress=False)
+        for batch in iter_batches(_iter_table(name, rows.get(name, 0), pools, _rng(name, seed))):
+            writer.write(batch)
+        writer.close()
+        counts[name] = writer.count
+    return counts
+
+
+def main():
+    """Hauptfunktion"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Synthetische BVL-Rohdaten für Benchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor auf den aktuellen Datenstand (Standard: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed für reproduzierbare Daten")
+    parser.add_argument("--output", default=DATA_DIR, help="Ziel-Verzeichnis (schreibt raw/*.json)")
+    args = parser.parse_args()
+    
+    counts = write_dataset(args.output, args.scale, args.seed)
+    raw_dir = Path(args.output) / "raw"
+    print(f"✅ {sum(counts.values()):,} synthetische Datensätze ({len(counts)} Endpunkte) in {raw_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
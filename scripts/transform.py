@@ -3,517 +3,504 @@
 BVL Daten Transformer
 =====================
 Transformiert Rohdaten in normalisierte Struktur für die App.
+
+Die Feld-Zuordnung ist deklarativ in config.FIELD_MAPPINGS beschrieben und
+wird einmalig pro Endpunkt in eine schnelle Zeilen-Funktion kompiliert.
 """
 
+import gzip
 import json
 import os
+import shutil
 import sys
+import time
+from collections.abc import Mapping
 from datetime import datetime
 from pathlib import Path
 
-from config import DATA_DIR, get_endpoint_count
-
-
-def load_raw_data(input_dir: str = DATA_DIR) -> dict:
-    """Lädt alle Rohdaten"""
-    raw_dir = Path(input_dir) / "raw"
-    data = {}
-    
-    for file_path in raw_dir.glob("*.json"):
-        name = file_path.stem
-        with open(file_path, "r", encoding="utf-8") as f:
-            data[name] = json.load(f)
-        print(f"  📂 {name}: {len(data[name]):,} Datensätze")
-    
-    return data
-
-
-def transform_mittel(raw_data: dict) -> list:
-    """Transformiert Mittel-Daten"""
-    mittel = raw_data.get("mittel", [])
-    
-    transformed = []
-    for m in mittel:
-        transformed.append({
-            "kennr": m.get("KENNR", ""),
-            "mittelname": m.get("MITTELNAME", ""),
-            "formulierung_art": m.get("FORMULIERUNG_ART"),
-            "zul_erstmalig_am": m.get("ZUL_ERSTMALIG_AM"),
-            "zul_ende": m.get("ZUL_ENDE"),
-            "wirkungsbereich": m.get("WIRKUNGSBEREICH"),
-            "kennr_zul": m.get("KENNR_ZUL"),
-            "is_active": True
-        })
-    
-    return transformed
-
-
-def transform_mittel_abgelaufen(raw_data: dict) -> list:
-    """Transformiert abgelaufene Mittel"""
-    mittel = raw_data.get("mittel_abgelaufen", [])
-    
-    transformed = []
-    for m in mittel:
-        transformed.append({
-            "kennr": m.get("KENNR", ""),
-            "mittelname": m.get("MITTELNAME", ""),
-            "formulierung_art": m.get("FORMULIERUNG_ART"),
-            "zul_erstmalig_am": m.get("ZUL_ERSTMALIG_AM"),
-            "zul_ende": m.get("ZUL_ENDE"),
-            "aufbrauchfrist": m.get("AUFBRAUCHFRIST"),
-            "status": m.get("STATUS"),
-            "is_active": False
-        })
-    
-    return transformed
-
-
-def transform_wirkstoffe(raw_data: dict) -> list:
-    """Transformiert Wirkstoffe"""
-    wirkstoffe = raw_data.get("wirkstoff", [])
-    
-    transformed = []
-    for w in wirkstoffe:
-        transformed.append({
-            "wirknr": w.get("WIRKNR", ""),
-            "wirkstoffname": w.get("WIRKSTOFFNAME", ""),
-            "wirkstoffname_en": w.get("WIRKSTOFFNAME_EN"),
-            "cas_nr": w.get("CAS_NR"),
-            "kategorie": w.get("KATEGORIE")
-        })
-    
-    return transformed
-
-
-def transform_wirkstoff_gehalt(raw_data: dict) -> list:
-    """Transformiert Wirkstoffgehalt"""
-    gehalt = raw_data.get("wirkstoff_gehalt", [])
-    
-    transformed = []
-    for g in gehalt:
-        transformed.append({
-            "kennr": g.get("KENNR", ""),
-            "wirknr": g.get("WIRKNR", ""),
-            "gehalt": g.get("GEHALT"),
-            "gehalt_einheit": g.get("GEHALT_EINHEIT"),
-            "gehalt_art": g.get("GEHALT_ART")
-        })
-    
-    return transformed
-
-
-def transform_awg(raw_data: dict) -> list:
-    """Transformiert Anwendungsgebiete"""
-    awg = raw_data.get("awg", [])
-    
-    transformed = []
-    for a in awg:
-        transformed.append({
-            "awg_id": a.get("AWG_ID"),
-            "kennr": a.get("KENNR", ""),
-            "awg_auflagen": a.get("AWG_AUFLAGEN"),
-            "awg_anwendungsbereich": a.get("AWG_ANWENDUNGSBEREICH"),
-            "awg_bis": a.get("AWG_BIS"),
-            "awg_von": a.get("AWG_VON"),
-            "antragsteller": a.get("ANTRAGSTELLER"),
-            "datum": a.get("DATUM")
-        })
-    
-    return transformed
-
-
-def transform_awg_kultur(raw_data: dict) -> list:
-    """Transformiert AWG-Kulturen"""
-    kulturen = raw_data.get("awg_kultur", [])
-    
-    transformed = []
-    for k in kulturen:
-        transformed.append({
-            "awg_id": k.get("AWG_ID"),
-            "kultur": k.get("KULTUR", ""),
-            "kultur_gruppe": k.get("KULTUR_GRUPPE"),
-            "schadorg": k.get("SCHADORG")  # Manchmal enthalten
-        })
-    
-    return transformed
-
-
-def transform_awg_schadorg(raw_data: dict) -> list:
-    """Transformiert AWG-Schadorganismen"""
-    schadorg = raw_data.get("awg_schadorg", [])
-    
-    transformed = []
-    for s in schadorg:
-        transformed.append({
-            "awg_id": s.get("AWG_ID"),
-            "schadorg": s.get("SCHADORG", ""),
-            "schadorg_gruppe": s.get("SCHADORG_GRUPPE")
-        })
-    
-    return transformed
-
-
-def transform_awg_aufwand(raw_data: dict) -> list:
-    """Transformiert Aufwandmengen"""
-    aufwand = raw_data.get("awg_aufwand", [])
-    
-    transformed = []
-    for a in aufwand:
-        transformed.append({
-            "awg_id": a.get("AWG_ID"),
-            "aufwand": a.get("AUFWAND"),
-            "aufwand_einheit": a.get("AUFWAND_EINHEIT"),
-            "aufwand_text": a.get("AUFWAND_TEXT"),
-            "stadium_von": a.get("STADIUM_VON"),
-            "stadium_bis": a.get("STADIUM_BIS")
-        })
-    
-    return transformed
-
-
-def transform_awg_wartezeit(raw_data: dict) -> list:
-    """Transformiert Wartezeiten"""
-    wartezeit = raw_data.get("awg_wartezeit", [])
-    
-    transformed = []
-    for w in wartezeit:
-        transformed.append({
-            "awg_id": w.get("AWG_ID"),
-            "wartezeit_tage": w.get("WARTEZEIT_TAGE"),
-            "wartezeit_text": w.get("WARTEZEIT_TEXT"),
-            "kultur": w.get("KULTUR"),
-            "ernte_nutzung": w.get("ERNTE_NUTZUNG")
-        })
-    
-    return transformed
-
-
-def transform_awg_zulassung(raw_data: dict) -> list:
-    """Transformiert AWG-Zulassungszeiträume"""
-    zulassung = raw_data.get("awg_zulassung", [])
-    
-    transformed = []
-    for z in zulassung:
-        transformed.append({
-            "awg_id": z.get("AWG_ID"),
-            "zulassungsnr": z.get("ZULASSUNGSNR"),
-            "zul_von": z.get("ZUL_VON"),
-            "zul_bis": z.get("ZUL_BIS"),
-            "status": z.get("STATUS")
-        })
-    
-    return transformed
-
-
-def transform_auflagen(raw_data: dict) -> list:
-    """Transformiert Auflagen"""
-    auflagen = raw_data.get("auflagen", [])
-    
-    transformed = []
-    for a in auflagen:
-        transformed.append({
-            "auession": a.get("AUESSION", ""),
-            "auession_gruppe": a.get("AUESSION_GRUPPE"),
-            "auflage": a.get("AUFLAGE"),
-            "auflage_gruppe": a.get("AUFLAGE_GRUPPE")
-        })
-    
-    return transformed
-
-
-def transform_kode(raw_data: dict) -> list:
-    """Transformiert Kodelisten"""
-    kode = raw_data.get("kode", [])
-    
-    transformed = []
-    for k in kode:
-        transformed.append({
-            "koession": k.get("KOESSION", ""),
-            "koession_art": k.get("KOESSION_ART", ""),
-            "kode_text": k.get("KODE_TEXT"),
-            "kode_zusatz": k.get("KODE_ZUSATZ")
-        })
-    
-    return transformed
-
-
-def transform_kodeliste(raw_data: dict) -> list:
-    """Transformiert Kodelisten-Beschreibung"""
-    kodeliste = raw_data.get("kodeliste", [])
-    
-    transformed = []
-    for k in kodeliste:
-        transformed.append({
-            "koession_art": k.get("KOESSION_ART", ""),
-            "beschreibung": k.get("BESCHREIBUNG")
-        })
-    
-    return transformed
-
-
-def transform_kultur_gruppe(raw_data: dict) -> list:
-    """Transformiert Kultur-Gruppen (Lookup)"""
-    kulturen = raw_data.get("kultur_gruppe", [])
-    
-    transformed = []
-    for k in kulturen:
-        transformed.append({
-            "kultur": k.get("KULTUR", ""),
-            "kultur_name": k.get("KULTUR_NAME", ""),
-            "eppo_code": k.get("EPPO_CODE"),
-            "kultur_gruppe": k.get("KULTUR_GRUPPE")
-        })
-    
-    return transformed
-
-
-def transform_schadorg_gruppe(raw_data: dict) -> list:
-    """Transformiert Schadorganismen-Gruppen (Lookup)"""
-    schadorg = raw_data.get("schadorg_gruppe", [])
-    
-    transformed = []
-    for s in schadorg:
-        transformed.append({
-            "schadorg": s.get("SCHADORG", ""),
-            "schadorg_name": s.get("SCHADORG_NAME", ""),
-            "eppo_code": s.get("EPPO_CODE"),
-            "schadorg_gruppe": s.get("SCHADORG_GRUPPE")
-        })
-    
-    return transformed
-
-
-def transform_adresse(raw_data: dict) -> list:
-    """Transformiert Adressen"""
-    adressen = raw_data.get("adresse", [])
-    
-    transformed = []
-    for a in adressen:
-        transformed.append({
-            "aession": a.get("AESSION", ""),
-            "firma": a.get("FIRMA"),
-            "strasse": a.get("STRASSE"),
-            "plz": a.get("PLZ"),
-            "ort": a.get("ORT"),
-            "land": a.get("LAND"),
-            "telefon": a.get("TELEFON"),
-            "email": a.get("EMAIL"),
-            "url": a.get("URL")
-        })
+from config import (
+    DATA_DIR,
+    FIELD_MAPPINGS,
+    COLUMNAR_MIN_RECORDS,
+    COLUMNAR_FORMAT_VERSION,
+    PROFILE_DIR,
+    get_endpoint_count
+)
+from buildcache import BuildCache, hash_bytes, hash_chunks
+from checkpoint import load_incomplete
+from compress import JsonArrayWriter
+from jsonstream import iter_batches, iter_chunks, iter_json_array
+from metrics import METRICS
+from profiling import profile_stage
+
+
+def _to_int(value) -> int:
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(value)
+        return int(value)
+    text = str(value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        return _to_int(float(text.replace(",", ".")))
+
+
+def _to_float(value) -> float:
+    if isinstance(value, str):
+        value = value.strip().replace(",", ".")
+    return float(value)
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("j", "ja", "y", "yes", "true", "1", "x"):
+            return True
+        if text in ("n", "nein", "no", "false", "0"):
+            return False
+        raise ValueError(value)
+    return bool(value)
+
+
+# Typname → (Zieltyp, Konverter)
+COERCIONS = {
+    "str": (str, str),
+    "int": (int, _to_int),
+    "float": (float, _to_float),
+    "bool": (bool, _to_bool),
+}
+
+
+def _make_coercer(type_name: str, default, errors: list):
+    """Erzeugt die Konvertierungsfunktion für ein Feld"""
+    target, convert = COERCIONS[type_name]
+    
+    def coerce(value):
+        if value is None:
+            return default
+        if type(value) is target:
+            return value
+        if value == "" and target is not str:
+            return default
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            errors[0] += 1
+            return default
+    
+    return coerce
+
+
+def _is_literal(value) -> bool:
+    """Werte, die direkt als Literal in den generierten Code passen"""
+    return value is None or type(value) in (bool, int, float, str)
+
+
+class CompiledMapping:
+    """
+    Kompilierte Feld-Zuordnung eines Endpunkts (aus config.FIELD_MAPPINGS).
+    
+    Die Spezifikation wird per Code-Generierung in eine List-Comprehension
+    übersetzt, die jede Zeile mit einem einzigen Dict-Literal aufbaut.
+    Quellfelder werden exakt nachgeschlagen (r.get("KENNR") wie in den
+    abgelösten transform_*-Funktionen); kompiliert wird nur einmal.
+    """
+    
+    def __init__(self, name: str, spec: list):
+        self.name = name
+        self.spec = [tuple(field) for field in spec]
+        self.fields = [field[0] for field in self.spec]
+        self.sources = [field[1] for field in self.spec if field[1] is not None]
+        self.reset()
+    
+    def reset(self):
+        """Setzt die Auswertung (gesehene Felder, Konvertierungsfehler) zurück"""
+        self.seen_keys = set()
+        self.coercion_errors = [0]
+        self._coercers = {
+            idx: _make_coercer(type_name, default, self.coercion_errors)
+            for idx, (_, source, type_name, default) in enumerate(self.spec)
+            if source is not None and type_name is not None
+        }
+        self._build = None
+    
+    def _compile(self):
+        """Generiert die Zeilen-Funktion"""
+        namespace = {}
+        parts = []
+        
+        for idx, (target, source, type_name, default) in enumerate(self.spec):
+            if source is None:
+                if _is_literal(default):
+                    expr = repr(default)
+                else:
+                    namespace[f"_k{idx}"] = default
+                    expr = f"_k{idx}"
+            elif type_name is None:
+                if default is None:
+                    expr = f"r.get({source!r})"
+                elif _is_literal(default):
+                    expr = f"r.get({source!r}, {default!r})"
+                else:
+                    namespace[f"_d{idx}"] = default
+                    expr = f"r.get({source!r}, _d{idx})"
+            else:
+                # Schneller Pfad ohne Funktionsaufruf, wenn der Typ schon passt
+                type_ref = f"_t{idx}"
+                namespace[type_ref] = COERCIONS[type_name][0]
+                namespace[f"_c{idx}"] = self._coercers[idx]
+                expr = f"(_v{idx} if type(_v{idx} := r.get({source!r})) is {type_ref} else _c{idx}(_v{idx}))"
+            parts.append(f"{target!r}: {expr}")
+        
+        source = f"def build(rows):\n    return [{{{', '.join(parts)}}} for r in rows]\n"
+        exec(compile(source, f"<mapping {self.name}>", "exec"), namespace)
+        return namespace["build"]
+    
+    def transform(self, items) -> list:
+        """Transformiert eine Liste (oder einen Iterator) von Rohdatensätzen"""
+        if not isinstance(items, list):
+            return [row for batch in self.transform_batches(items) for row in batch]
+        if not items:
+            return []
+        # Schlüssel der ersten Zeile pro Seite für den Mapping-Report
+        if not self.seen_keys.issuperset(items[0]):
+            self.seen_keys.update(items[0])
+        if self._build is None:
+            self._build = self._compile()
+        return self._build(items)
+    
+    def transform_batches(self, items):
+        """
+        Transformiert einen Iterator von Rohdatensätzen in Listen zu je
+        jsonstream.BATCH_SIZE Zeilen (es liegt nur eine Liste im Speicher).
+        """
+        for batch in iter_batches(items):
+            yield self.transform(batch)
+    
+    def unmatched_sources(self) -> list:
+        """Quellfelder, die in keinem gesehenen Datensatz vorkamen"""
+        if not self.seen_keys:
+            return []
+        return [source for source in self.sources if source not in self.seen_keys]
+    
+    def unmapped_keys(self) -> list:
+        """Vorhandene Felder der Rohdaten, die keinem Zielfeld zugeordnet sind"""
+        mapped = set(self.sources)
+        return sorted(key for key in self.seen_keys if key not in mapped)
+
+
+def compile_mappings(field_mappings: dict = FIELD_MAPPINGS) -> dict:
+    """Kompiliert alle Feld-Zuordnungen"""
+    return {name: CompiledMapping(name, spec) for name, spec in field_mappings.items()}
+
+
+MAPPINGS = compile_mappings()
+
+
+def print_mapping_report(name: str):
+    """Warnt vor Quellfeldern ohne Treffer (→ stille null-Spalten)"""
+    mapping = MAPPINGS[name]
+    missing = mapping.unmatched_sources()
+    
+    if missing:
+        if len(missing) == len(mapping.sources):
+            print(f"    ❌ {name}: kein Quellfeld gefunden - alle Felder leer!")
+        else:
+            print(f"    ⚠️ {name}: Quellfelder ohne Treffer: {', '.join(missing)}")
+        unmapped = mapping.unmapped_keys()
+        if unmapped:
+            print(f"       Nicht zugeordnete Felder in den Rohdaten: {', '.join(unmapped)}")
     
-    return transformed
+    if mapping.coercion_errors[0]:
+        print(f"    ⚠️ {name}: {mapping.coercion_errors[0]:,} Werte nicht konvertierbar (Default gesetzt)")
 
 
-def transform_mittel_vertrieb(raw_data: dict) -> list:
-    """Transformiert Mittel-Vertrieb"""
-    vertrieb = raw_data.get("mittel_vertrieb", [])
-    
-    transformed = []
-    for v in vertrieb:
-        transformed.append({
-            "kennr": v.get("KENNR", ""),
-            "aession": v.get("AESSION", ""),
-            "vertrieb_art": v.get("VERTRIEB_ART")
-        })
-    
-    return transformed
+def transform_items(name: str, items) -> list:
+    """Transformiert Datensätze eines Endpunkts (z.B. eine einzelne Seite oder einen Iterator)"""
+    return MAPPINGS[name].transform(items)
 
 
-def transform_ghs_gefahrenhinweise(raw_data: dict) -> list:
-    """Transformiert GHS H-Sätze"""
-    hinweise = raw_data.get("ghs_gefahrenhinweise", [])
+class TransformedTables(Mapping):
+    """
+    Transformierte Tabellen als Mapping Name → Zeilen über die Dateien
+    transformed/<name>.json.
     
-    transformed = []
-    for h in hinweise:
-        transformed.append({
-            "h_nr": h.get("H_NR", ""),
-            "h_text": h.get("H_TEXT", ""),
-            "signalwort": h.get("SIGNALWORT")
-        })
+    Jeder Zugriff liest die Datei neu; wer über items() läuft, hat damit
+    immer nur eine Tabelle im Speicher (--columnar, --dict-encode, ...).
+    """
     
-    return transformed
-
-
-def transform_ghs_sicherheitshinweise(raw_data: dict) -> list:
-    """Transformiert GHS P-Sätze"""
-    hinweise = raw_data.get("ghs_sicherheitshinweise", [])
-    
-    transformed = []
-    for h in hinweise:
-        transformed.append({
-            "p_nr": h.get("P_NR", ""),
-            "p_text": h.get("P_TEXT", "")
-        })
-    
-    return transformed
-
-
-def transform_ghs_gefahrensymbole(raw_data: dict) -> list:
-    """Transformiert GHS-Symbole"""
-    symbole = raw_data.get("ghs_gefahrensymbole", [])
+    def __init__(self, out_dir: Path, names: list):
+        self.out_dir = Path(out_dir)
+        self.names = list(names)
     
-    transformed = []
-    for s in symbole:
-        transformed.append({
-            "symbol": s.get("SYMBOL", ""),
-            "symbol_text": s.get("SYMBOL_TEXT", ""),
-            "bild_url": s.get("BILD_URL")
-        })
+    def path(self, name: str) -> Path:
+        return self.out_dir / f"{name}.json"
     
-    return transformed
-
-
-def transform_mittel_gefahren_symbol(raw_data: dict) -> list:
-    """Transformiert Mittel-GHS-Zuordnung"""
-    symbole = raw_data.get("mittel_gefahren_symbol", [])
+    def __getitem__(self, name: str) -> list:
+        if name not in self.names:
+            raise KeyError(name)
+        return list(iter_json_array(self.path(name)))
     
-    transformed = []
-    for s in symbole:
-        transformed.append({
-            "kennr": s.get("KENNR", ""),
-            "symbol": s.get("SYMBOL", ""),
-            "h_nr": s.get("H_NR"),
-            "p_nr": s.get("P_NR")
-        })
+    def __iter__(self):
+        return iter(self.names)
     
-    return transformed
+    def __len__(self) -> int:
+        return len(self.names)
 
 
-def transform_hinweis(raw_data: dict) -> list:
-    """Transformiert Hinweise"""
-    hinweise = raw_data.get("hinweis", [])
+def transform_cached(cache: BuildCache, input_dir: str = DATA_DIR,
+                     output_dir: str = DATA_DIR) -> TransformedTables:
+    """
+    Transformiert und speichert alle Tabellen; Tabellen mit unveränderten
+    Rohdaten (und unveränderter Feld-Zuordnung) kommen aus dem Build-Cache.
     
-    transformed = []
-    for h in hinweise:
-        transformed.append({
-            "kennr": h.get("KENNR", ""),
-            "hinweis_art": h.get("HINWEIS_ART"),
-            "hinweis_text": h.get("HINWEIS_TEXT")
-        })
-    
-    return transformed
-
-
-def transform_staerkung(raw_data: dict) -> list:
-    """Transformiert Pflanzenstärkungsmittel"""
-    staerkung = raw_data.get("staerkung", [])
+    Rohdaten-Dateien werden elementweise gelesen (jsonstream) und die
+    Ergebnisse seitenweise geschrieben; es liegt höchstens eine Seite einer
+    Tabelle im Speicher.
     
-    transformed = []
-    for s in staerkung:
-        transformed.append({
-            "kennr": s.get("KENNR", ""),
-            "mittelname": s.get("MITTELNAME", ""),
-            "formulierung_art": s.get("FORMULIERUNG_ART"),
-            "antragsteller": s.get("ANTRAGSTELLER"),
-            "listung_von": s.get("LISTUNG_VON"),
-            "listung_bis": s.get("LISTUNG_BIS")
-        })
+    Returns:
+        Die geschriebenen Tabellen (None ohne Rohdaten)
+    """
+    raw_dir = Path(input_dir) / "raw"
+    out_dir = Path(output_dir) / "transformed"
+    out_dir.mkdir(parents=True, exist_ok=True)
     
-    return transformed
-
-
-def transform_zusatzstoff(raw_data: dict) -> list:
-    """Transformiert Zusatzstoffe"""
-    zusatzstoff = raw_data.get("zusatzstoff", [])
+    if not any(raw_dir.glob("*.json")):
+        return None
     
-    transformed = []
-    for z in zusatzstoff:
-        transformed.append({
-            "kennr": z.get("KENNR", ""),
-            "mittelname": z.get("MITTELNAME", ""),
-            "formulierung_art": z.get("FORMULIERUNG_ART"),
-            "antragsteller": z.get("ANTRAGSTELLER"),
-            "listung_von": z.get("LISTUNG_VON"),
-            "listung_bis": z.get("LISTUNG_BIS")
-        })
+    # Eine Änderung an der Transformation selbst invalidiert alle Einträge
+    code = Path(__file__).read_bytes()
     
-    return transformed
-
-
-def transform_stand(raw_data: dict) -> list:
-    """Transformiert Datenstand"""
-    stand = raw_data.get("stand", [])
+    print("\n🔄 Transformiere Daten...")
     
-    transformed = []
-    for s in stand:
-        transformed.append({
-            "stand_datum": s.get("STAND_DATUM"),
-            "stand_text": s.get("STAND_TEXT"),
-            "version": s.get("VERSION")
-        })
+    incomplete = load_incomplete(input_dir)
+    names = []
+    for name, mapping in MAPPINGS.items():
+        raw_path = raw_dir / f"{name}.json"
+        file_path = out_dir / f"{name}.json"
+        
+        # Unvollständig geladen: zuletzt veröffentlichte Version übernehmen
+        # (ohne Vorversion wird die Tabelle nicht veröffentlicht)
+        published_path = Path(output_dir) / f"{name}.json.gz"
+        if name in incomplete:
+            if not published_path.exists():
+                file_path.unlink(missing_ok=True)
+                print(f"  ❌ {name}: unvollständig geladen, keine Vorversion - übersprungen")
+                continue
+            with gzip.open(published_path, "rb") as src, open(file_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            names.append(name)
+            print(f"  ⏸️ {name}: unvollständig geladen - vorherige Version")
+            continue
+        
+        names.append(name)
+        if not raw_path.exists():
+            print(f"  ⚠️ {name}: keine Rohdaten vorhanden")
+            file_path.write_text("[]", encoding="utf-8")
+            continue
+        
+        start = time.perf_counter()
+        raw_digest = hash_chunks(iter_chunks(raw_path))
+        key = hash_bytes(raw_digest, repr(FIELD_MAPPINGS[name]), code)
+        
+        meta = cache.get("transform", name, key)
+        if meta is not None:
+            cache.restore("transform", name, file_path)
+            print(f"  ♻️ {name}: {meta['count']:,} Datensätze (Cache)")
+            METRICS.record_table(name, meta["count"], time.perf_counter() - start, cached=True)
+            continue
+        
+        mapping.reset()
+        writer = JsonArrayWriter(file_path, compress=False)
+        for batch in mapping.transform_batches(iter_json_array(raw_path)):
+            writer.write(batch)
+        writer.close()
+        print(f"  ✅ {name}: {writer.count:,} Datensätze")
+        print_mapping_report(name)
+        
+        cache.put("transform", name, key, {"count": writer.count}, file_path)
+        METRICS.record_table(name, writer.count, time.perf_counter() - start)
+    
+    cache.print_stats("transform")
+    return TransformedTables(out_dir, names)
+
+
+def run_transform(cache: BuildCache, columnar: bool = False, dict_encode: bool = False,
+                  indexes: bool = False, sqlite: bool = False, data_dir: str = DATA_DIR) -> TransformedTables:
+    """
+    Transformiert alle Tabellen und erzeugt die gewählten Zusatzformate.
+    
+    Die Zusatzformate lesen die Tabellen einzeln aus transformed/
+    (TransformedTables), nicht alle zugleich.
+    
+    Returns:
+        Die transformierten Tabellen (None ohne Rohdaten)
+    """
+    transformed = transform_cached(cache, data_dir, data_dir)
+    
+    if transformed is None:
+        return None
+    
+    if columnar:
+        print("\n🧱 Speichere Spaltenformat...")
+        save_columnar_data(transformed, data_dir)
+    
+    if dict_encode:
+        from encode import encode_all, save_encoded_data
+        dictionaries, encoded = encode_all(transformed)
+        save_encoded_data(dictionaries, encoded, data_dir)
+    
+    if indexes:
+        from indexes import build_indexes, save_indexes
+        save_indexes(build_indexes(transformed), data_dir)
+    
+    if sqlite:
+        from sqlite_build import build_sqlite
+        build_sqlite(transformed, data_dir)
     
     return transformed
 
 
-def transform_all(raw_data: dict) -> dict:
-    """Transformiert alle Daten"""
-    print("\n🔄 Transformiere Daten...")
-    
-    transformers = {
-        "mittel": transform_mittel,
-        "mittel_abgelaufen": transform_mittel_abgelaufen,
-        "wirkstoff": transform_wirkstoffe,
-        "wirkstoff_gehalt": transform_wirkstoff_gehalt,
-        "awg": transform_awg,
-        "awg_kultur": transform_awg_kultur,
-        "awg_schadorg": transform_awg_schadorg,
-        "awg_aufwand": transform_awg_aufwand,
-        "awg_wartezeit": transform_awg_wartezeit,
-        "awg_zulassung": transform_awg_zulassung,
-        "auflagen": transform_auflagen,
-        "kode": transform_kode,
-        "kodeliste": transform_kodeliste,
-        "kultur_gruppe": transform_kultur_gruppe,
-        "schadorg_gruppe": transform_schadorg_gruppe,
-        "adresse": transform_adresse,
-        "mittel_vertrieb": transform_mittel_vertrieb,
-        "ghs_gefahrenhinweise": transform_ghs_gefahrenhinweise,
-        "ghs_sicherheitshinweise": transform_ghs_sicherheitshinweise,
-        "ghs_gefahrensymbole": transform_ghs_gefahrensymbole,
-        "mittel_gefahren_symbol": transform_mittel_gefahren_symbol,
-        "hinweis": transform_hinweis,
-        "staerkung": transform_staerkung,
-        "zusatzstoff": transform_zusatzstoff,
-        "stand": transform_stand,
+def to_columnar(name: str, rows: list) -> dict:
+    """
+    Wandelt eine Tabelle in das Spaltenformat (struct-of-arrays) um.
+    
+    Statt jede Zeile als Objekt mit allen Schlüsseln zu speichern, gibt es
+    einen Schema-Header und ein Array pro Spalte (gleiche Reihenfolge wie
+    "columns"). Zeile i entspricht data[0][i], data[1][i], ...
+    """
+    mapping = MAPPINGS.get(name)
+    if mapping is not None:
+        columns = mapping.fields
+        types = {field[0]: field[2] for field in mapping.spec}
+    else:
+        columns = list(rows[0]) if rows else []
+        types = {}
+    
+    return {
+        "format": "columnar",
+        "version": COLUMNAR_FORMAT_VERSION,
+        "table": name,
+        "count": len(rows),
+        "columns": columns,
+        "types": [types.get(column) for column in columns],
+        "data": [[row.get(column) for row in rows] for column in columns],
     }
-    
-    transformed = {}
-    for name, transformer in transformers.items():
-        if name in raw_data:
-            transformed[name] = transformer(raw_data)
-            print(f"  ✅ {name}: {len(transformed[name]):,} Datensätze")
-        else:
-            print(f"  ⚠️ {name}: keine Rohdaten vorhanden")
-            transformed[name] = []
-    
-    return transformed
 
 
-def save_transformed_data(data: dict, output_dir: str = DATA_DIR):
-    """Speichert transformierte Daten"""
+def save_columnar_data(data: dict, output_dir: str = DATA_DIR, min_records: int = COLUMNAR_MIN_RECORDS):
+    """Speichert große Tabellen zusätzlich im Spaltenformat (<name>.columnar.json)"""
     out_dir = Path(output_dir) / "transformed"
     out_dir.mkdir(parents=True, exist_ok=True)
     
     for name, items in data.items():
-        file_path = out_dir / f"{name}.json"
+        if len(items) < min_records:
+            continue
+        file_path = out_dir / f"{name}.columnar.json"
         with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False)
-        print(f"  💾 {name}.json")
+            json.dump(to_columnar(name, items), f, ensure_ascii=False)
+        print(f"  💾 {name}.columnar.json")
+
+
+def _synthetic_rows(spec: list, count: int) -> list:
+    """Erzeugt Rohdatensätze mit den Quellfeldern einer Spezifikation"""
+    samples = {"int": lambda i: i % 365, "float": lambda i: (i % 1000) / 10, "bool": lambda i: "J" if i % 2 else "N"}
+    rows = []
+    for i in range(count):
+        row = {}
+        for _, source, type_name, _ in spec:
+            if source is not None:
+                row[source] = samples.get(type_name, lambda i, s=source: f"{s}-{i % 997}")(i)
+        rows.append(row)
+    return rows
+
+
+def benchmark_mappings(rows: int = 100_000, repeat: int = 3) -> dict:
+    """
+    Vergleicht die kompilierten Zuordnungen mit den abgelösten
+    handgeschriebenen transform_*-Funktionen (transform_reference.py) auf
+    synthetischen Daten.
+    
+    Returns:
+        Dictionary mit Laufzeiten (Sekunden, jeweils Bestwert) pro Endpunkt
+    """
+    from transform_reference import TRANSFORMERS as REFERENCE_TRANSFORMERS
+    
+    print(f"\n⏱️ Benchmark Feld-Zuordnung ({rows:,} Zeilen pro Endpunkt, best of {repeat})")
+    print(f"  {'':25} {'kompiliert':>11}     {'handgeschr.':>11}")
+    print("-" * 60)
+    
+    results = {}
+    total_compiled = 0.0
+    total_reference = 0.0
+    
+    for name, spec in FIELD_MAPPINGS.items():
+        reference = REFERENCE_TRANSFORMERS.get(name)
+        if reference is None:
+            continue
+        items = _synthetic_rows(spec, rows)
+        mapping = CompiledMapping(name, spec)
+        mapping.transform(items[:1])  # Kompilierung nicht mitmessen
+        
+        timings = {}
+        for label, func in (("compiled", mapping.transform), ("reference", lambda x: reference({name: x}))):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(items)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+        
+        results[name] = timings
+        total_compiled += timings["compiled"]
+        total_reference += timings["reference"]
+        speedup = timings["reference"] / timings["compiled"] if timings["compiled"] else 0
+        print(f"  {name:25} {timings['compiled']*1000:8.1f} ms  vs {timings['reference']*1000:8.1f} ms  ({speedup:4.2f}x)")
+    
+    print("-" * 60)
+    speedup = total_reference / total_compiled if total_compiled else 0
+    print(f"  {'GESAMT':25} {total_compiled*1000:8.1f} ms  vs {total_reference*1000:8.1f} ms  ({speedup:4.2f}x)")
+    
+    results["_total"] = {"compiled": total_compiled, "reference": total_reference}
+    return results
 
 
 def main():
     """Hauptfunktion"""
-    print("📂 Lade Rohdaten...")
-    raw_data = load_raw_data()
-    
-    if not raw_data:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="BVL Daten Transformer für PSM-Desk-DB")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Feld-Zuordnung auf synthetischen Daten messen statt zu transformieren")
+    parser.add_argument("--rows", type=int, default=100_000, help="Zeilen pro Endpunkt für --benchmark")
+    parser.add_argument("--columnar", action="store_true",
+                        help=f"Große Tabellen (ab {COLUMNAR_MIN_RECORDS:,} Datensätzen) zusätzlich im Spaltenformat speichern")
+    parser.add_argument("--dict-encode", action="store_true",
+                        help="Zusätzlich dictionary-kodierte Tabellen und Wörterbücher speichern")
+    parser.add_argument("--indexes", action="store_true",
+                        help="Index-Dateien für Joins im Client erzeugen (config.INDEX_DEFINITIONS)")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="Zusätzlich SQLite-Datenbank mit Indizes und FTS5-Suche erzeugen")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Build-Cache nicht verwenden (alle Tabellen neu transformieren)")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Stufe mit cProfile messen (.pstats + .collapsed in {PROFILE_DIR})")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark_mappings(args.rows)
+        return 0
+    
+    cache = BuildCache(enabled=not args.no_cache)
+    with profile_stage("transform", args.profile):
+        transformed = run_transform(cache, args.columnar, args.dict_encode, args.indexes, args.sqlite)
+    
+    if transformed is None:
         print("❌ Keine Rohdaten gefunden! Bitte erst fetch_bvl.py ausführen.")
         return 1
     
-    transformed = transform_all(raw_data)
-    
-    print("\n💾 Speichere transformierte Daten...")
-    save_transformed_data(transformed)
+    cache.save()
     
     print("\n✅ Transformation abgeschlossen!")
     return 0